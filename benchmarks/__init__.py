@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+""" Benchmarks of the kwonly_args library. Run them from the root of the repository:
+
+    python -m benchmarks              # runs all benchmark suites
+    python -m benchmarks.calls        # runs only the call overhead benchmarks
+    python -m benchmarks.calls --help
+
+The results are printed as JSON (``--text`` prints a table instead). Use ``--output FILE`` to save them and
+``--compare FILE`` to compare the current results with previously saved ones: the exit code is non-zero if a
+benchmark got slower than the threshold. If ``pyperf`` is installed then ``--pyperf`` runs the benchmarks with
+``pyperf.Runner`` (pass the rest of the pyperf options after ``--pyperf``).
+"""
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+""" Runs all benchmark suites: ``python -m benchmarks`` """
+
+import sys
+
+from benchmarks import batch, calls, construction, coroutines, decoration, partial, scaling
+from benchmarks.common import main
+
+
+SUITES = [batch, calls, construction, coroutines, decoration, partial, scaling]
+
+
+def collect_benchmarks():
+    benchmarks = []
+    for suite in SUITES:
+        benchmarks.extend(suite.collect_benchmarks())
+    return benchmarks
+
+
+if __name__ == '__main__':
+    sys.exit(main('benchmarks', collect_benchmarks))
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+""" Per-call cost of calling a decorated function with a stream of argument sets.
+
+- ``loop``: ``for args, kwargs in calls: func(*args, **kwargs)`` (the baseline).
+- ``call_many``: ``for result in call_many(func, calls): pass``.
+
+Both variants are measured with every wrapper mode and with the ``undecorated`` function (only with the call shapes
+that are valid for the undecorated function).
+"""
+
+import sys
+
+from kwonly_args import first_kwonly_arg, call_many, KWONLY_REQUIRED, MODES
+from benchmarks.common import Benchmark, main, timer
+
+
+def func(a0, a1, d0=0, d1=1, d2=KWONLY_REQUIRED, *args, **kwargs):
+    pass
+
+
+# (shape_name, args, kwargs, valid_for_undecorated)
+SHAPES = [
+    ('kwonly', (0, 1), dict(d1=3, d2=4), True),
+    ('spill_into_varargs', (0, 1, 2, 3, 4), dict(d2=4), False),
+]
+
+
+def make_loop(decorated, args, kwargs, use_call_many):
+    def run(loops):
+        calls = [(args, kwargs)] * loops
+        t0 = timer()
+        if use_call_many:
+            for _ in call_many(decorated, calls):
+                pass
+        else:
+            for call_args, call_kwargs in calls:
+                decorated(*call_args, **call_kwargs)
+        return timer() - t0
+    return run
+
+
+def collect_benchmarks():
+    decorated_variants = [(mode, first_kwonly_arg('d1', mode=mode)(func)) for mode in MODES]
+    benchmarks = []
+    for shape_name, args, kwargs, valid_for_undecorated in SHAPES:
+        variants = [('undecorated', func)] if valid_for_undecorated else []
+        for variant_name, decorated in variants + decorated_variants:
+            prefix = 'batch.%s.%s' % (shape_name, variant_name)
+            benchmarks += [
+                Benchmark(prefix + '.loop', make_loop(decorated, args, kwargs, False)),
+                Benchmark(prefix + '.call_many', make_loop(decorated, args, kwargs, True), baseline=prefix + '.loop'),
+            ]
+    return benchmarks
+
+
+if __name__ == '__main__':
+    sys.exit(main('benchmarks.batch', collect_benchmarks))
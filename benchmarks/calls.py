@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+""" Per-call overhead of the decorated functions.
+
+Every call shape is measured with every implementation (``mode``) of the decorator and with the baselines:
+
+- ``undecorated``: the undecorated function with the same (emulated) signature. It is measured only with the call
+  shapes that are valid for the undecorated function too.
+- ``native_syntax``: python3 only. The same function written with native keyword-only arguments. This is the
+  baseline of the reported overhead under python3 (``undecorated`` is the baseline under python2).
+
+The ``<mode>_trusted`` variants use ``validation='trusted'``. They are measured only with the valid call shapes
+because the behavior of invalid calls is undefined with this validation level.
+"""
+
+import sys
+
+from kwonly_args import first_kwonly_arg, KWONLY_REQUIRED, MODES
+from benchmarks.common import Benchmark, make_loop, main
+
+
+# name: (emulated_signature, native_signature, first_kwonly_arg)
+SIGNATURES = {
+    'varargs': ('a0, a1, d0=0, d1=1, d2=2, *args, **kwargs', 'a0, a1, d0=0, *args, d1=1, d2=2, **kwargs', 'd1'),
+    'required': ('a0, d0=0, d1=KWONLY_REQUIRED, **kwargs', 'a0, d0=0, *, d1, **kwargs', 'd1'),
+    'strict': ('a0, d0=0, d1=1', 'a0, d0=0, *, d1=1', 'd1'),
+}
+
+# (shape_name, signature_name, statement, valid_for_undecorated)
+# The names of the shapes of invalid calls start with 'error_'.
+SHAPES = [
+    ('positional', 'varargs', 'func(0, 1)', True),
+    ('positional_default', 'varargs', 'func(0, 1, 2)', True),
+    ('kwonly', 'varargs', 'func(0, 1, d1=3)', True),
+    ('spill_into_varargs', 'varargs', 'func(0, 1, 2, 3, 4, d2=5)', False),
+    ('extra_kwargs', 'varargs', 'func(0, 1, d1=3, x=4)', True),
+    ('required_kwonly', 'required', 'func(0, d1=1)', True),
+    ('instance_method', 'varargs', 'obj.method(0, 1, 2, d1=3)', True),
+    ('class_method', 'varargs', 'Class.class_method(0, 1, 2, d1=3)', True),
+    ('static_method', 'varargs', 'Class.static_method(0, 1, 2, d1=3)', True),
+    ('error_missing_required_kwonly', 'required', 'try:\n    func(0)\nexcept TypeError:\n    pass', False),
+    ('error_too_many_positional_args', 'strict', 'try:\n    func(0, 1, 2)\nexcept TypeError:\n    pass', False),
+]
+
+SOURCE_TEMPLATE = '''
+@decorate
+def func(%(signature)s):
+    pass
+
+
+class Class(object):
+    @decorate
+    def method(self, %(signature)s):
+        pass
+
+    @classmethod
+    @decorate
+    def class_method(cls, %(signature)s):
+        pass
+
+    @staticmethod
+    @decorate
+    def static_method(%(signature)s):
+        pass
+
+
+obj = Class()
+'''
+
+
+def has_native_syntax():
+    return sys.version_info[0] >= 3
+
+
+def build_namespace(signature, decorate):
+    namespace = {'decorate': decorate, 'KWONLY_REQUIRED': KWONLY_REQUIRED}
+    exec(SOURCE_TEMPLATE % dict(signature=signature), namespace)
+    return namespace
+
+
+def collect_benchmarks():
+    baseline = 'native_syntax' if has_native_syntax() else 'undecorated'
+
+    def identity(func):
+        return func
+
+    benchmarks = []
+    for shape_name, signature_name, statement, valid_for_undecorated in SHAPES:
+        emulated_signature, native_signature, first_kwonly = SIGNATURES[signature_name]
+        variants = []
+        if valid_for_undecorated:
+            variants.append(('undecorated', emulated_signature, identity))
+        if has_native_syntax():
+            variants.append(('native_syntax', native_signature, identity))
+        for mode in MODES:
+            variants.append((mode, emulated_signature, first_kwonly_arg(first_kwonly, mode=mode)))
+        if not shape_name.startswith('error_'):
+            for mode in ('generic', 'codegen'):
+                variants.append((mode + '_trusted', emulated_signature,
+                                 first_kwonly_arg(first_kwonly, mode=mode, validation='trusted')))
+
+        for variant_name, signature, decorate in variants:
+            name = 'calls.%s.%s' % (shape_name, variant_name)
+            benchmarks.append(Benchmark(
+                name,
+                make_loop(statement, build_namespace(signature, decorate)),
+                baseline='calls.%s.%s' % (shape_name, baseline),
+            ))
+    return benchmarks
+
+
+if __name__ == '__main__':
+    sys.exit(main('benchmarks.calls', collect_benchmarks))
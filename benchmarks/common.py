@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+""" A minimal benchmark runner shared by the benchmark suites. """
+
+import argparse
+import gc
+import json
+import platform
+import sys
+
+try:
+    from time import perf_counter as timer
+except ImportError:
+    from timeit import default_timer as timer
+
+import kwonly_args
+
+
+try:
+    range_ = xrange
+except NameError:
+    range_ = range
+
+
+class Benchmark(object):
+    """
+    :param name: Dotted name of the benchmark. The first component is the name of the suite.
+    :param func: ``func(loops)`` executes the measured operation ``loops`` times and returns the elapsed time in
+    seconds. This is the same interface as the one required by ``pyperf.Runner.bench_time_func()``.
+    :param baseline: The name of another benchmark of the same suite. The difference between the timing of this
+    benchmark and that of the baseline is reported as overhead.
+    """
+    def __init__(self, name, func, baseline=None):
+        self.name = name
+        self.func = func
+        self.baseline = baseline
+
+
+def make_loop(statement, namespace):
+    """ Returns a ``func(loops)`` that executes ``statement`` ``loops`` times. The statement is inlined into the body
+    of the loop so the measurement doesn't include the overhead of an extra function call. """
+    source = '\n'.join([
+        'def run(loops):',
+        '    t0 = _timer()',
+        '    for _ in _range(loops):',
+        '\n'.join('        ' + line for line in statement.splitlines()),
+        '    return _timer() - t0',
+    ]) + '\n'
+    namespace = dict(namespace, _timer=timer, _range=range_)
+    exec(compile(source, '<benchmark %s>' % statement.splitlines()[0], 'exec'), namespace)
+    return namespace['run']
+
+
+def measure(benchmark, min_time, repeat):
+    """ Returns the timing samples of the benchmark in nanoseconds per loop. The garbage collector is disabled
+    during the measurement like in case of ``timeit``. """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        loops = 1
+        while True:
+            elapsed = benchmark.func(loops)
+            if elapsed >= min_time:
+                break
+            loops *= 10 if elapsed < min_time / 10.0 else 2
+        samples = [elapsed]
+        for _ in range_(repeat - 1):
+            samples.append(benchmark.func(loops))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return [sample * 1e9 / loops for sample in samples]
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def metadata():
+    return {
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'kwonly_args_version': kwonly_args.__version__,
+    }
+
+
+def run_benchmarks(benchmarks, min_time, repeat, log):
+    results = {}
+    for benchmark in benchmarks:
+        samples = measure(benchmark, min_time, repeat)
+        results[benchmark.name] = {
+            'ns': median(samples),
+            'min_ns': min(samples),
+            'max_ns': max(samples),
+            'samples': samples,
+        }
+        log('%s: %.1f ns' % (benchmark.name, results[benchmark.name]['ns']))
+    for benchmark in benchmarks:
+        if benchmark.baseline in results:
+            results[benchmark.name]['baseline'] = benchmark.baseline
+            results[benchmark.name]['overhead_ns'] = results[benchmark.name]['ns'] - results[benchmark.baseline]['ns']
+    return results
+
+
+def format_table(results):
+    lines = ['%-60s %12s %12s' % ('benchmark', 'ns', 'overhead ns')]
+    for name in sorted(results):
+        result = results[name]
+        overhead = '%.1f' % result['overhead_ns'] if 'overhead_ns' in result else '-'
+        lines.append('%-60s %12.1f %12s' % (name, result['ns'], overhead))
+    return '\n'.join(lines)
+
+
+def compare(results, baseline_results, threshold):
+    """ Returns a list of ``(name, old_ns, new_ns)`` tuples for the benchmarks that got slower than the threshold. """
+    regressions = []
+    for name in sorted(results):
+        if name in baseline_results:
+            old_ns = baseline_results[name]['ns']
+            new_ns = results[name]['ns']
+            if new_ns > old_ns * (1.0 + threshold):
+                regressions.append((name, old_ns, new_ns))
+    return regressions
+
+
+def run_with_pyperf(benchmarks, module_name, pyperf_args):
+    import pyperf
+
+    sys.argv = [sys.argv[0]] + pyperf_args
+    runner = pyperf.Runner(program_args=(sys.executable, '-m', module_name, '--pyperf'))
+    for benchmark in benchmarks:
+        runner.bench_time_func(benchmark.name, benchmark.func)
+
+
+def main(module_name, collect_benchmarks, argv=None):
+    """ Command line entry point of the benchmark suites.
+
+    :param module_name: The name of the module to be passed to ``python -m`` in order to run the suite.
+    :param collect_benchmarks: A function that returns the list of ``Benchmark`` objects to run.
+    """
+    parser = argparse.ArgumentParser(prog='python -m ' + module_name)
+    parser.add_argument('-k', '--filter', action='append', default=[],
+                        help='Run only the benchmarks whose name contains this string. Can be repeated.')
+    parser.add_argument('--min-time', type=float, default=0.02,
+                        help='Minimum duration of a sample in seconds. Default: %(default)s')
+    parser.add_argument('--repeat', type=int, default=7, help='Number of samples. Default: %(default)s')
+    parser.add_argument('--text', action='store_true', help='Print a table instead of JSON.')
+    parser.add_argument('-o', '--output', help='Save the JSON results into this file.')
+    parser.add_argument('--compare', metavar='FILE', help='Compare the results with previously saved ones.')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Relative slowdown reported as regression by --compare. Default: %(default)s')
+    parser.add_argument('--pyperf', action='store_true',
+                        help='Run the benchmarks with pyperf. The remaining arguments are passed to pyperf.')
+    args, remaining = parser.parse_known_args(argv)
+
+    benchmarks = [b for b in collect_benchmarks() if not args.filter or [f for f in args.filter if f in b.name]]
+
+    if args.pyperf:
+        run_with_pyperf(benchmarks, module_name, remaining)
+        return 0
+    if remaining:
+        parser.error('unrecognized arguments: %s' % ' '.join(remaining))
+
+    def log(message):
+        sys.stderr.write(message + '\n')
+
+    results = run_benchmarks(benchmarks, args.min_time, args.repeat, log)
+    document = {'metadata': metadata(), 'benchmarks': results}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+    if args.text:
+        print(format_table(results))
+    else:
+        print(json.dumps(document, indent=2, sort_keys=True))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline_results = json.load(f)['benchmarks']
+        regressions = compare(results, baseline_results, args.threshold)
+        for name, old_ns, new_ns in regressions:
+            log('REGRESSION %s: %.1f ns -> %.1f ns (+%.0f%%)' % (name, old_ns, new_ns, (new_ns / old_ns - 1) * 100))
+        if regressions:
+            return 1
+    return 0
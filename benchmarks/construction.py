@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+""" Construction of configuration/value objects whose ``__init__`` only assigns its arguments to attributes.
+
+- ``undecorated``: a hand-written ``__init__`` without keyword-only args (baseline).
+- ``kwonly_defaults_<mode>``: the same ``__init__`` decorated with ``@kwonly_defaults`` in the given mode.
+- ``kwonly_init``, ``kwonly_init_slots``: the ``__init__`` generated by ``kwonly_init()``, without and with
+  ``__slots__``.
+"""
+
+import sys
+
+from kwonly_args import first_kwonly_arg, kwonly_init, FIRST_DEFAULT_ARG, MODES
+from benchmarks.common import Benchmark, make_loop, main
+
+
+FIELDS = ['host', ('port', 80), ('timeout', 10), ('debug', False)]
+
+
+class Undecorated(object):
+    def __init__(self, host, port=80, timeout=10, debug=False):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.debug = debug
+
+
+def hand_written_class(mode):
+    class Config(object):
+        @first_kwonly_arg(FIRST_DEFAULT_ARG, mode=mode)
+        def __init__(self, host, port=80, timeout=10, debug=False):
+            self.host = host
+            self.port = port
+            self.timeout = timeout
+            self.debug = debug
+    return Config
+
+
+def collect_benchmarks():
+    variants = [('undecorated', Undecorated)]
+    variants += [('kwonly_defaults_' + mode, hand_written_class(mode)) for mode in MODES]
+    variants += [
+        ('kwonly_init', kwonly_init(FIELDS)(type('Config', (object,), {}))),
+        ('kwonly_init_slots', kwonly_init(FIELDS, slots=True)(type('Config', (object,), {}))),
+    ]
+    return [Benchmark('construction.%s' % name, make_loop("Config('localhost', timeout=3)", {'Config': cls}),
+                      baseline='construction.undecorated')
+            for name, cls in variants]
+
+
+if __name__ == '__main__':
+    sys.exit(main('benchmarks.construction', collect_benchmarks))
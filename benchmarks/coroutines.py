@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+""" Per-call overhead of decorated coroutine functions awaited inside a running asyncio event loop. Python3.5+.
+
+The variants are the same as those of the ``calls`` suite: ``undecorated``, ``native_syntax`` (the baseline) and
+the wrapper modes. The measured loop is itself a coroutine so the cost of starting the event loop isn't included.
+"""
+
+import sys
+
+from kwonly_args import first_kwonly_arg, KWONLY_REQUIRED, MODES
+from benchmarks.common import Benchmark, main, range_, timer
+
+
+# name: (emulated_signature, native_signature, first_kwonly_arg)
+SIGNATURES = {
+    'varargs': ('a0, d0=0, d1=1, *args', 'a0, d0=0, *args, d1=1', 'd1'),
+    'required': ('a0, d0=0, d1=KWONLY_REQUIRED', 'a0, d0=0, *, d1', 'd1'),
+}
+
+# (shape_name, signature_name, statement, valid_for_undecorated)
+SHAPES = [
+    ('await_kwonly', 'varargs', 'await func(0, d1=3)', True),
+    ('await_spill_into_varargs', 'varargs', 'await func(0, 1, 2, d1=3)', False),
+    ('await_required_kwonly', 'required', 'await func(0, d1=3)', True),
+]
+
+SOURCE_TEMPLATE = '''
+@decorate
+async def func(%(signature)s):
+    pass
+
+
+async def run_loops(loops):
+    t0 = _timer()
+    for _ in _range(loops):
+        %(statement)s
+    return _timer() - t0
+'''
+
+
+def is_supported():
+    return sys.version_info >= (3, 5)
+
+
+def make_async_loop(statement, signature, decorate):
+    """ Returns a ``func(loops)`` that awaits ``statement`` ``loops`` times inside a coroutine run by an asyncio
+    event loop. """
+    import asyncio
+
+    namespace = {'decorate': decorate, 'KWONLY_REQUIRED': KWONLY_REQUIRED, '_timer': timer, '_range': range_}
+    exec(SOURCE_TEMPLATE % dict(signature=signature, statement=statement), namespace)
+    run_loops = namespace['run_loops']
+
+    def run(loops):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(run_loops(loops))
+        finally:
+            loop.close()
+    return run
+
+
+def collect_benchmarks():
+    if not is_supported():
+        return []
+
+    def identity(func):
+        return func
+
+    benchmarks = []
+    for shape_name, signature_name, statement, valid_for_undecorated in SHAPES:
+        emulated_signature, native_signature, first_kwonly = SIGNATURES[signature_name]
+        variants = []
+        if valid_for_undecorated:
+            variants.append(('undecorated', emulated_signature, identity))
+        variants.append(('native_syntax', native_signature, identity))
+        for mode in MODES:
+            variants.append((mode, emulated_signature, first_kwonly_arg(first_kwonly, mode=mode)))
+
+        for variant_name, signature, decorate in variants:
+            benchmarks.append(Benchmark(
+                'coroutines.%s.%s' % (shape_name, variant_name),
+                make_async_loop(statement, signature, decorate),
+                baseline='coroutines.%s.native_syntax' % (shape_name,),
+            ))
+    return benchmarks
+
+
+if __name__ == '__main__':
+    sys.exit(main('benchmarks.coroutines', collect_benchmarks))
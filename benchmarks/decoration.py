@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+""" Decoration time: the cost of applying the decorator to a function (usually paid at import time).
+
+Every loop of the ``cold`` benchmarks decorates a different function so the specs of the functions aren't shared.
+The ``inspect`` variants measure the cold decoration with the introspection done by the ``inspect`` module instead
+of the fast code object based introspection. They are the baselines of the reported overhead. The ``shared``
+variants decorate the same function in every loop so they measure the decoration with a shared spec. The
+``profiling`` variants measure the cold decoration with ``configure(profiling=True)``.
+
+The ``spec`` benchmarks measure the timing of ``get_spec()`` with distinct default values (so the specs can't be
+shared) against the analysis of the signature without the cache (``create``): the specs of ``module_level``
+functions aren't cached so they shouldn't have any overhead, ``nested.miss`` pays for the cache lookup and insertion
+and ``nested.shared`` decorates functions created by the same nested ``def`` statement.
+
+The ``class`` benchmarks decorate all methods of a class: ``per_method`` applies ``first_kwonly_arg`` to the
+methods one by one (the baseline), ``kwonly_class`` uses the class decorator.
+"""
+
+import sys
+import types
+
+from kwonly_args import configure, first_kwonly_arg, kwonly_class, spec, MODES
+from kwonly_args.introspection import get_argspec, inspect_argspec
+from benchmarks.common import Benchmark, make_loop, main, timer, range_
+
+
+def func(a0, a1, d0=0, d1=1, d2=2, *args, **kwargs):
+    pass
+
+
+def make_distinct_functions(num_functions):
+    code = func.__code__
+    functions = []
+    for index in range_(num_functions):
+        if hasattr(code, 'replace'):
+            namespace = {'func': type(func)(code.replace(co_firstlineno=index + 1), globals(), 'func',
+                                            func.__defaults__)}
+        else:
+            namespace = {}
+            exec(compile('\n' * index + 'def func(a0, a1, d0=0, d1=1, d2=2, *args, **kwargs):\n    pass\n',
+                         __file__, 'exec'), namespace)
+        functions.append(namespace['func'])
+    return functions
+
+
+def make_decoration_loop(mode, lazy, argspec_func, distinct_functions, profiling=False):
+    decorate = first_kwonly_arg('d1', mode=mode, lazy=lazy)
+
+    def run(loops):
+        functions = make_distinct_functions(loops) if distinct_functions else [func] * loops
+        original_argspec_func = spec.get_argspec
+        spec.get_argspec = argspec_func
+        configure(profiling=profiling)
+        try:
+            # The decorated functions are kept alive like in a module otherwise their shared spec would die too.
+            decorated = []
+            t0 = timer()
+            for function in functions:
+                decorated.append(decorate(function))
+            return timer() - t0
+        finally:
+            spec.get_argspec = original_argspec_func
+            configure(profiling=False)
+    return run
+
+
+def create_nested_func():
+    def func(a0, a1, d0=0, d1=1, d2=2, *args, **kwargs):
+        pass
+    return func
+
+
+nested_func = create_nested_func()
+
+
+def make_spec_loop(get_spec_func, nested, distinct_defaults):
+    template = nested_func if nested else func
+
+    def run(loops):
+        functions = []
+        for _ in range_(loops):
+            defaults = template.__defaults__
+            if distinct_defaults:
+                defaults = tuple(object() for _ in defaults)
+            functions.append(types.FunctionType(template.__code__, globals(), 'func', defaults))
+        # The specs are kept alive like in case of the decorated functions of a module.
+        specs = []
+        t0 = timer()
+        for function in functions:
+            specs.append(get_spec_func(function, 'd1'))
+        return timer() - t0
+    return run
+
+
+NUM_CLASS_METHODS = 20
+
+CLASS_SOURCE = 'class Model(object):\n' + ''.join(
+    '    def method%d(self, a0, d0=0, d1=1, *args):\n        pass\n' % index for index in range_(NUM_CLASS_METHODS))
+
+
+def make_classes(num_classes):
+    classes = []
+    for _ in range_(num_classes):
+        namespace = {}
+        exec(CLASS_SOURCE, namespace)
+        classes.append(namespace['Model'])
+    return classes
+
+
+def make_class_decoration_loop(mode, per_method):
+    if per_method:
+        decorate_method = first_kwonly_arg('d0', mode=mode)
+
+        def decorate(cls):
+            for attr_name, value in list(cls.__dict__.items()):
+                if attr_name.startswith('method'):
+                    setattr(cls, attr_name, decorate_method(value))
+            return cls
+    else:
+        decorate = kwonly_class('d0', mode=mode)
+
+    def run(loops):
+        classes = make_classes(loops)
+        t0 = timer()
+        for cls in classes:
+            decorate(cls)
+        return timer() - t0
+    return run
+
+
+def collect_benchmarks():
+    benchmarks = [
+        Benchmark('decoration.argspec.inspect', make_loop('inspect_argspec(func)', globals())),
+        Benchmark('decoration.argspec.fast', make_loop('get_argspec(func)', globals()),
+                  baseline='decoration.argspec.inspect'),
+        Benchmark('decoration.spec.create', make_spec_loop(spec._create_spec, False, True)),
+        Benchmark('decoration.spec.module_level', make_spec_loop(spec.get_spec, False, True),
+                  baseline='decoration.spec.create'),
+        Benchmark('decoration.spec.nested.miss', make_spec_loop(spec.get_spec, True, True),
+                  baseline='decoration.spec.create'),
+        Benchmark('decoration.spec.nested.shared', make_spec_loop(spec.get_spec, True, False),
+                  baseline='decoration.spec.create'),
+    ]
+    for mode in MODES:
+        baseline = 'decoration.decorate.%s.inspect' % mode
+        benchmarks += [
+            Benchmark(baseline, make_decoration_loop(mode, False, inspect_argspec, True)),
+            Benchmark('decoration.decorate.%s.cold' % mode, make_decoration_loop(mode, False, get_argspec, True),
+                      baseline=baseline),
+            Benchmark('decoration.decorate.%s.shared' % mode, make_decoration_loop(mode, False, get_argspec, False),
+                      baseline=baseline),
+            Benchmark('decoration.decorate.%s.lazy' % mode, make_decoration_loop(mode, True, get_argspec, True),
+                      baseline=baseline),
+            Benchmark('decoration.decorate.%s.profiling' % mode,
+                      make_decoration_loop(mode, False, get_argspec, True, profiling=True), baseline=baseline),
+            Benchmark('decoration.class.%s.per_method' % mode, make_class_decoration_loop(mode, True)),
+            Benchmark('decoration.class.%s.kwonly_class' % mode, make_class_decoration_loop(mode, False),
+                      baseline='decoration.class.%s.per_method' % mode),
+        ]
+    return benchmarks
+
+
+if __name__ == '__main__':
+    sys.exit(main('benchmarks.decoration', collect_benchmarks))
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+""" Calls of decorated functions with bound configuration args.
+
+- ``functools_partial``: ``functools.partial(decorated, plugin, config=config)`` (the baseline).
+- ``kwonly_partial``: ``kwonly_partial(decorated, plugin, config=config)``.
+
+Both variants are measured with the ``generic`` and ``codegen`` wrapper modes and with calls that pass only the
+event or the event and a keyword arg.
+"""
+
+import functools
+import sys
+
+from kwonly_args import first_kwonly_arg, kwonly_partial, KWONLY_REQUIRED
+from benchmarks.common import Benchmark, make_loop, main
+
+
+def handle(plugin, event, config=KWONLY_REQUIRED, verbose=False):
+    pass
+
+
+# (shape_name, call_source)
+SHAPES = [
+    ('event', 'bound(event)'),
+    ('event_verbose', 'bound(event, verbose=True)'),
+]
+
+
+def collect_benchmarks():
+    benchmarks = []
+    for mode in ('generic', 'codegen'):
+        decorated = first_kwonly_arg('config', mode=mode)(handle)
+        variants = [
+            ('functools_partial', functools.partial(decorated, 'plugin', config={})),
+            ('kwonly_partial', kwonly_partial(decorated, 'plugin', config={})),
+        ]
+        for shape_name, source in SHAPES:
+            prefix = 'partial.%s.%s' % (mode, shape_name)
+            benchmarks += [Benchmark('%s.%s' % (prefix, name), make_loop(source, {'bound': bound, 'event': 0}),
+                                     baseline=prefix + '.functools_partial')
+                           for name, bound in variants]
+    return benchmarks
+
+
+if __name__ == '__main__':
+    sys.exit(main('benchmarks.partial', collect_benchmarks))
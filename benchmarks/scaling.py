@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+""" Throughput of decorated functions called from several threads and processes.
+
+``scaling.threads.<variant>.<n>`` calls the function from ``n`` threads at the same time and
+``scaling.processes.<variant>.<n>`` from ``n`` worker processes of a ``ProcessPoolExecutor`` (python3.2+). The
+reported time is the wall-time per call of all calls: it decreases with the number of threads/processes if the calls
+run in parallel. Under a GIL-enabled build the threads don't run in parallel. Under a free-threaded build (3.13t+)
+the decorated functions should scale like the ``undecorated`` function. The baseline of each benchmark is the same
+variant with a single thread/process.
+"""
+
+import sys
+import threading
+
+from kwonly_args import first_kwonly_arg, KWONLY_REQUIRED, MODES
+from benchmarks.common import Benchmark, main, range_, timer
+
+
+THREAD_COUNTS = (1, 2, 4, 8)
+
+
+def func(a0, a1, d0=0, d1=1, d2=KWONLY_REQUIRED, *args, **kwargs):
+    pass
+
+
+# {variant_name: function} The worker processes find the functions here.
+FUNCTIONS = dict([('undecorated', func)] + [(mode, first_kwonly_arg('d1', mode=mode)(func)) for mode in MODES] +
+                 [('counts', first_kwonly_arg('d1', instrumentation='counts')(func))])
+
+# {num_processes: ProcessPoolExecutor} The pools are reused by the samples of the benchmarks.
+_pools = {}
+
+
+def call_loop(variant_name, loops):
+    """ The measured loop: ``loops`` calls of the function of the variant. """
+    function = FUNCTIONS[variant_name]
+    for _ in range_(loops):
+        function(0, 1, d1=3, d2=4)
+
+
+def make_thread_loop(variant_name, num_threads):
+    def run(loops):
+        loops_per_thread = max(1, loops // num_threads)
+        start = threading.Event()
+
+        def thread_main():
+            start.wait()
+            call_loop(variant_name, loops_per_thread)
+
+        threads = [threading.Thread(target=thread_main) for _ in range_(num_threads)]
+        for thread in threads:
+            thread.start()
+        t0 = timer()
+        start.set()
+        for thread in threads:
+            thread.join()
+        return (timer() - t0) * loops / float(loops_per_thread * num_threads)
+    return run
+
+
+def make_process_loop(variant_name, num_processes):
+    def run(loops):
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = _pools.get(num_processes)
+        if pool is None:
+            pool = _pools[num_processes] = ProcessPoolExecutor(num_processes)
+            # starts the worker processes
+            list(pool.map(call_loop, [variant_name] * num_processes, [1] * num_processes))
+        loops_per_process = max(1, loops // num_processes)
+        t0 = timer()
+        list(pool.map(call_loop, [variant_name] * num_processes, [loops_per_process] * num_processes))
+        return (timer() - t0) * loops / float(loops_per_process * num_processes)
+    return run
+
+
+def collect_benchmarks():
+    has_process_pool = sys.version_info >= (3, 2)
+    benchmarks = []
+    for variant_name in sorted(FUNCTIONS):
+        for num in THREAD_COUNTS:
+            benchmarks.append(Benchmark('scaling.threads.%s.%d' % (variant_name, num),
+                                        make_thread_loop(variant_name, num),
+                                        baseline='scaling.threads.%s.1' % variant_name))
+            if has_process_pool:
+                benchmarks.append(Benchmark('scaling.processes.%s.%d' % (variant_name, num),
+                                            make_process_loop(variant_name, num),
+                                            baseline='scaling.processes.%s.1' % variant_name))
+    return benchmarks
+
+
+if __name__ == '__main__':
+    sys.exit(main('benchmarks.scaling', collect_benchmarks))
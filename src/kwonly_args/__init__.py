@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
-import inspect
+import os
 import sys
+import threading
+import types
+import weakref
 
 # The @decorator syntax is available since python2.4 and we support even this old version. Unfortunately functools
 # has been introduced only in python2.5 so we have to emulate functools.update_wrapper() under python2.4.
@@ -10,8 +13,22 @@ try:
 except ImportError:
     from kwonly_args.utils import update_wrapper
 
+from kwonly_args import codegen, instrumentation, partial, records, spec
+from kwonly_args import profiling as profiling_module
+from kwonly_args.batch import call_many
+from kwonly_args.codegen import build_wrapper
+from kwonly_args.introspection import function_kind, mark_coroutine_function
+from kwonly_args.instrumentation import INSTRUMENTATION_ENV_VAR, check_instrumentation, instrument
+from kwonly_args.native import build_function
+from kwonly_args.partial import kwonly_partial
+from kwonly_args.profiling import PROFILING_ENV_VAR, rename_wrapper
+from kwonly_args.records import kwonly_init
+from kwonly_args.signature import lazy_signature
+from kwonly_args.spec import KWONLY_REQUIRED, FIRST_DEFAULT_ARG, DECORATION_ATTR, Decoration, get_spec, is_decorated
 
-__all__ = ['first_kwonly_arg', 'KWONLY_REQUIRED', 'FIRST_DEFAULT_ARG', 'kwonly_defaults']
+
+__all__ = ['first_kwonly_arg', 'KWONLY_REQUIRED', 'FIRST_DEFAULT_ARG', 'kwonly_defaults', 'kwonly_class',
+           'kwonly_init', 'kwonly_partial', 'call_many', 'configure', 'validate_all', 'memory_footprint']
 
 # version_info[0]: Increase in case of large milestones/releases.
 # version_info[1]: Increase this and zero out version_info[2] if you have explicitly modified
@@ -28,17 +45,126 @@ __author__ = 'István Pásztor'
 __license__ = 'MIT'
 
 
-KWONLY_REQUIRED = ('KWONLY_REQUIRED',)
-FIRST_DEFAULT_ARG = ('FIRST_DEFAULT_ARG',)
+# Wrapper implementations selectable with the ``mode`` parameter of ``first_kwonly_arg()`` and ``configure()``.
+MODES = ('generic', 'codegen', 'native')
+
+# Validation levels selectable with the ``validation`` parameter of ``first_kwonly_arg()`` and ``configure()``.
+VALIDATIONS = ('trusted', 'normal', 'debug')
+
+# The environment variable that sets the initial process-wide validation level.
+VALIDATION_ENV_VAR = 'KWONLY_ARGS_VALIDATION'
+
+# Process-wide settings. Modify them only with ``configure()``.
+_config = {
+    'mode': 'generic',
+    'lazy': False,
+    'validation': 'normal',
+    'instrumentation': 'off',
+}
+
+# Lazily decorated functions that haven't been called yet: {lazy_wrapper: resolve_function}
+_lazy_pending = weakref.WeakKeyDictionary()
+_lazy_lock = threading.RLock()
+
+
+def _check_mode(mode):
+    if mode not in MODES:
+        raise ValueError("Invalid mode=%r, it must be one of: %s" % (mode, ', '.join(MODES)))
+
 
+def _check_validation(validation):
+    if validation not in VALIDATIONS:
+        raise ValueError("Invalid validation=%r, it must be one of: %s" % (validation, ', '.join(VALIDATIONS)))
 
-def first_kwonly_arg(name):
+
+def configure(mode=None, lazy=None, validation=None, instrumentation=None, profiling=None):
+    """ Changes the process-wide defaults of the library. The settings affect only the functions decorated after
+    the call so you should call this before importing the modules that contain your decorated functions.
+    The ``None`` value of a parameter keeps the current setting.
+
+    :param mode: The default value of the ``mode`` parameter of ``first_kwonly_arg()``.
+    :param lazy: The default value of the ``lazy`` parameter of ``first_kwonly_arg()``.
+    :param validation: The default value of the ``validation`` parameter of ``first_kwonly_arg()``. Its initial
+    value comes from the ``KWONLY_ARGS_VALIDATION`` environment variable (``'normal'`` if it isn't set).
+    :param instrumentation: The default value of the ``instrumentation`` parameter of ``first_kwonly_arg()``. Its
+    initial value comes from the ``KWONLY_ARGS_INSTRUMENTATION`` environment variable (``'off'`` if it isn't set).
+    :param profiling: If ``True`` then the wrappers get the location and the tagged name of the wrapped function in
+    their code objects under CPython 3.10+ (see ``kwonly_args.profiling``). Its initial value comes from the
+    ``KWONLY_ARGS_PROFILING`` environment variable (``True`` if it is set to ``1``).
+    """
+    if mode is not None:
+        _check_mode(mode)
+        _config['mode'] = mode
+    if lazy is not None:
+        _config['lazy'] = bool(lazy)
+    if validation is not None:
+        _check_validation(validation)
+        _config['validation'] = validation
+    if instrumentation is not None:
+        check_instrumentation(instrumentation)
+        _config['instrumentation'] = instrumentation
+    if profiling is not None:
+        profiling_module.set_enabled(profiling)
+
+
+if os.environ.get(VALIDATION_ENV_VAR):
+    configure(validation=os.environ[VALIDATION_ENV_VAR])
+if os.environ.get(INSTRUMENTATION_ENV_VAR):
+    configure(instrumentation=os.environ[INSTRUMENTATION_ENV_VAR])
+if os.environ.get(PROFILING_ENV_VAR) == '1':
+    configure(profiling=True)
+
+
+def first_kwonly_arg(name, mode=None, lazy=None, validation=None, instrumentation=None):
     """ Emulates keyword-only arguments under python2. Works with both python2 and python3.
     With this decorator you can convert all or some of the default arguments of your function
     into kwonly arguments. Use ``KWONLY_REQUIRED`` as the default value of required kwonly args.
 
     :param name: The name of the first default argument to be treated as a keyword-only argument. This default
     argument along with all default arguments that follow this one will be treated as keyword only arguments.
+    :param mode: Selects the wrapper implementation. ``None`` uses the process-wide default set with
+    ``configure()`` (``'generic'`` if you haven't changed it).
+
+    - ``'generic'``: A single ``wrapper(*args, **kwargs)`` closure that finds out the layout of the call at runtime.
+    - ``'codegen'``: Generates and compiles a wrapper with an explicit signature and straight-line argument
+      shuffling for the exact signature of the decorated function. It behaves like the generic wrapper (including
+      the raised errors) and its call overhead is lower for most call shapes (see the ``calls`` benchmarks). The
+      only difference: if a call contains more than one error (e.g.: missing positional args *and* an unexpected
+      keyword arg) then the generated wrapper may report a different one of them than the generic wrapper. Falls
+      back to ``'generic'`` if the signature can't be expressed with generated code (e.g.: python2 tuple
+      parameters).
+    - ``'native'``: Python3 only. Instead of wrapping your function it creates a new function from the code object
+      of your function with the selected args turned into real python3 keyword-only args (``KWONLY_REQUIRED``
+      ones become required keyword-only args). This has zero call overhead but the errors of invalid calls are
+      raised by the interpreter so their messages differ from those of the wrappers. Falls back to ``'generic'``
+      under python2, PyPy, or if the code object can't be rewritten (e.g.: the function isn't a python function).
+    :param lazy: If ``True`` then the decorator only records your function and the inspection of its signature
+    along with the construction of the wrapper happen when your function is called for the first time. This makes
+    importing modules with lots of rarely called decorated functions faster at the cost of an extra call layer.
+    Decoration errors (e.g.: invalid ``name``) are raised by the first call or by ``validate_all()``.
+    ``None`` uses the process-wide default set with ``configure()`` (``False`` if you haven't changed it).
+    :param validation: Selects the checks performed by the wrapper. ``None`` uses the process-wide default set with
+    ``configure()`` or with the ``KWONLY_ARGS_VALIDATION`` environment variable (``'normal'`` by default).
+
+    - ``'normal'``: The wrapper raises a ``TypeError`` if a required keyword-only arg is missing or if there are too
+      many positional args.
+    - ``'trusted'``: For production code with call sites verified by tests. The wrapper doesn't perform the above
+      checks, it only moves the keyword-only args out of the way of the varargs. The behavior of invalid calls is
+      undefined (e.g.: a missing required arg receives ``KWONLY_REQUIRED``). If the function doesn't have varargs
+      then this leaves nothing to do for a wrapper so the decorator returns your function without changes. The
+      ``'native'`` mode performs the checks even in this case because they are done by the interpreter for free.
+    - ``'debug'``: Extra checks on top of ``'normal'`` for test environments. The decorator raises a ``ValueError``
+      if a positional (not keyword-only) arg has ``KWONLY_REQUIRED`` as its default value. The calls raise a
+      ``TypeError`` if ``KWONLY_REQUIRED`` is passed as an argument value and a ``RuntimeError`` if the
+      ``__defaults__`` of the decorated function have been replaced after decoration.
+    :param instrumentation: Collects call statistics (see ``kwonly_args.instrumentation``) with an extra wrapper
+    layer. ``None`` uses the process-wide default set with ``configure()`` or with the
+    ``KWONLY_ARGS_INSTRUMENTATION`` environment variable (``'off'`` by default).
+
+    - ``'off'``: No statistics. The decorated function doesn't have any instrumentation code in its call path.
+    - ``'counts'``: The number of calls, spilled calls (positional args passed into varargs) and failed validations.
+    - ``'timing'``: ``'counts'`` along with the total wall-time and a wall-time histogram of the calls. Not measured
+      for coroutine and generator functions because their calls only create the coroutine/generator object.
 
     You can also pass here the ``FIRST_DEFAULT_ARG`` constant in order to select the first default argument. This
     way you turn all default arguments into keyword-only arguments. As a shortcut you can use the
@@ -73,50 +199,277 @@ def first_kwonly_arg(name):
         >>> def func(a0, a1, d0='d0', d1='d1'):
         >>>     print(a0, a1, d0, d1)
     """
+    if mode is not None:
+        _check_mode(mode)
+    if validation is not None:
+        _check_validation(validation)
+    if instrumentation is not None:
+        check_instrumentation(instrumentation)
+
     def decorate(wrapped):
-        if sys.version_info[0] == 2:
-            arg_names, varargs, _, defaults = inspect.getargspec(wrapped)
+        settings = (mode or _config['mode'], validation or _config['validation'],
+                    instrumentation or _config['instrumentation'])
+        if _config['lazy'] if lazy is None else lazy:
+            decorated = _decorate_lazily(wrapped, name, *settings)
         else:
-            arg_names, varargs, _, defaults = inspect.getfullargspec(wrapped)[:4]
+            decorated = _decorate(wrapped, name, *settings)
+        if decorated is not wrapped and getattr(decorated, '__wrapped__', None) is wrapped:
+            # inspect.signature() would follow __wrapped__ and report the positional signature of wrapped
+            signature = lazy_signature(wrapped, name)
+            if signature is not None:
+                decorated.__signature__ = signature
+        try:
+            setattr(decorated, DECORATION_ATTR, Decoration(wrapped, name, settings, decorated))
+        except (AttributeError, TypeError):
+            # e.g.: a builtin returned unchanged by validation='trusted'
+            pass
+        return decorated
+    return decorate
+
+
+def _decorate(wrapped, name, mode, validation, instrumentation):
+    kwonly_spec = get_spec(wrapped, name)
+    decorated = _decorate_with_validation(wrapped, kwonly_spec, mode, validation)
+    if instrumentation == 'off':
+        return decorated
+    return _update_wrapper(instrument(decorated, wrapped, kwonly_spec, instrumentation == 'timing'), wrapped,
+                           'instrumentation')
+
+
+def _decorate_with_validation(wrapped, kwonly_spec, mode, validation):
+    func_name = getattr(wrapped, '__name__', '?')
+
+    if validation == 'debug':
+        for arg, default in zip(kwonly_spec.arg_names[kwonly_spec.first_default_index:kwonly_spec.first_kwonly_index],
+                                kwonly_spec.defaults):
+            if default is KWONLY_REQUIRED:
+                raise ValueError("%s(): KWONLY_REQUIRED is the default value of %r that isn't a keyword-only arg" % (
+                                 func_name, arg))
+        return _debug_wrapper(_build(wrapped, kwonly_spec, func_name, mode, False), wrapped, func_name)
+    return _build(wrapped, kwonly_spec, func_name, mode, validation == 'trusted')
+
+
+def _build(wrapped, kwonly_spec, func_name, mode, trusted):
+    if mode == 'native':
+        func = build_function(wrapped, kwonly_spec)
+        if func is not None:
+            return func
+    if trusted and kwonly_spec.varargs is None:
+        # Without validation and varargs the wrapper would have nothing to do.
+        return wrapped
+    if mode == 'codegen':
+        wrapper = build_wrapper(wrapped, kwonly_spec, validate=not trusted)
+        if wrapper is not None:
+            return _update_wrapper(wrapper, wrapped)
+    if trusted:
+        return _update_wrapper(_trusted_wrapper(wrapped, kwonly_spec), wrapped)
+
+    def wrapper(*args, **kwargs):
+        # The success path of the validation doesn't allocate anything, the errors are built by the spec.
+        for arg in kwonly_spec.required_kwonly_arg_names:
+            if arg not in kwargs:
+                raise kwonly_spec.missing_kwonly_args_error(func_name, kwargs)
+        first_kwonly_index = kwonly_spec.first_kwonly_index
+        if len(args) > first_kwonly_index:
+            if kwonly_spec.varargs is None:
+                raise kwonly_spec.too_many_args_error(func_name, len(args))
+            kwonly_args_from_kwargs = tuple(kwargs.pop(arg, default) for arg, default in kwonly_spec.kwonly_args)
+            args = args[:first_kwonly_index] + kwonly_args_from_kwargs + args[first_kwonly_index:]
+
+        return wrapped(*args, **kwargs)
+
+    return _update_wrapper(wrapper, wrapped)
+
+
+def _update_wrapper(wrapper, wrapped, kind=None):
+    """ ``update_wrapper()`` that also makes the wrapper identifiable in the output of profilers if it is enabled:
+    its code object gets the location and the tagged name of the wrapped function (see ``kwonly_args.profiling``).
 
+    The wrappers return the coroutine/generator objects created by the wrapped function without awaiting/iterating
+    them so they don't add frames to the execution of the coroutine/generator but a wrapper of a coroutine function
+    is a regular function. It is marked as a coroutine function for ``inspect.iscoroutinefunction()`` and
+    ``asyncio.iscoroutinefunction()``. """
+    update_wrapper(wrapper, wrapped)
+    # python2 doesn't set __wrapped__
+    wrapper.__wrapped__ = wrapped
+    if function_kind(wrapped) == 'coroutine':
+        mark_coroutine_function(wrapper)
+    return rename_wrapper(wrapper, wrapped, kind)
+
+
+def _trusted_wrapper(wrapped, kwonly_spec):
+    """ The generic wrapper without validation for functions with varargs. """
+    def wrapper(*args, **kwargs):
+        first_kwonly_index = kwonly_spec.first_kwonly_index
+        if len(args) > first_kwonly_index:
+            kwonly_args_from_kwargs = tuple(kwargs.pop(arg, default) for arg, default in kwonly_spec.kwonly_args)
+            args = args[:first_kwonly_index] + kwonly_args_from_kwargs + args[first_kwonly_index:]
+        return wrapped(*args, **kwargs)
+    return wrapper
+
+
+def _debug_wrapper(decorated, wrapped, func_name):
+    """ Wraps the result of the normal decoration with the call-time checks of ``validation='debug'``. """
+    defaults = getattr(wrapped, '__defaults__', None)
+
+    def wrapper(*args, **kwargs):
+        if getattr(wrapped, '__defaults__', None) is not defaults:
+            raise RuntimeError("The __defaults__ of %s() have been replaced after decoration" % func_name)
+        for value in args:
+            if value is KWONLY_REQUIRED:
+                raise TypeError("%s() received KWONLY_REQUIRED as a positional argument value" % func_name)
+        for arg, value in kwargs.items():
+            if value is KWONLY_REQUIRED:
+                raise TypeError("%s() received KWONLY_REQUIRED as the value of argument %r" % (func_name, arg))
+        return decorated(*args, **kwargs)
+
+    return _update_wrapper(wrapper, wrapped, 'debug')
+
+
+def _decorate_lazily(wrapped, name, mode, validation, instrumentation):
+    """ Returns a trampoline that calls ``_decorate()`` only when it is called for the first time. """
+    decorated = []
+
+    def resolve():
+        _lazy_lock.acquire()
+        try:
+            if not decorated:
+                decorated.append(_decorate(wrapped, name, mode, validation, instrumentation))
+                lazy_wrapper = lazy_wrapper_ref()
+                if lazy_wrapper is not None:
+                    _lazy_pending.pop(lazy_wrapper, None)
+        finally:
+            _lazy_lock.release()
+        return decorated[0]
+
+    def lazy_wrapper(*args, **kwargs):
+        if decorated:
+            return decorated[0](*args, **kwargs)
+        return resolve()(*args, **kwargs)
+
+    _update_wrapper(lazy_wrapper, wrapped, 'lazy')
+    # resolve() references lazy_wrapper only weakly otherwise _lazy_pending would keep it alive forever
+    lazy_wrapper_ref = weakref.ref(lazy_wrapper)
+    _lazy_pending[lazy_wrapper] = resolve
+    return lazy_wrapper
+
+
+def validate_all():
+    """ Finishes the decoration of the lazily decorated functions that haven't been called yet. Raises the same
+    exception that would have been raised by the first problematic function at decoration time without the
+    ``lazy`` option (e.g.: the function doesn't have an argument with the specified name). Call this from your
+    tests to detect invalid decorations without having to call each lazily decorated function. """
+    for resolve in list(_lazy_pending.values()):
+        resolve()
+
+
+kwonly_defaults = first_kwonly_arg(FIRST_DEFAULT_ARG)
+
+
+# Special methods decorated by ``kwonly_class()``. The other special methods are called by the interpreter with
+# positional args so they are left alone.
+CLASS_SPECIAL_METHODS = ('__init__', '__new__', '__call__')
+
+
+def kwonly_class(name=FIRST_DEFAULT_ARG, mode=None, lazy=None, validation=None, instrumentation=None):
+    """ A class decorator that applies ``first_kwonly_arg(name, ...)`` to the methods of the class in one pass:
+
+        >>> @kwonly_class()
+        >>> class Model(object):
+        >>>     def __init__(self, id, name=None, created=KWONLY_REQUIRED):
+        >>>         ...
+        >>>
+        >>>     @classmethod
+        >>>     def load(cls, id, cache=True):
+        >>>         ...
+
+    Regular, static and class methods are decorated along with the accessors of properties. The decorators don't
+    have to be applied in a specific order: static and class methods are unwrapped, their function is decorated and
+    rewrapped. Methods without default arguments, methods that don't have a default argument called ``name`` and
+    methods that have already been decorated are skipped. Special methods are skipped except for
+    ``CLASS_SPECIAL_METHODS``. The inherited methods aren't decorated (they belong to the base class).
+
+    The parameters are the same as those of ``first_kwonly_arg()`` except that the default ``name`` is
+    ``FIRST_DEFAULT_ARG`` and ``mode`` defaults to ``'codegen'`` unless the process-wide mode is ``'native'``.
+    The generic wrapper would receive the arguments of every method call packed into ``*args`` just to unpack them
+    again while the codegen wrappers have the same explicit arguments as the method.
+    """
+    if mode is None:
+        mode = 'native' if _config['mode'] == 'native' else 'codegen'
+    decorator = first_kwonly_arg(name, mode=mode, lazy=lazy, validation=validation, instrumentation=instrumentation)
+
+    def decorate_function(func):
+        if type(func) is not types.FunctionType or is_decorated(func):
+            return func
+        defaults = func.__defaults__
         if not defaults:
-            raise TypeError("You can't use @first_kwonly_arg on a function that doesn't have default arguments!")
-        first_default_index = len(arg_names) - len(defaults)
+            return func
+        if name is not FIRST_DEFAULT_ARG:
+            code = func.__code__
+            if name not in code.co_varnames[code.co_argcount - len(defaults):code.co_argcount]:
+                return func
+        return decorator(func)
 
-        if name is FIRST_DEFAULT_ARG:
-            first_kwonly_index = first_default_index
-        else:
-            try:
-                first_kwonly_index = arg_names.index(name)
-            except ValueError:
-                raise ValueError("%s() doesn't have an argument with the specified first_kwonly_arg=%r name" % (
-                                 getattr(wrapped, '__name__', '?'), name))
-
-        if first_kwonly_index < first_default_index:
-            raise ValueError("The specified first_kwonly_arg=%r must have a default value!" % (name,))
-
-        kwonly_defaults = defaults[-(len(arg_names)-first_kwonly_index):]
-        kwonly_args = tuple(zip(arg_names[first_kwonly_index:], kwonly_defaults))
-        required_kwonly_args = frozenset(arg for arg, default in kwonly_args if default is KWONLY_REQUIRED)
-
-        def wrapper(*args, **kwargs):
-            if required_kwonly_args:
-                missing_kwonly_args = required_kwonly_args.difference(kwargs.keys())
-                if missing_kwonly_args:
-                    raise TypeError("%s() missing %s keyword-only argument(s): %s" % (
-                                    getattr(wrapped, '__name__', '?'), len(missing_kwonly_args),
-                                    ', '.join(sorted(missing_kwonly_args))))
-            if len(args) > first_kwonly_index:
-                if varargs is None:
-                    raise TypeError("%s() takes exactly %s arguments (%s given)" % (
-                                    getattr(wrapped, '__name__', '?'), first_kwonly_index, len(args)))
-                kwonly_args_from_kwargs = tuple(kwargs.pop(arg, default) for arg, default in kwonly_args)
-                args = args[:first_kwonly_index] + kwonly_args_from_kwargs + args[first_kwonly_index:]
-
-            return wrapped(*args, **kwargs)
-
-        return update_wrapper(wrapper, wrapped)
+    def decorate_attribute(attr_name, value):
+        if attr_name.startswith('__') and attr_name.endswith('__') and attr_name not in CLASS_SPECIAL_METHODS:
+            return value
+        if isinstance(value, (staticmethod, classmethod)):
+            func = decorate_function(value.__func__)
+            return value if func is value.__func__ else type(value)(func)
+        if isinstance(value, property):
+            accessors = [decorate_function(accessor) for accessor in (value.fget, value.fset, value.fdel)]
+            if accessors == [value.fget, value.fset, value.fdel]:
+                return value
+            return type(value)(accessors[0], accessors[1], accessors[2], value.__doc__)
+        return decorate_function(value)
+
+    def decorate(cls):
+        for attr_name, value in list(cls.__dict__.items()):
+            new_value = decorate_attribute(attr_name, value)
+            if new_value is not value:
+                setattr(cls, attr_name, new_value)
+        return cls
     return decorate
 
 
-kwonly_defaults = first_kwonly_arg(FIRST_DEFAULT_ARG)
+def memory_footprint():
+    """ Returns a dictionary that describes the memory used by the shared data structures of the library:
+
+    - ``specs``: The number of live cached signature specs. A spec is shared by the decorated functions defined
+      inside functions that have the same argument names, default argument values and selected first keyword-only
+      argument. The specs of the other functions aren't cached so they are counted only with the wrappers.
+    - ``spec_bytes``: The memory used by the live specs.
+    - ``codegen_factories``: The number of cached wrapper factories used by ``mode='codegen'``. A factory is shared
+      by the functions that have the same signature layout.
+    - ``codegen_bytes``: The approximate memory used by the cached wrapper factories and by the copies of their
+      code objects renamed for the error messages of python2 and python3.9 and older.
+    - ``partial_factories``, ``partial_bytes``: The cached partial function factories of ``kwonly_partial()``.
+    - ``init_factories``, ``init_bytes``: The cached ``__init__`` factories of ``kwonly_init()``.
+    - ``renamed_codes``, ``renamed_code_bytes``: The live code objects of the wrappers renamed for the profilers
+      (``configure(profiling=True)``). They aren't shared: every ``def`` statement of a decorated function has its own.
+    - ``instrumented_functions``, ``instrumentation_bytes``: The statistics of the instrumented functions including
+      the counters of the threads.
+    - ``unpickled_functions``, ``pickling_bytes``: The functions cached by ``kwonly_args.pickling`` (zero if that
+      module hasn't been imported).
+    - ``total_bytes``: The sum of the above memory sizes.
+
+    The memory used by the wrapper functions themselves (a function object with a closure per decorated function)
+    isn't included.
+    """
+    footprint = {}
+    modules = [(spec, 'specs', 'spec_bytes'),
+               (codegen, 'codegen_factories', 'codegen_bytes'),
+               (partial, 'partial_factories', 'partial_bytes'),
+               (records, 'init_factories', 'init_bytes'),
+               (profiling_module, 'renamed_codes', 'renamed_code_bytes'),
+               (instrumentation, 'instrumented_functions', 'instrumentation_bytes')]
+    # Importing pickling just to report that its cache is empty would be a waste.
+    pickling = sys.modules.get('kwonly_args.pickling')
+    if pickling is None:
+        footprint.update(unpickled_functions=0, pickling_bytes=0)
+    else:
+        modules.append((pickling, 'unpickled_functions', 'pickling_bytes'))
+    for module, count_key, bytes_key in modules:
+        footprint[count_key], footprint[bytes_key] = module.memory_footprint()
+    footprint['total_bytes'] = sum(value for key, value in footprint.items() if key.endswith('_bytes'))
+    return footprint
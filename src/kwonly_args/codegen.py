@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+""" Generates wrappers that are specialized for the exact signature of the decorated function.
+
+The generic wrapper has to find out the layout of the call at runtime (slicing and concatenating ``args``, popping
+the keyword-only args in a generator, etc...). A generated wrapper has an explicit signature with the positional
+arguments of the wrapped function so the interpreter does the argument binding for us and the remaining
+keyword-only argument shuffling is done with straight-line code.
+"""
+
+import keyword
+import sys
+import types
+import weakref
+
+
+# Compiling the generated source is much more expensive than everything else done by the decorator and many
+# functions share the same signature. For this reason the generated source defines a factory function that creates
+# the wrapper and the factories are cached by their source: {source: factory}
+# The wrappers created by a factory store everything they need in their closure. The source doesn't contain the name
+# of the wrapped function so the functions with the same signature layout share the factory.
+_factory_cache = {}
+
+# Before python3.10 the errors of argument binding (e.g.: missing positional args) contain the ``co_name`` of the
+# code object instead of the ``__qualname__`` of the function.
+_NAME_FROM_CODE = sys.version_info < (3, 10)
+
+# The copies of the code objects of the generated functions with the names of the wrapped functions (before
+# python3.10): {(id(code), name): renamed_code}
+# The original code objects belong to the cached factories that are never freed so their ids are stable.
+_renamed_codes = weakref.WeakValueDictionary()
+
+
+def is_identifier(name):
+    if not isinstance(name, str):
+        # e.g.: python2 tuple parameters: def func((a, b), c=0)
+        return False
+    if hasattr(name, 'isidentifier'):
+        valid = name.isidentifier()
+    else:
+        import re
+        valid = re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', name) is not None
+    return valid and not keyword.iskeyword(name)
+
+
+def reserved_prefix(arg_names):
+    """ Returns a prefix for the names used internally by the generated code. The names created with this prefix
+    can't collide with the argument names of the wrapped function. """
+    prefix = '_kwonly_'
+    while [arg for arg in arg_names if arg.startswith(prefix)]:
+        prefix = '_' + prefix
+    return prefix
+
+
+def num_positional_only_args(func):
+    """ Returns the number of python3.8+ positional-only args of ``func``. The generated signatures have to keep
+    them positional-only otherwise calls that pass the same name in ``**kwargs`` would be bound differently. """
+    return getattr(getattr(func, '__code__', None), 'co_posonlyargcount', 0)
+
+
+def _replace_code_name(code, name):
+    if hasattr(code, 'replace'):
+        # python3.8+
+        return code.replace(co_name=name)
+    args = [code.co_argcount, code.co_nlocals, code.co_stacksize, code.co_flags, code.co_code, code.co_consts,
+            code.co_names, code.co_varnames, code.co_filename, name, code.co_firstlineno, code.co_lnotab,
+            code.co_freevars, code.co_cellvars]
+    if hasattr(code, 'co_kwonlyargcount'):
+        args.insert(1, code.co_kwonlyargcount)
+    return types.CodeType(*args)
+
+
+def set_function_name(func, name):
+    """ Gives a generated function the ``name`` of the function it wraps. The errors of argument binding raised by
+    ``func`` contain this name like those raised by the wrapped function. """
+    func.__name__ = name
+    if _NAME_FROM_CODE and is_identifier(name):
+        code = func.__code__
+        key = (id(code), name)
+        renamed = _renamed_codes.get(key)
+        if renamed is None:
+            renamed = _replace_code_name(code, name)
+            _renamed_codes[key] = renamed
+        func.__code__ = renamed
+
+
+def build_wrapper(wrapped, spec, validate=True):
+    """ Returns a generated wrapper function or ``None`` if the signature of the wrapped function can't be
+    expressed with generated source code. In the latter case the caller should fall back to the generic wrapper.
+
+    :param validate: ``False`` omits the checks of the required keyword-only args and the number of positional args
+    from the generated code. Useful only if the wrapped function has varargs: otherwise the wrapper would do nothing.
+    """
+    arg_names = spec.arg_names
+    for arg in arg_names:
+        if not is_identifier(arg):
+            return None
+    num_positional_only = num_positional_only_args(wrapped)
+    if num_positional_only > spec.first_kwonly_index:
+        return None
+
+    func_name = getattr(wrapped, '__name__', '?')
+    prefix = reserved_prefix(arg_names)
+    wrapped_ref = prefix + 'wrapped'
+    spec_ref = prefix + 'spec'
+    name_ref = prefix + 'name'
+    varargs_ref = prefix + 'args'
+    kwargs_ref = prefix + 'kwargs'
+    factory_params = [wrapped_ref, spec_ref, name_ref]
+    factory_args = [wrapped, spec, func_name]
+
+    def default_ref(arg_index):
+        ref = '%sdefault_%s' % (prefix, arg_index)
+        factory_params.append(ref)
+        factory_args.append(spec.defaults[arg_index - spec.first_default_index])
+        return ref
+
+    first_kwonly_index = spec.first_kwonly_index
+    positional_args = list(arg_names[:first_kwonly_index])
+    params = []
+    for index, arg in enumerate(positional_args):
+        if index < spec.first_default_index:
+            params.append(arg)
+        else:
+            params.append('%s=%s' % (arg, default_ref(index)))
+    if num_positional_only:
+        params.insert(num_positional_only, '/')
+    params.append('*' + varargs_ref)
+    params.append('**' + kwargs_ref)
+
+    lines = ['    def wrapper(%s):' % ', '.join(params)]
+
+    if validate and spec.required_kwonly_arg_names:
+        lines.append('        if %s:' % ' or '.join('%r not in %s' % (arg, kwargs_ref)
+                                                    for arg in spec.required_kwonly_arg_names))
+        lines.append('            raise %s.missing_kwonly_args_error(%s, %s)' % (spec_ref, name_ref, kwargs_ref))
+
+    if spec.varargs is None:
+        if validate:
+            lines.append('        if %s:' % varargs_ref)
+            lines.append('            raise %s.too_many_args_error(%s, %s + len(%s))' % (
+                         spec_ref, name_ref, first_kwonly_index, varargs_ref))
+    else:
+        # Positional args have spilled into the varargs of the wrapped function: the keyword-only args have to be
+        # passed as positional args to make room for the varargs.
+        lines.append('        if %s:' % varargs_ref)
+        for index, (arg, _) in enumerate(spec.kwonly_args):
+            lines.append('            %s = %s.pop(%r, %s)' % (
+                         arg, kwargs_ref, arg, default_ref(first_kwonly_index + index)))
+        call_args = positional_args + [arg for arg, _ in spec.kwonly_args] + ['*' + varargs_ref, '**' + kwargs_ref]
+        lines.append('            return %s(%s)' % (wrapped_ref, ', '.join(call_args)))
+
+    lines.append('        return %s(%s)' % (wrapped_ref, ', '.join(positional_args + ['**' + kwargs_ref])))
+    lines.append('    return wrapper')
+    lines.insert(0, 'def factory(%s):' % ', '.join(factory_params))
+
+    source = '\n'.join(lines) + '\n'
+    factory = _factory_cache.get(source)
+    if factory is None:
+        namespace = {}
+        exec(compile(source, '<kwonly_args wrapper>', 'exec'), namespace)
+        factory = namespace['factory']
+        _factory_cache[source] = factory
+    wrapper = factory(*factory_args)
+    set_function_name(wrapper, func_name)
+    return wrapper
+
+
+def factory_cache_footprint(factory_cache):
+    """ Returns ``(num_factories, num_bytes)``: the number of factories in a ``{source: factory}`` cache of generated
+    code and their approximate memory usage. """
+    size = 0
+    for source, factory in list(factory_cache.items()):
+        code = factory.__code__
+        size += sys.getsizeof(source) + sys.getsizeof(factory) + sys.getsizeof(code) + sys.getsizeof(code.co_code)
+        size += sum(sys.getsizeof(const) for const in code.co_consts if isinstance(const, types.CodeType))
+    return len(factory_cache), size
+
+
+def memory_footprint():
+    """ Returns ``(num_factories, num_bytes)``: the number of cached wrapper factories and the approximate memory
+    usage of the factories and the renamed code objects. """
+    num_factories, size = factory_cache_footprint(_factory_cache)
+    size += sum(sys.getsizeof(code) for code in list(_renamed_codes.values()))
+    return num_factories, size
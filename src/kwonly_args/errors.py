@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+""" Error construction shared by all wrapper implementations. Keeping the message formatting here guarantees that
+the generic and the generated wrappers raise exactly the same errors. """
+
+
+def missing_kwonly_args_error(func_name, missing_kwonly_args):
+    return TypeError("%s() missing %s keyword-only argument(s): %s" % (
+                     func_name, len(missing_kwonly_args), ', '.join(sorted(missing_kwonly_args))))
+
+
+def too_many_args_error(func_name, max_num_args, num_args):
+    return TypeError("%s() takes exactly %s arguments (%s given)" % (func_name, max_num_args, num_args))
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+""" An optional import hook that compiles the ``first_kwonly_arg`` / ``kwonly_defaults`` decorators away. Python3.8+.
+
+    import kwonly_args.import_hook
+    kwonly_args.import_hook.install(['vendored_package', 'third_party.module'])
+
+    import vendored_package     # the decorated functions have native keyword-only args
+
+The modules of the given packages are loaded from their source with a loader that transforms the AST of the module
+before compilation: the decorated functions get native keyword-only args (see ``kwonly_args.migrate``) and their
+decorators are removed so the functions don't have wrappers. The line numbers don't change. The decorators that
+can't be converted (e.g.: the name of the first keyword-only arg isn't a string literal) are kept and work as usual.
+The behavior of the converted functions is the same as with ``first_kwonly_arg(..., mode='native')``.
+
+The transformed code objects are cached in ``__pycache__`` next to the normal bytecode files under a distinct
+optimization tag (e.g.: ``module.cpython-311.opt-kwonly1.pyc``) so the transformation is done only when the source
+changes and the normal bytecode files aren't affected.
+"""
+
+import ast
+import importlib.machinery
+import importlib.util
+import marshal
+import struct
+import sys
+
+from kwonly_args.migrate import Imports, decorator_info, find_first_kwonly_index
+
+
+# Increase this when the output of the transformation changes: this invalidates the previously cached bytecode.
+TRANSFORM_VERSION = 1
+
+
+def optimization_tag():
+    tag = 'kwonly%d' % TRANSFORM_VERSION
+    if sys.flags.optimize:
+        tag += 'o%d' % sys.flags.optimize
+    return tag
+
+
+def transform(tree):
+    """ Converts the decorated functions of the module AST to native keyword-only args in place. Returns the number
+    of converted functions. """
+    imports = Imports(tree)
+    if not imports.names and not imports.modules:
+        return 0
+
+    num_converted = 0
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) or not node.decorator_list:
+            continue
+        decorator_index = len(node.decorator_list) - 1
+        first_kwonly, _ = decorator_info(node.decorator_list[decorator_index], imports)
+        if first_kwonly is None:
+            continue
+        index, _ = find_first_kwonly_index(node, decorator_index, first_kwonly)
+        if index is None:
+            continue
+
+        arguments = node.args
+        index -= len(getattr(arguments, 'posonlyargs', []))
+        new_kwonly_args = arguments.args[index:]
+        new_kwonly_defaults = arguments.defaults[len(arguments.defaults) - len(new_kwonly_args):]
+        arguments.args = arguments.args[:index]
+        arguments.defaults = arguments.defaults[:len(arguments.defaults) - len(new_kwonly_args)]
+        arguments.kwonlyargs = new_kwonly_args + arguments.kwonlyargs
+        arguments.kw_defaults = [None if imports.library_name(default) == 'KWONLY_REQUIRED' else default
+                                 for default in new_kwonly_defaults] + arguments.kw_defaults
+        del node.decorator_list[decorator_index]
+        num_converted += 1
+    return num_converted
+
+
+class KwonlySourceLoader(importlib.machinery.SourceFileLoader):
+    """ Loads python source files with ``transform()`` applied to their AST. """
+
+    def source_to_code(self, data, path, _optimize=-1):
+        tree = compile(data, path, 'exec', ast.PyCF_ONLY_AST, dont_inherit=True, optimize=_optimize)
+        transform(tree)
+        return compile(tree, path, 'exec', dont_inherit=True, optimize=_optimize)
+
+    def get_code(self, fullname):
+        """ Like ``SourceFileLoader.get_code()`` but with its own bytecode cache files. The cache files have the
+        format described in PEP 552 (timestamp based invalidation). """
+        source_path = self.get_filename(fullname)
+        try:
+            bytecode_path = importlib.util.cache_from_source(source_path, optimization=optimization_tag())
+        except NotImplementedError:
+            # sys.implementation.cache_tag is None
+            bytecode_path = None
+
+        stats = self.path_stats(source_path)
+        header = (importlib.util.MAGIC_NUMBER + struct.pack('<III', 0, int(stats['mtime']) & 0xFFFFFFFF,
+                                                            stats['size'] & 0xFFFFFFFF))
+        if bytecode_path is not None:
+            try:
+                data = self.get_data(bytecode_path)
+            except OSError:
+                pass
+            else:
+                if data[:len(header)] == header:
+                    try:
+                        return marshal.loads(data[len(header):])
+                    except (EOFError, ValueError, TypeError):
+                        pass
+
+        code = self.source_to_code(self.get_data(source_path), source_path)
+        if bytecode_path is not None and not sys.dont_write_bytecode:
+            try:
+                self.set_data(bytecode_path, header + marshal.dumps(code))
+            except OSError:
+                pass
+        return code
+
+
+class KwonlyFinder(object):
+    """ A ``sys.meta_path`` finder that selects ``KwonlySourceLoader`` for the modules of the given packages. """
+
+    def __init__(self, prefixes):
+        self.prefixes = tuple(prefixes)
+
+    def matches(self, fullname):
+        for prefix in self.prefixes:
+            if fullname == prefix or fullname.startswith(prefix + '.'):
+                return True
+        return False
+
+    def find_spec(self, fullname, path=None, target=None):
+        if not self.matches(fullname):
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is None or type(spec.loader) is not importlib.machinery.SourceFileLoader:
+            return spec
+        spec.loader = KwonlySourceLoader(spec.loader.name, spec.loader.path)
+        if spec.cached is not None:
+            spec.cached = importlib.util.cache_from_source(spec.origin, optimization=optimization_tag())
+        return spec
+
+    def invalidate_caches(self):
+        pass
+
+
+def install(prefixes):
+    """ Installs a finder in front of ``sys.meta_path`` that transforms the modules of the given packages (and their
+    subpackages) when they are imported. The modules that have already been imported aren't affected.
+
+    :param prefixes: Names of packages and modules, e.g.: ``['vendored_package', 'third_party.module']``.
+    :return: The installed finder. Pass it to ``uninstall()`` to remove it.
+    """
+    if sys.version_info < (3, 8):
+        raise RuntimeError('The kwonly_args import hook requires python3.8+')
+    finder = KwonlyFinder(prefixes)
+    sys.meta_path.insert(0, finder)
+    return finder
+
+
+def uninstall(finder):
+    if finder in sys.meta_path:
+        sys.meta_path.remove(finder)
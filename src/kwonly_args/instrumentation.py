@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+""" Opt-in call statistics of the decorated functions.
+
+The instrumentation is selected at decoration time (see the ``instrumentation`` parameter of ``first_kwonly_arg()``)
+so the functions decorated without it don't have any instrumentation code in their call path. The statistics are
+aggregated by the qualified name of the decorated function: e.g. the functions created by the same ``def``
+statement of a factory function share a single ``FunctionStats`` object.
+
+Every thread updates its own set of counters (a shard) so the instrumented calls don't contend for shared memory
+or locks, not even on free-threaded python builds, and increments aren't lost when several threads call the same
+function simultaneously. The attributes of ``FunctionStats`` return the sum of the shards. The shards are keyed by
+thread ident and they refer to their threads through weakrefs so they don't keep the finished threads alive. The
+shards of the threads that have finished are merged into a shared total when a new thread starts calling the
+function.
+"""
+
+import bisect
+import sys
+import threading
+import weakref
+
+from kwonly_args.introspection import function_kind
+
+try:
+    from time import perf_counter as timer
+except ImportError:
+    from timeit import default_timer as timer
+
+
+# Instrumentation levels selectable with the ``instrumentation`` parameter of ``first_kwonly_arg()``.
+INSTRUMENTATIONS = ('off', 'counts', 'timing')
+
+# The environment variable that sets the initial process-wide instrumentation level.
+INSTRUMENTATION_ENV_VAR = 'KWONLY_ARGS_INSTRUMENTATION'
+
+# Upper bounds of the buckets of the wall-time histograms in seconds. The last bucket has no upper bound.
+HISTOGRAM_BOUNDS = (1e-6, 2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 2e-4, 5e-4, 1e-3, 2e-3, 5e-3, 1e-2, 2e-2, 5e-2, 0.1,
+                    0.2, 0.5, 1.0)
+
+# {qualified_name: FunctionStats}
+_registry = {}
+
+# Functions called before every call of an instrumented function with the ``(stats, args, kwargs)`` arguments.
+_hooks = []
+
+
+class _Counters(object):
+    """ The counters of a thread (or the merged counters of finished threads). """
+    __slots__ = ('thread_ref', 'calls', 'spilled_calls', 'validation_failures', 'total_time', 'histogram')
+
+    def __init__(self, thread=None):
+        self.thread_ref = None if thread is None else weakref.ref(thread)
+        self.reset()
+
+    def is_alive(self):
+        """ Returns ``False`` if the thread of the counters has finished (or it has been garbage collected). """
+        thread = self.thread_ref()
+        return thread is not None and thread.is_alive()
+
+    def reset(self):
+        self.calls = 0
+        self.spilled_calls = 0
+        self.validation_failures = 0
+        self.total_time = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def add(self, other):
+        self.calls += other.calls
+        self.spilled_calls += other.spilled_calls
+        self.validation_failures += other.validation_failures
+        self.total_time += other.total_time
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+
+def _counter_property(attr_name):
+    def get(self):
+        return sum([getattr(counters, attr_name) for counters in self._all_counters()])
+
+    def set(self, value):
+        # Used mainly for zeroing a counter: the current thread gets the value, the other shards are zeroed.
+        for counters in self._all_counters():
+            setattr(counters, attr_name, 0)
+        setattr(self.thread_counters(), attr_name, value)
+    return property(get, set)
+
+
+class FunctionStats(object):
+    """ The call statistics of the decorated functions with the same qualified name.
+
+    - ``calls``: The number of calls.
+    - ``spilled_calls``: The number of calls that passed positional args into the varargs of the function. The
+      caller may intend to pass a keyword-only arg positionally.
+    - ``validation_failures``: The number of calls with missing required keyword-only args or with too many
+      positional args.
+    - ``total_time``: The sum of the wall-times of the calls in seconds. Measured only with ``'timing'`` and only
+      for regular functions (not for coroutine and generator functions).
+    - ``histogram``: The number of calls in the buckets of ``HISTOGRAM_BOUNDS``. Measured only with ``'timing'``.
+    """
+    __slots__ = ('name', 'local', '_shards', '_retired', '_lock')
+
+    calls = _counter_property('calls')
+    spilled_calls = _counter_property('spilled_calls')
+    validation_failures = _counter_property('validation_failures')
+    total_time = _counter_property('total_time')
+
+    def __init__(self, name):
+        self.name = name
+        # local.counters: the shard of the current thread
+        self.local = threading.local()
+        # {thread_ident: _Counters}
+        self._shards = {}
+        self._retired = _Counters()
+        self._lock = threading.Lock()
+
+    @property
+    def histogram(self):
+        histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        for counters in self._all_counters():
+            histogram = [a + b for a, b in zip(histogram, counters.histogram)]
+        return histogram
+
+    def thread_counters(self):
+        """ Returns the counters of the current thread. The instrumented calls try ``self.local.counters`` first. """
+        counters = getattr(self.local, 'counters', None)
+        if counters is None:
+            thread = threading.current_thread()
+            counters = _Counters(thread)
+            self._lock.acquire()
+            try:
+                for ident, shard in list(self._shards.items()):
+                    # The ident of a finished thread can be reused by a new thread.
+                    if ident == thread.ident or not shard.is_alive():
+                        self._retired.add(shard)
+                        del self._shards[ident]
+                self._shards[thread.ident] = counters
+            finally:
+                self._lock.release()
+            self.local.counters = counters
+        return counters
+
+    def _all_counters(self):
+        return [self._retired] + list(self._shards.values())
+
+    def reset(self):
+        for counters in self._all_counters():
+            counters.reset()
+
+    def as_dict(self):
+        return dict(name=self.name, calls=self.calls, spilled_calls=self.spilled_calls,
+                    validation_failures=self.validation_failures, total_time=self.total_time,
+                    histogram=self.histogram)
+
+
+def memory_footprint():
+    """ Returns ``(num_stats, num_bytes)``: the number of registered ``FunctionStats`` objects and their approximate
+    memory usage (including the counters of the threads). """
+    size = sys.getsizeof(_registry)
+    all_stats = list(_registry.values())
+    for stats in all_stats:
+        size += sys.getsizeof(stats) + sys.getsizeof(stats.name) + sys.getsizeof(stats.local)
+        for counters in stats._all_counters():
+            size += sys.getsizeof(counters) + sys.getsizeof(counters.histogram)
+    return len(all_stats), size
+
+
+def check_instrumentation(instrumentation):
+    if instrumentation not in INSTRUMENTATIONS:
+        raise ValueError("Invalid instrumentation=%r, it must be one of: %s" % (
+                         instrumentation, ', '.join(INSTRUMENTATIONS)))
+
+
+def qualified_name(func):
+    name = getattr(func, '__qualname__', None) or getattr(func, '__name__', '?')
+    module = getattr(func, '__module__', None)
+    return '%s.%s' % (module, name) if module else name
+
+
+def get_function_stats(name):
+    """ Returns the ``FunctionStats`` registered with the given qualified name. Creates it if it doesn't exist. """
+    stats = _registry.get(name)
+    if stats is None:
+        stats = _registry.setdefault(name, FunctionStats(name))
+    return stats
+
+
+def instrument(decorated, wrapped, spec, timing):
+    """ Returns a wrapper that updates the statistics of ``wrapped`` and calls ``decorated``. """
+    stats = get_function_stats(qualified_name(wrapped))
+    # The call of a coroutine/generator function only creates the coroutine/generator object.
+    timing = timing and function_kind(wrapped) is None
+    required_kwonly_arg_names = spec.required_kwonly_arg_names
+    first_kwonly_index = spec.first_kwonly_index
+    has_varargs = spec.varargs is not None
+
+    local = stats.local
+
+    def wrapper(*args, **kwargs):
+        try:
+            counters = local.counters
+        except AttributeError:
+            counters = stats.thread_counters()
+        counters.calls += 1
+        # A call is counted as at most one validation failure even if it contains several errors.
+        for arg in required_kwonly_arg_names:
+            if arg not in kwargs:
+                counters.validation_failures += 1
+                break
+        else:
+            if len(args) > first_kwonly_index and not has_varargs:
+                counters.validation_failures += 1
+        if len(args) > first_kwonly_index and has_varargs:
+            counters.spilled_calls += 1
+        if _hooks:
+            for hook in list(_hooks):
+                hook(stats, args, kwargs)
+        if not timing:
+            return decorated(*args, **kwargs)
+        t0 = timer()
+        try:
+            return decorated(*args, **kwargs)
+        finally:
+            elapsed = timer() - t0
+            counters.total_time += elapsed
+            counters.histogram[bisect.bisect_left(HISTOGRAM_BOUNDS, elapsed)] += 1
+
+    return wrapper
+
+
+def add_hook(hook):
+    """ Registers a ``hook(stats, args, kwargs)`` function that is called before every call of the instrumented
+    functions. ``stats`` is the ``FunctionStats`` of the called function. """
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    _hooks.remove(hook)
+
+
+def all_stats():
+    """ Returns the ``FunctionStats`` objects of the instrumented functions sorted by their number of calls. """
+    return sorted(_registry.values(), key=lambda stats: (-stats.calls, stats.name))
+
+
+def reset_stats():
+    """ Zeroes the statistics of all instrumented functions. """
+    for stats in list(_registry.values()):
+        stats.reset()
+
+
+def format_stats(limit=None):
+    """ Returns the statistics of the most frequently called ``limit`` functions as a text table. """
+    lines = ['%12s %12s %12s %14s  %s' % ('calls', 'spilled', 'failures', 'total time s', 'function')]
+    for stats in all_stats()[:limit]:
+        lines.append('%12d %12d %12d %14.6f  %s' % (stats.calls, stats.spilled_calls, stats.validation_failures,
+                                                    stats.total_time, stats.name))
+    return '\n'.join(lines)
+
+
+def dump_stats(file=None, limit=None):
+    """ Writes the output of ``format_stats()`` to ``file`` (``sys.stderr`` by default). """
+    (file or sys.stderr).write(format_stats(limit) + '\n')
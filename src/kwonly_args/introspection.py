@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+""" Fast signature introspection for the decorator.
+
+``inspect.getfullargspec()`` builds a full ``inspect.Signature`` object just to return the few pieces of information
+needed by the decorator. This module reads them directly from the code object and the ``__defaults__`` of python
+functions and uses ``inspect`` only for other callables (builtins, callable objects, bound methods, functions with
+a ``__signature__`` attribute, python2 tuple parameters, etc...). The ``inspect`` module itself is imported only
+when it is needed because importing it takes more time than decorating thousands of functions.
+"""
+
+import sys
+import types
+
+
+# Same as inspect.CO_VARARGS, inspect.CO_VARKEYWORDS, etc...
+CO_VARARGS = 0x04
+CO_VARKEYWORDS = 0x08
+CO_NESTED = 0x10
+CO_GENERATOR = 0x20
+CO_COROUTINE = 0x80
+CO_ASYNC_GENERATOR = 0x200
+
+
+def inspect_argspec(func):
+    """ Returns the ``(arg_names, varargs, varkw, defaults)`` tuple of ``func`` using the ``inspect`` module. """
+    import inspect
+    if sys.version_info[0] == 2:
+        return tuple(inspect.getargspec(func))
+    return tuple(inspect.getfullargspec(func)[:4])
+
+
+def get_argspec(func):
+    """ Returns the same ``(arg_names, varargs, varkw, defaults)`` tuple as ``inspect_argspec()``. """
+    if type(func) is not types.FunctionType or getattr(func, '__signature__', None) is not None:
+        return inspect_argspec(func)
+
+    code = func.__code__
+    var_names = code.co_varnames
+    num_args = code.co_argcount
+    arg_names = list(var_names[:num_args])
+    if [arg for arg in arg_names if arg.startswith('.')]:
+        # python2 tuple parameters: inspect.getargspec() reconstructs the nested argument names from the bytecode
+        return inspect_argspec(func)
+
+    index = num_args + getattr(code, 'co_kwonlyargcount', 0)
+    varargs = None
+    if code.co_flags & CO_VARARGS:
+        varargs = var_names[index]
+        index += 1
+    varkw = var_names[index] if code.co_flags & CO_VARKEYWORDS else None
+    return arg_names, varargs, varkw, func.__defaults__
+
+
+def function_kind(func):
+    """ Returns ``'coroutine'``, ``'generator'``, ``'async_generator'`` or ``None`` (regular function). Wrappers
+    created by the library for coroutine functions are marked as coroutine functions so they are also recognized. """
+    code = getattr(func, '__code__', None)
+    flags = getattr(code, 'co_flags', 0)
+    if flags & CO_COROUTINE or is_marked_coroutine_function(func):
+        return 'coroutine'
+    if flags & CO_ASYNC_GENERATOR:
+        return 'async_generator'
+    if flags & CO_GENERATOR:
+        return 'generator'
+    return None
+
+
+def is_marked_coroutine_function(func):
+    if getattr(func, '_is_coroutine_marker', None) is not None:
+        return True
+    # The marker of asyncio.iscoroutinefunction() before python3.12. If asyncio hasn't been imported yet then
+    # nothing has been marked.
+    coroutines = sys.modules.get('asyncio.coroutines')
+    marker = getattr(coroutines, '_is_coroutine', None)
+    return marker is not None and getattr(func, '_is_coroutine', None) is marker
+
+
+def mark_coroutine_function(func):
+    """ Makes ``inspect.iscoroutinefunction()`` (python3.12+) and ``asyncio.iscoroutinefunction()`` return ``True``
+    for a regular function that returns a coroutine. Older python versions don't provide a way to mark a function
+    for ``inspect.iscoroutinefunction()``. """
+    if sys.version_info >= (3, 12):
+        import inspect
+        inspect.markcoroutinefunction(func)
+    else:
+        import asyncio.coroutines
+        func._is_coroutine = asyncio.coroutines._is_coroutine
+    return func
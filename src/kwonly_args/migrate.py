@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+""" Rewrites the functions decorated with ``first_kwonly_arg`` / ``kwonly_defaults`` to native python3 keyword-only
+argument syntax and removes the decorators. Requires python3.8+.
+
+    python -m kwonly_args.migrate [--write] PATH...
+
+Without ``--write`` the tool prints a unified diff of the changes (dry-run). The sites that can't be converted
+(e.g.: the name of the first keyword-only arg isn't a string literal or the decorator isn't used with the ``@``
+syntax) are reported to stderr and the exit code is 1 if there are any.
+
+The tool modifies only the decorator lines, the signatures of the converted functions and the imports that become
+unused: the rest of the source is kept intact. Example:
+
+    @first_kwonly_arg('d1')
+    def func(a0, d0='d0', d1='d1', d2=KWONLY_REQUIRED, *args):
+
+becomes
+
+    def func(a0, d0='d0', *args, d1='d1', d2):
+"""
+
+import argparse
+import ast
+import difflib
+import io
+import os
+import sys
+
+
+SENTINEL_NAMES = ('KWONLY_REQUIRED', 'FIRST_DEFAULT_ARG')
+DECORATOR_NAMES = ('first_kwonly_arg', 'kwonly_defaults')
+LIBRARY_NAMES = DECORATOR_NAMES + SENTINEL_NAMES
+
+
+class Problem(object):
+    """ A site that couldn't be converted. """
+    def __init__(self, lineno, message):
+        self.lineno = lineno
+        self.message = message
+
+    def __repr__(self):
+        return 'Problem(%r, %r)' % (self.lineno, self.message)
+
+
+class Imports(object):
+    """ The names under which the module refers to the items of the library. """
+    def __init__(self, tree):
+        # {local_name: library_name}
+        self.names = {}
+        # local names of the kwonly_args module
+        self.modules = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module == 'kwonly_args' and not node.level:
+                for alias in node.names:
+                    if alias.name in LIBRARY_NAMES:
+                        self.names[alias.asname or alias.name] = alias.name
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.name == 'kwonly_args':
+                        self.modules.add(alias.asname or alias.name)
+
+    def library_name(self, node):
+        """ Returns the library name referenced by the given expression or ``None``. """
+        if isinstance(node, ast.Name):
+            return self.names.get(node.id)
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id in self.modules:
+            if node.attr in LIBRARY_NAMES:
+                return node.attr
+        return None
+
+
+class _Source(object):
+    """ Converts the (line, utf8_byte_column) positions of the ``ast`` nodes to string offsets. """
+    def __init__(self, text):
+        self.text = text
+        # str.splitlines() would split at more characters than the python tokenizer (e.g.: form feed).
+        self.lines = io.StringIO(text, newline='').readlines()
+        self.line_offsets = [0]
+        for line in self.lines:
+            self.line_offsets.append(self.line_offsets[-1] + len(line))
+
+    def offset(self, lineno, col_offset):
+        line = self.lines[lineno - 1] if lineno <= len(self.lines) else ''
+        return self.line_offsets[lineno - 1] + len(line.encode('utf-8')[:col_offset].decode('utf-8', 'replace'))
+
+    def start(self, node):
+        return self.offset(node.lineno, node.col_offset)
+
+    def end(self, node):
+        return self.offset(node.end_lineno, node.end_col_offset)
+
+
+def _skip_to(text, pos, char):
+    """ Returns the position of the next ``char`` skipping whitespace, commas, comments and line continuations or
+    ``None`` if another character is found first. """
+    while pos < len(text):
+        c = text[pos]
+        if c == char:
+            return pos
+        if c == '#':
+            pos = text.find('\n', pos)
+            if pos < 0:
+                return None
+        elif not (c.isspace() or c in ',\\'):
+            return None
+        pos += 1
+    return None
+
+
+def decorator_info(decorator, imports):
+    """ Returns ``(first_kwonly_arg_name, problem_message)``. The name is ``FIRST_DEFAULT_ARG`` for ``kwonly_defaults``.
+    Returns ``(None, None)`` if this isn't a decorator of the library. """
+    if imports.library_name(decorator) == 'kwonly_defaults':
+        return 'FIRST_DEFAULT_ARG', None
+    if not isinstance(decorator, ast.Call) or imports.library_name(decorator.func) != 'first_kwonly_arg':
+        return None, None
+
+    name_nodes = decorator.args[:1] + [kw.value for kw in decorator.keywords if kw.arg == 'name']
+    if len(name_nodes) != 1 or len(decorator.args) > 1:
+        return None, 'unsupported arguments of first_kwonly_arg()'
+    name_node = name_nodes[0]
+    if imports.library_name(name_node) == 'FIRST_DEFAULT_ARG':
+        return 'FIRST_DEFAULT_ARG', None
+    if isinstance(name_node, ast.Constant) and isinstance(name_node.value, str):
+        return name_node.value, None
+    return None, 'the name of the first keyword-only arg is not a string literal'
+
+
+def find_first_kwonly_index(node, decorator_index, first_kwonly):
+    """ Returns ``(index, problem_message)``: the index of the first keyword-only arg among the positional args
+    (including the positional-only ones) of the decorated function ``node``. The index is ``None`` if the function
+    can't be converted to native syntax. """
+    if decorator_index != len(node.decorator_list) - 1:
+        return None, 'the decorator is not the innermost one'
+
+    arguments = node.args
+    posonlyargs = getattr(arguments, 'posonlyargs', [])
+    all_positional = posonlyargs + arguments.args
+    first_default_index = len(all_positional) - len(arguments.defaults)
+    if not arguments.defaults:
+        return None, "the function doesn't have default arguments"
+
+    if first_kwonly == 'FIRST_DEFAULT_ARG':
+        index = first_default_index
+    else:
+        names = [arg.arg for arg in all_positional]
+        if first_kwonly not in names:
+            return None, "the function doesn't have an argument named %r" % first_kwonly
+        index = names.index(first_kwonly)
+        if index < first_default_index:
+            return None, 'the selected first keyword-only arg %r has no default value' % first_kwonly
+    if index < len(posonlyargs):
+        return None, "positional-only args can't be turned into keyword-only args"
+    return index, None
+
+
+def _convert_function(node, decorator_index, first_kwonly, source, imports):
+    """ Returns a list of ``(start, end, replacement)`` edits or a problem message. """
+    first_kwonly_index, problem = find_first_kwonly_index(node, decorator_index, first_kwonly)
+    if problem is not None:
+        return problem
+
+    arguments = node.args
+    all_positional = getattr(arguments, 'posonlyargs', []) + arguments.args
+    defaults = arguments.defaults
+    first_default_index = len(all_positional) - len(defaults)
+    text = source.text
+    edits = []
+
+    # The decorator: the whole line(s) must belong to it.
+    decorator = node.decorator_list[decorator_index]
+    line_start = source.line_offsets[decorator.lineno - 1]
+    at = text.rfind('@', line_start, source.start(decorator))
+    line_end = source.line_offsets[decorator.end_lineno] if decorator.end_lineno < len(source.line_offsets) \
+        else len(text)
+    # A trailing comment is removed together with the decorator.
+    rest_of_line = text[source.end(decorator):line_end].partition('#')[0]
+    if at < 0 or text[line_start:at].strip() or rest_of_line.strip() not in ('', '\\'):
+        return 'the decorator shares its line with other code'
+    edits.append((line_start, line_end, ''))
+
+    # The KWONLY_REQUIRED defaults of the new keyword-only args are removed.
+    for index in range(first_kwonly_index, len(all_positional)):
+        default = defaults[index - first_default_index]
+        if imports.library_name(default) == 'KWONLY_REQUIRED':
+            edits.append((source.end(all_positional[index]), source.end(default), ''))
+
+    # The star element (``*args`` or a bare ``*``) is moved in front of the new keyword-only args.
+    last_positional_end = source.end(defaults[-1])
+    star = None
+    if arguments.vararg is not None or arguments.kwonlyargs:
+        star = _skip_to(text, last_positional_end, '*')
+        if star is None:
+            return 'unable to locate the * in the signature'
+    if arguments.vararg is not None:
+        star_end = source.end(arguments.vararg)
+    elif star is not None:
+        star_end = star + 1
+    if star is not None:
+        star_text = text[star:star_end]
+        if '#' in text[last_positional_end:star]:
+            edits.append(_star_removal(text, star, star_end))
+        else:
+            edits.append((last_positional_end, star_end, ''))
+    else:
+        star_text = '*'
+    edits.append((source.start(all_positional[first_kwonly_index]),) * 2 + (star_text + ', ',))
+    return edits
+
+
+def _star_removal(text, star, star_end):
+    """ Returns the edit that removes only the star element and its trailing comma: the comments between the last
+    default value and the star element are kept. The line of the star element is removed if nothing else is left on
+    it. """
+    end = star_end
+    while text[end:end + 1] in (' ', '\t'):
+        end += 1
+    if text[end:end + 1] == ',':
+        end += 1
+        while text[end:end + 1] in (' ', '\t'):
+            end += 1
+    line_start = text.rfind('\n', 0, star) + 1
+    if not text[line_start:star].strip() and text.startswith(('\n', '\r\n'), end):
+        return line_start, text.index('\n', end) + 1, ''
+    return star, end, ''
+
+
+def _apply_edits(text, edits):
+    for start, end, replacement in sorted(edits, key=lambda edit: (edit[0], edit[1]), reverse=True):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+
+def _remove_unused_imports(text):
+    """ Removes the library items from the imports of the module that aren't referenced anymore. """
+    tree = ast.parse(text)
+    used_names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            used_names.add(node.id)
+
+    source = _Source(text)
+    edits = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module == 'kwonly_args' and not node.level:
+            kept = [alias for alias in node.names
+                    if alias.name not in LIBRARY_NAMES or (alias.asname or alias.name) in used_names]
+            if len(kept) == len(node.names):
+                continue
+            replacement = 'from kwonly_args import ' + ', '.join(
+                alias.name + (' as ' + alias.asname if alias.asname else '') for alias in kept) if kept else 'pass'
+        elif isinstance(node, ast.Import) and [a for a in node.names if a.name == 'kwonly_args']:
+            kept = [alias for alias in node.names
+                    if alias.name != 'kwonly_args' or (alias.asname or alias.name) in used_names]
+            if len(kept) == len(node.names):
+                continue
+            replacement = 'import ' + ', '.join(
+                alias.name + (' as ' + alias.asname if alias.asname else '') for alias in kept) if kept else 'pass'
+        else:
+            continue
+        start, end = source.start(node), source.end(node)
+        if replacement == 'pass':
+            line_start = source.line_offsets[node.lineno - 1]
+            line_end = source.line_offsets[node.end_lineno] if node.end_lineno < len(source.line_offsets) \
+                else len(text)
+            # A module level import on its own line(s) is removed, elsewhere it is replaced with ``pass``.
+            if node.col_offset == 0 and not text[end:line_end].strip() and not text[line_start:start].strip():
+                start, end, replacement = line_start, line_end, ''
+        edits.append((start, end, replacement))
+    return _apply_edits(text, edits)
+
+
+def migrate_source(text):
+    """ Returns ``(new_text, problems)``. Raises ``SyntaxError`` if the source can't be parsed. """
+    tree = ast.parse(text)
+    imports = Imports(tree)
+    if not imports.names and not imports.modules:
+        return text, []
+
+    source = _Source(text)
+    edits = []
+    problems = []
+    converted_decorators = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for index, decorator in enumerate(node.decorator_list):
+            first_kwonly, problem = decorator_info(decorator, imports)
+            if first_kwonly is not None:
+                result = _convert_function(node, index, first_kwonly, source, imports)
+                if isinstance(result, list):
+                    edits.extend(result)
+                    converted_decorators.add(id(decorator))
+                    continue
+                problem = result
+            if problem is not None:
+                problems.append(Problem(decorator.lineno, '%s(): %s' % (node.name, problem)))
+                converted_decorators.add(id(decorator))
+
+    # The decorators used without the @ syntax.
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and id(node) not in converted_decorators and \
+                imports.library_name(node.func) in DECORATOR_NAMES:
+            problems.append(Problem(node.lineno, '%s() is not used as a function decorator' % (
+                                    imports.library_name(node.func),)))
+        elif isinstance(node, (ast.Name, ast.Attribute)) and id(node) not in converted_decorators and \
+                imports.library_name(node) == 'kwonly_defaults':
+            problems.append(Problem(node.lineno, 'kwonly_defaults is not used as a function decorator'))
+
+    if not edits:
+        return text, sorted(problems, key=lambda problem: problem.lineno)
+    new_text = _remove_unused_imports(_apply_edits(text, edits))
+    return new_text, sorted(problems, key=lambda problem: problem.lineno)
+
+
+def iter_python_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+                for filename in sorted(filenames):
+                    if filename.endswith('.py'):
+                        yield os.path.join(dirpath, filename)
+        else:
+            yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m kwonly_args.migrate', description=__doc__.split('\n\n')[0])
+    parser.add_argument('paths', nargs='+', metavar='PATH', help='Python files or directories.')
+    parser.add_argument('-w', '--write', action='store_true', help='Modify the files instead of printing a diff.')
+    args = parser.parse_args(argv)
+
+    if sys.version_info < (3, 8):
+        parser.error('python3.8+ is required')
+
+    num_converted_files = 0
+    num_problems = 0
+    for path in iter_python_files(args.paths):
+        with io.open(path, encoding='utf-8') as f:
+            text = f.read()
+        try:
+            new_text, problems = migrate_source(text)
+        except SyntaxError as e:
+            sys.stderr.write('%s:%s: unable to parse: %s\n' % (path, e.lineno, e.msg))
+            num_problems += 1
+            continue
+        for problem in problems:
+            sys.stderr.write('%s:%s: %s\n' % (path, problem.lineno, problem.message))
+        num_problems += len(problems)
+        if new_text == text:
+            continue
+        num_converted_files += 1
+        if args.write:
+            with io.open(path, 'w', encoding='utf-8') as f:
+                f.write(new_text)
+        else:
+            sys.stdout.writelines(difflib.unified_diff(text.splitlines(True), new_text.splitlines(True), path, path))
+
+    sys.stderr.write('%s file(s) %s, %s site(s) could not be converted\n' % (
+                     num_converted_files, 'converted' if args.write else 'to convert', num_problems))
+    return 1 if num_problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+""" Turns the selected default arguments into real keyword-only arguments under python3.
+
+In the code object of a python3 function the argument names are stored in ``co_varnames`` in the following order:
+positional args, keyword-only args, varargs, varkwargs. The default arguments we turn into keyword-only args are
+the last positional args so they are immediately followed by the native keyword-only args (if any). This means
+that moving them into the keyword-only section doesn't require reordering ``co_varnames``: decreasing
+``co_argcount`` and increasing ``co_kwonlyargcount`` by the same number is enough. The bytecode refers to the
+arguments by their (unchanged) index so it remains valid.
+
+The resulting function doesn't have a wrapper so calling it doesn't have any overhead.
+"""
+
+import sys
+import types
+
+
+def is_supported():
+    return sys.version_info >= (3, 3) and sys.implementation.name == 'cpython'
+
+
+def _replace_arg_counts(code, argcount, kwonlyargcount):
+    if hasattr(code, 'replace'):
+        # python3.8+
+        return code.replace(co_argcount=argcount, co_kwonlyargcount=kwonlyargcount)
+    return types.CodeType(
+        argcount, kwonlyargcount, code.co_nlocals, code.co_stacksize, code.co_flags, code.co_code,
+        code.co_consts, code.co_names, code.co_varnames, code.co_filename, code.co_name, code.co_firstlineno,
+        code.co_lnotab, code.co_freevars, code.co_cellvars,
+    )
+
+
+def build_function(wrapped, spec):
+    """ Returns a new function that has real keyword-only arguments instead of the selected default arguments
+    of ``wrapped``. Returns ``None`` if this isn't possible (python2, PyPy, builtins, unusual signatures, etc...).
+    In the latter case the caller should fall back to a wrapper. """
+    if not is_supported() or type(wrapped) is not types.FunctionType:
+        return None
+
+    code = wrapped.__code__
+    # The signature returned by inspect may come from a __signature__ attribute instead of the code object.
+    if spec.arg_names != code.co_varnames[:code.co_argcount] or spec.defaults != wrapped.__defaults__:
+        return None
+    # Positional-only args can't be turned into keyword-only args.
+    if getattr(code, 'co_posonlyargcount', 0) > spec.first_kwonly_index:
+        return None
+
+    num_new_kwonly_args = code.co_argcount - spec.first_kwonly_index
+    new_code = _replace_arg_counts(code, spec.first_kwonly_index, code.co_kwonlyargcount + num_new_kwonly_args)
+
+    positional_defaults = spec.defaults[:len(spec.defaults) - num_new_kwonly_args] or None
+    kwdefaults = dict((arg, default) for arg, default in spec.kwonly_args if arg not in spec.required_kwonly_args)
+    kwdefaults.update(wrapped.__kwdefaults__ or {})
+
+    func = types.FunctionType(new_code, wrapped.__globals__, wrapped.__name__, positional_defaults,
+                              wrapped.__closure__)
+    func.__kwdefaults__ = kwdefaults or None
+    for attr_name in ('__module__', '__qualname__', '__doc__', '__annotations__', '__type_params__'):
+        if hasattr(wrapped, attr_name):
+            setattr(func, attr_name, getattr(wrapped, attr_name))
+    func.__dict__.update(wrapped.__dict__)
+    return func
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+""" Partial application of decorated functions.
+
+``functools.partial(decorated, *args, **kwargs)`` stacks two argument merging layers: every call merges the bound
+args into the call args and then the wrapper rearranges them and checks the required keyword-only args again even if
+the partial has already bound them. ``kwonly_partial()`` resolves the bound args against the spec of the decorated
+function once and returns a single function that calls the undecorated function directly. Its generated source
+contains only the work left for the call: the bound values are closure variables and only the required keyword-only
+args that haven't been bound are checked.
+"""
+
+from kwonly_args.codegen import factory_cache_footprint, is_identifier, num_positional_only_args, reserved_prefix
+from kwonly_args.codegen import set_function_name
+from kwonly_args.errors import missing_kwonly_args_error
+from kwonly_args.introspection import function_kind, mark_coroutine_function
+from kwonly_args.profiling import rename_wrapper
+from kwonly_args.spec import get_wrapper_decoration
+
+
+# The generated sources define a factory that creates the partial function. The factories are cached by their source
+# because the same function is typically bound many times with different values: {source: factory}
+# The source doesn't contain the name of the function so the functions with the same signature layout share them.
+_factory_cache = {}
+
+
+def _missing_error_factory(spec, func_name, bound_kwargs):
+    def missing_error(kwargs):
+        provided = set(bound_kwargs)
+        provided.update(kwargs)
+        return missing_kwonly_args_error(func_name, spec.required_kwonly_args.difference(provided))
+    return missing_error
+
+
+def build_partial(wrapped, spec, bound_args, bound_kwargs, validate=True):
+    """ Returns a generated function that behaves like ``functools.partial(decorated, *bound_args, **bound_kwargs)``
+    or ``None`` if the bound args can't be resolved at generation time (e.g.: they spill into the varargs or they
+    bind a positional arg by keyword). In the latter case the caller should fall back to ``generic_partial()``. """
+    arg_names = spec.arg_names
+    first_kwonly_index = spec.first_kwonly_index
+    kwonly_arg_names = arg_names[first_kwonly_index:]
+    if len(bound_args) > first_kwonly_index or [arg for arg in bound_kwargs if arg not in kwonly_arg_names]:
+        return None
+    for arg in arg_names:
+        if not is_identifier(arg):
+            return None
+    num_positional_only = num_positional_only_args(wrapped)
+    if num_positional_only > first_kwonly_index:
+        return None
+
+    func_name = getattr(wrapped, '__name__', '?')
+    prefix = reserved_prefix(arg_names)
+    wrapped_ref = prefix + 'wrapped'
+    spec_ref = prefix + 'spec'
+    name_ref = prefix + 'name'
+    missing_ref = prefix + 'missing'
+    varargs_ref = prefix + 'args'
+    kwargs_ref = prefix + 'kwargs'
+    factory_params = [wrapped_ref, spec_ref, name_ref, missing_ref]
+    factory_args = [wrapped, spec, func_name, _missing_error_factory(spec, func_name, bound_kwargs)]
+
+    def value_ref(kind, arg_index, value):
+        ref = '%s%s_%s' % (prefix, kind, arg_index)
+        factory_params.append(ref)
+        factory_args.append(value)
+        return ref
+
+    def default_ref(arg_index):
+        return value_ref('default', arg_index, spec.defaults[arg_index - spec.first_default_index])
+
+    # The positional args of the call of wrapped: the bound values followed by the params of the partial.
+    call_args = [value_ref('bound', index, value) for index, value in enumerate(bound_args)]
+    params = []
+    for index in range(len(bound_args), first_kwonly_index):
+        arg = arg_names[index]
+        params.append(arg if index < spec.first_default_index else '%s=%s' % (arg, default_ref(index)))
+        call_args.append(arg)
+    if num_positional_only > len(bound_args):
+        params.insert(num_positional_only - len(bound_args), '/')
+    params.append('*' + varargs_ref)
+    params.append('**' + kwargs_ref)
+    # [(kwonly_arg, bound_value_ref)] in declaration order
+    bound_kwonly_args = [(arg, value_ref('bound', first_kwonly_index + index, bound_kwargs[arg]))
+                         for index, arg in enumerate(kwonly_arg_names) if arg in bound_kwargs]
+
+    lines = ['    def partial(%s):' % ', '.join(params)]
+
+    unbound_required = [arg for arg in spec.required_kwonly_arg_names if arg not in bound_kwargs]
+    if validate and unbound_required:
+        lines.append('        if %s:' % ' or '.join('%r not in %s' % (arg, kwargs_ref) for arg in unbound_required))
+        lines.append('            raise %s(%s)' % (missing_ref, kwargs_ref))
+
+    if spec.varargs is None:
+        if validate:
+            lines.append('        if %s:' % varargs_ref)
+            lines.append('            raise %s.too_many_args_error(%s, %s + len(%s))' % (
+                         spec_ref, name_ref, first_kwonly_index, varargs_ref))
+    else:
+        # Spilled positional args: the keyword-only args are passed positionally like in the generated wrappers.
+        bound_refs = dict(bound_kwonly_args)
+        lines.append('        if %s:' % varargs_ref)
+        for index, arg in enumerate(kwonly_arg_names):
+            fallback_ref = bound_refs.get(arg) or default_ref(first_kwonly_index + index)
+            lines.append('            %s = %s.pop(%r, %s)' % (arg, kwargs_ref, arg, fallback_ref))
+        lines.append('            return %s(%s)' % (wrapped_ref, ', '.join(
+                     call_args + list(kwonly_arg_names) + ['*' + varargs_ref, '**' + kwargs_ref])))
+
+    if bound_kwonly_args:
+        # The keyword args of the call override the bound ones like in the case of functools.partial.
+        lines.append('        if %s:' % kwargs_ref)
+        popped_args = ['%s=%s.pop(%r, %s)' % (arg, kwargs_ref, arg, ref) for arg, ref in bound_kwonly_args]
+        lines.append('            return %s(%s)' % (wrapped_ref, ', '.join(
+                     call_args + popped_args + ['**' + kwargs_ref])))
+        lines.append('        return %s(%s)' % (wrapped_ref, ', '.join(
+                     call_args + ['%s=%s' % (arg, ref) for arg, ref in bound_kwonly_args])))
+    else:
+        lines.append('        return %s(%s)' % (wrapped_ref, ', '.join(call_args + ['**' + kwargs_ref])))
+    lines.append('    return partial')
+    lines.insert(0, 'def factory(%s):' % ', '.join(factory_params))
+
+    source = '\n'.join(lines) + '\n'
+    factory = _factory_cache.get(source)
+    if factory is None:
+        namespace = {}
+        exec(compile(source, '<kwonly_args partial>', 'exec'), namespace)
+        factory = namespace['factory']
+        _factory_cache[source] = factory
+    partial = factory(*factory_args)
+    set_function_name(partial, func_name)
+    return partial
+
+
+def generic_partial(wrapped, spec, bound_args, bound_kwargs, validate=True):
+    """ The partial function for the bound args that can't be resolved by ``build_partial()``. It merges the args
+    like ``functools.partial`` but it still calls the undecorated function directly. """
+    func_name = getattr(wrapped, '__name__', '?')
+    unbound_required = ()
+    if validate:
+        unbound_required = tuple(arg for arg in spec.required_kwonly_arg_names if arg not in bound_kwargs)
+    missing_error = _missing_error_factory(spec, func_name, bound_kwargs)
+    first_kwonly_index = spec.first_kwonly_index
+
+    def partial(*args, **kwargs):
+        for arg in unbound_required:
+            if arg not in kwargs:
+                raise missing_error(kwargs)
+        if bound_kwargs:
+            merged = bound_kwargs.copy()
+            merged.update(kwargs)
+            kwargs = merged
+        args = bound_args + args
+        if len(args) > first_kwonly_index:
+            if spec.varargs is None:
+                if validate:
+                    raise spec.too_many_args_error(func_name, len(args))
+            else:
+                kwonly_args_from_kwargs = tuple(kwargs.pop(arg, default) for arg, default in spec.kwonly_args)
+                args = args[:first_kwonly_index] + kwonly_args_from_kwargs + args[first_kwonly_index:]
+        return wrapped(*args, **kwargs)
+    return partial
+
+
+def kwonly_partial(func, *args, **kwargs):
+    """ Returns a function that behaves like ``functools.partial(func, *args, **kwargs)`` but if ``func`` has been
+    decorated with ``first_kwonly_arg()`` then it calls the undecorated function directly and its calls don't check
+    the required keyword-only args bound here:
+
+        >>> @first_kwonly_arg('config')
+        >>> def handle(plugin, event, config=KWONLY_REQUIRED, verbose=False):
+        >>>     ...
+        >>>
+        >>> handler = kwonly_partial(handle, plugin, config=plugin_config)
+        >>> handler(event)
+        >>> handler(event, verbose=True)
+
+    The keyword args of the calls override the bound ones. Like the ``'codegen'`` wrappers, the returned function may
+    report a different error than ``functools.partial`` if a call contains more than one error. The returned function
+    has the ``func``, ``args`` and ``keywords`` attributes of ``functools.partial`` objects.
+
+    Functions without a wrapper (``mode='native'``, undecorated functions), other callables and functions decorated
+    with ``validation='debug'`` or with instrumentation are bound with ``functools.partial``.
+    """
+    decoration = get_wrapper_decoration(func)
+    if decoration is not None:
+        _, validation, instrumentation = decoration.settings
+    if decoration is None or validation == 'debug' or instrumentation != 'off':
+        import functools
+        return functools.partial(func, *args, **kwargs)
+
+    wrapped = decoration.wrapped
+    spec = decoration.spec
+    validate = validation != 'trusted'
+    partial = build_partial(wrapped, spec, args, kwargs, validate)
+    if partial is None:
+        partial = generic_partial(wrapped, spec, args, kwargs, validate)
+    if function_kind(wrapped) == 'coroutine':
+        mark_coroutine_function(partial)
+    partial.func = func
+    partial.args = args
+    partial.keywords = kwargs
+    return rename_wrapper(partial, wrapped, 'partial')
+
+
+def memory_footprint():
+    """ Returns ``(num_factories, num_bytes)``: the number of cached partial function factories and their
+    approximate memory usage. """
+    return factory_cache_footprint(_factory_cache)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+""" Pickling the decorated functions by reference. Python3.8+.
+
+Python functions are pickled by reference: pickle stores their module and qualified name and checks that the
+lookup of this name returns the pickled function. The check fails when the name refers to another function, e.g.:
+
+    fast_handler = first_kwonly_arg('verbose', mode='codegen')(handler)
+
+``fast_handler`` has the name of ``handler``, so pickling it fails. Function objects can't customize their
+pickling with ``__reduce__``. This module provides a pickler hook (``reducer_override()``) that pickles the wrappers
+created by ``first_kwonly_arg`` as ``(module, qualname, first_kwonly_arg_name, decoration_settings)``. The
+unpickling process looks up the name. If it finds a function decorated the same way it uses it as is, otherwise it
+decorates the function with the same settings. The result is cached so loading the same function many times (e.g.:
+with every task sent to a process pool) costs only a dict lookup.
+
+    import kwonly_args.pickling
+    kwonly_args.pickling.install()   # for multiprocessing and concurrent.futures.ProcessPoolExecutor
+
+    data = kwonly_args.pickling.dumps(functools.partial(fast_handler, verbose=True))
+
+Functions decorated with ``mode='native'`` don't have a wrapper so they are pickled by reference as usual, like
+the nested functions (with ``<locals>`` in their qualified name) that can't be looked up by name.
+"""
+
+import io
+import pickle
+import sys
+import threading
+import types
+
+from kwonly_args.spec import get_decoration, get_wrapper_decoration
+
+
+# {(module, qualname, first_kwonly_arg_name, settings): decorated_function}
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def _resolve(module_name, qualname):
+    __import__(module_name)
+    obj = sys.modules[module_name]
+    for attr_name in qualname.split('.'):
+        obj = getattr(obj, attr_name)
+    # e.g.: the decorated function of a classmethod
+    return getattr(obj, '__func__', obj)
+
+
+def load_function(module_name, qualname, name, settings):
+    """ Returns the function decorated with ``first_kwonly_arg(name, *settings)`` that can be found by the given
+    module and qualified name. Used by the unpickling of the decorated functions. """
+    key = (module_name, qualname, name, settings)
+    func = _loaded.get(key)
+    if func is not None:
+        return func
+
+    func = _resolve(module_name, qualname)
+    decoration = get_decoration(func)
+    if decoration is None or (decoration.name, decoration.settings) != (name, settings):
+        if decoration is not None:
+            func = decoration.wrapped
+        from kwonly_args import first_kwonly_arg
+        mode, validation, instrumentation = settings
+        func = first_kwonly_arg(name, mode=mode, lazy=False, validation=validation,
+                                instrumentation=instrumentation)(func)
+
+    _loaded_lock.acquire()
+    try:
+        return _loaded.setdefault(key, func)
+    finally:
+        _loaded_lock.release()
+
+
+def memory_footprint():
+    """ Returns ``(num_functions, num_bytes)``: the number of functions loaded by ``load_function()`` and the memory
+    used by their cache. The functions themselves aren't included because they are owned by their modules. """
+    entries = list(_loaded.items())
+    return len(entries), sys.getsizeof(_loaded) + sum(sys.getsizeof(key) for key, _ in entries)
+
+
+def reduce_function(func):
+    """ Returns the ``(load_function, args)`` reduce value of a wrapper created by ``first_kwonly_arg`` or
+    ``NotImplemented`` if ``func`` isn't such a wrapper or it can't be looked up by name. """
+    decoration = get_wrapper_decoration(func)
+    if decoration is None:
+        return NotImplemented
+    wrapped = decoration.wrapped
+    module_name = getattr(wrapped, '__module__', None)
+    qualname = getattr(wrapped, '__qualname__', None)
+    if not module_name or not qualname or '<locals>' in qualname or module_name == '__main__':
+        # Lookups in __main__ would be done in the __main__ of the unpickling process.
+        return NotImplemented
+    return load_function, (module_name, qualname, decoration.name, decoration.settings)
+
+
+def reducer_override(self, obj):
+    """ ``pickle.Pickler.reducer_override()`` that pickles the decorated functions with ``reduce_function()``. """
+    if type(obj) is not types.FunctionType:
+        return NotImplemented
+    return reduce_function(obj)
+
+
+class KwonlyPickler(pickle.Pickler):
+    """ A pickler that pickles the decorated functions with ``reduce_function()``. """
+    reducer_override = reducer_override
+
+
+def dumps(obj, protocol=None):
+    f = io.BytesIO()
+    KwonlyPickler(f, protocol).dump(obj)
+    return f.getvalue()
+
+
+def install():
+    """ Makes ``multiprocessing`` (and ``concurrent.futures.ProcessPoolExecutor``) pickle the decorated functions
+    with ``reduce_function()``. Every object pickled by ``multiprocessing`` goes through an extra python function
+    call so don't install it if you send large numbers of small objects. """
+    if sys.version_info < (3, 8):
+        raise RuntimeError('kwonly_args.pickling requires python3.8+')
+    from multiprocessing.reduction import ForkingPickler
+    ForkingPickler.reducer_override = reducer_override
+
+
+def uninstall():
+    from multiprocessing.reduction import ForkingPickler
+    if ForkingPickler.__dict__.get('reducer_override') is reducer_override:
+        del ForkingPickler.reducer_override
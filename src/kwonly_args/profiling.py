@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+""" Makes the wrappers readable in the output of profilers.
+
+Without help every wrapper created by the library would show up in profiles as the same ``wrapper`` function of
+``kwonly_args/__init__.py``. Profilers identify functions by the ``co_filename``, ``co_firstlineno`` and ``co_name``
+(``co_qualname`` since python3.11) of their code objects so the wrappers get a copy of their code object with the
+location of the wrapped function and with the name of the wrapped function tagged with the kind of the wrapper:
+``handler [kwonly_args]``. The tag keeps the wrapper and the wrapped function apart: profilers that identify
+functions by their location and name (e.g.: ``pstats``) would merge them otherwise. The line table of the copy maps
+every instruction to the ``def`` line of the wrapped function so tracebacks don't point into its body.
+
+The renaming is opt-in: every ``def`` statement of a decorated function needs its own copy of the code objects of
+the wrappers and creating them would make the decoration a few times slower. Enable it with
+``kwonly_args.configure(profiling=True)`` or with the ``KWONLY_ARGS_PROFILING=1`` environment variable before
+importing the decorated functions. It works only under CPython 3.10+: older versions use ``co_name`` in the messages
+of argument binding errors (e.g.: ``handler [kwonly_args]() missing 1 required positional argument``), their line
+tables have a different format and other implementations have their own line table formats. The copies are shared by
+the wrappers of the functions created by the same ``def`` statement.
+
+``fold_wrapper_frames()`` removes the wrappers from ``pstats`` data by attributing their time to the wrapped
+functions.
+"""
+
+import platform
+import sys
+import weakref
+
+
+WRAPPER_TAG = 'kwonly_args'
+
+# The environment variable that enables the renaming of the wrappers for the whole process.
+PROFILING_ENV_VAR = 'KWONLY_ARGS_PROFILING'
+
+_supported = sys.version_info >= (3, 10) and platform.python_implementation() == 'CPython'
+
+# Modify it only with ``set_enabled()``.
+_config = {'enabled': False}
+
+# The renamed code objects are shared by the wrappers of the functions created by the same ``def`` statement:
+# {(id(template_code), kind, filename, firstlineno, name, qualname): code}
+# The template code objects belong to the wrapper implementations that are never freed so their ids are stable.
+_code_cache = weakref.WeakValueDictionary()
+
+
+def wrapper_name(name, kind=None):
+    """ Returns the name that identifies a wrapper of the function with the given ``name`` in profiles. """
+    return '%s [%s]' % (name, WRAPPER_TAG + ' ' + kind if kind else WRAPPER_TAG)
+
+
+def wrapped_name(name):
+    """ Returns the name of the wrapped function if ``name`` has been returned by ``wrapper_name()``, otherwise
+    ``None``. """
+    index = name.rfind(' [' + WRAPPER_TAG)
+    if index >= 0 and name.endswith(']'):
+        tag = name[index + 2:-1]
+        if tag == WRAPPER_TAG or tag.startswith(WRAPPER_TAG + ' '):
+            return name[:index]
+    return None
+
+
+def is_supported():
+    return _supported
+
+
+def set_enabled(enabled):
+    """ Enables or disables the renaming of the wrappers created after the call. Used by
+    ``kwonly_args.configure(profiling=...)``. """
+    _config['enabled'] = bool(enabled)
+
+
+def is_enabled():
+    return _config['enabled']
+
+
+def _single_line_table(code):
+    """ Returns a ``co_linetable`` for ``code`` that maps all of its instructions to ``co_firstlineno``. """
+    table = []
+    if sys.version_info >= (3, 11):
+        # Entries of at most 8 code units: PY_CODE_LOCATION_INFO_NO_COLUMNS (13) followed by a zero line delta.
+        num_units = len(code.co_code) // 2
+        while num_units > 0:
+            length = min(num_units, 8)
+            table += [0x80 | (13 << 3) | (length - 1), 0]
+            num_units -= length
+    else:
+        # python3.10: (bytecode_delta, line_delta) pairs
+        num_bytes = len(code.co_code)
+        while num_bytes > 0:
+            length = min(num_bytes, 254)
+            table += [length, 0]
+            num_bytes -= length
+    return bytes(table)
+
+
+def rename_wrapper(wrapper, wrapped, kind=None):
+    """ Replaces the code object of ``wrapper`` with a copy that has the location and the tagged name of ``wrapped``.
+    Does nothing if the renaming isn't enabled or supported (see the docstring of the module) or if ``wrapped`` isn't
+    a python function. """
+    if not _config['enabled'] or not _supported:
+        return wrapper
+    code = getattr(wrapped, '__code__', None)
+    if code is None:
+        return wrapper
+
+    template = wrapper.__code__
+    qualname = getattr(code, 'co_qualname', None)
+    key = (id(template), kind, code.co_filename, code.co_firstlineno, code.co_name, qualname)
+    renamed = _code_cache.get(key)
+    if renamed is None:
+        replacements = dict(co_filename=code.co_filename, co_firstlineno=code.co_firstlineno,
+                            co_name=wrapper_name(code.co_name, kind), co_linetable=_single_line_table(template))
+        if qualname is not None:
+            replacements['co_qualname'] = wrapper_name(qualname, kind)
+        renamed = template.replace(**replacements)
+        _code_cache[key] = renamed
+    wrapper.__code__ = renamed
+    return wrapper
+
+
+def memory_footprint():
+    """ Returns ``(num_code_objects, num_bytes)``: the number of live renamed code objects and their approximate
+    memory usage. Every function created by a different ``def`` statement has its own renamed code objects. """
+    codes = list(_code_cache.values())
+    return len(codes), sum(sys.getsizeof(code) + sys.getsizeof(code.co_linetable) for code in codes)
+
+
+def _add(stats_a, stats_b):
+    """ Adds two ``(cc, nc, tt, ct)`` tuples. Older python versions store only ``nc`` for the callers. """
+    if isinstance(stats_a, tuple):
+        return tuple(a + b for a, b in zip(stats_a, stats_b))
+    return stats_a + stats_b
+
+
+def _merge_callers(callers, caller, caller_stats):
+    if caller in callers:
+        callers[caller] = _add(callers[caller], caller_stats)
+    else:
+        callers[caller] = caller_stats
+
+
+def fold_wrapper_frames(stats):
+    """ Folds the wrapper frames into the wrapped functions in a ``pstats.Stats`` object (in place): the own time of
+    the wrappers is attributed to the wrapped functions and the callers of the wrappers become the callers of the
+    wrapped functions. Returns ``stats``.
+
+        >>> import cProfile, pstats
+        >>> from kwonly_args.profiling import fold_wrapper_frames
+        >>> profile = cProfile.Profile()
+        >>> profile.runcall(main)
+        >>> fold_wrapper_frames(pstats.Stats(profile)).sort_stats('cumulative').print_stats(20)
+    """
+    # {wrapper_label: wrapped_label}
+    targets = {}
+    for label in stats.stats:
+        filename, lineno, name = label
+        name = wrapped_name(name)
+        if name is not None:
+            targets[label] = (filename, lineno, name)
+
+    def resolve(label):
+        # A wrapper may wrap another wrapper (e.g.: instrumentation around validation).
+        while label in targets:
+            label = targets[label]
+        return label
+
+    for wrapper_label in targets:
+        target_label = resolve(wrapper_label)
+        cc, nc, tt, ct, callers = stats.stats.pop(wrapper_label)
+        if target_label not in stats.stats:
+            # The wrapped function hasn't been called (e.g.: the wrapper raised an error).
+            stats.stats[target_label] = (cc, nc, tt, ct, {})
+        else:
+            t_cc, t_nc, t_tt, t_ct, t_callers = stats.stats[target_label]
+            stats.stats[target_label] = (t_cc, t_nc, t_tt + tt, t_ct + tt, t_callers)
+        target_callers = stats.stats[target_label][4]
+        for caller, caller_stats in callers.items():
+            caller = resolve(caller)
+            if caller != target_label:
+                _merge_callers(target_callers, caller, caller_stats)
+
+    # The wrappers that have been called by other functions.
+    for label, (cc, nc, tt, ct, callers) in list(stats.stats.items()):
+        if [caller for caller in callers if caller in targets]:
+            new_callers = {}
+            for caller, caller_stats in callers.items():
+                caller = resolve(caller)
+                if caller != label:
+                    _merge_callers(new_callers, caller, caller_stats)
+            stats.stats[label] = (cc, nc, tt, ct, new_callers)
+
+    stats.total_calls = sum(nc for cc, nc, tt, ct, callers in stats.stats.values())
+    stats.prim_calls = sum(cc for cc, nc, tt, ct, callers in stats.stats.values())
+    stats.all_callees = None
+    stats.fcn_list = 0
+    return stats
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+""" Generated ``__init__`` methods for configuration and value object classes.
+
+A hand-written ``__init__`` that only assigns its arguments to attributes, decorated with ``@kwonly_defaults``,
+pays for the wrapper on every construction and the instances pay for their ``__dict__``. ``kwonly_init()``
+generates the ``__init__`` from a field list (like ``dataclasses`` but without annotations so it works under
+python2 too), gives it keyword-only args with ``first_kwonly_arg()`` (native keyword-only args under python3, a
+generated wrapper under python2) and optionally replaces the ``__dict__`` of the instances with ``__slots__``.
+"""
+
+from kwonly_args.codegen import factory_cache_footprint, is_identifier, reserved_prefix
+from kwonly_args.native import is_supported as is_native_supported
+from kwonly_args.spec import KWONLY_REQUIRED, FIRST_DEFAULT_ARG
+
+
+# The generated sources define a factory that creates the ``__init__`` method. The factories are cached by their
+# source because the same field list is typically used by many classes: {source: factory}
+_factory_cache = {}
+
+
+def parse_fields(fields):
+    """ Returns the ``(names, defaults)`` of the fields of ``kwonly_init()``. """
+    names = []
+    defaults = []
+    for field in fields:
+        if isinstance(field, tuple):
+            name, default = field
+            defaults.append(default)
+        else:
+            name = field
+            if defaults:
+                raise ValueError("The field %r without a default value follows a field with a default value" % (
+                                 name,))
+        if not is_identifier(name):
+            raise ValueError("Invalid field name: %r" % (name,))
+        if name in names:
+            raise ValueError("Duplicate field name: %r" % (name,))
+        names.append(name)
+    return names, defaults
+
+
+def build_init(cls, names, defaults):
+    """ Returns an ``__init__`` function that assigns its arguments to the attributes of the same name. """
+    prefix = reserved_prefix(names)
+    self_ref = 'self' if 'self' not in names else prefix + 'self'
+    first_default_index = len(names) - len(defaults)
+    default_refs = ['%sdefault_%s' % (prefix, index) for index in range(len(defaults))]
+    params = [self_ref] + names[:first_default_index]
+    params += ['%s=%s' % (name, ref) for name, ref in zip(names[first_default_index:], default_refs)]
+
+    lines = ['def factory(%s):' % ', '.join(default_refs), '    def __init__(%s):' % ', '.join(params)]
+    lines += ['        %s.%s = %s' % (self_ref, name, name) for name in names] or ['        pass']
+    lines.append('    return __init__')
+    source = '\n'.join(lines) + '\n'
+
+    factory = _factory_cache.get(source)
+    if factory is None:
+        namespace = {}
+        exec(compile(source, '<kwonly_args __init__ of %s>' % cls.__name__, 'exec'), namespace)
+        factory = namespace['factory']
+        _factory_cache[source] = factory
+
+    init = factory(*defaults)
+    init.__module__ = cls.__module__
+    if hasattr(cls, '__qualname__'):
+        init.__qualname__ = cls.__qualname__ + '.__init__'
+    return init
+
+
+def memory_footprint():
+    """ Returns ``(num_factories, num_bytes)``: the number of cached ``__init__`` factories and their approximate
+    memory usage. """
+    return factory_cache_footprint(_factory_cache)
+
+
+def add_slots(cls, names):
+    """ Returns a copy of ``cls`` that has ``__slots__`` instead of ``__dict__``. """
+    if not isinstance(cls, type):
+        raise TypeError("slots=True requires a new-style class")
+    namespace = dict(cls.__dict__)
+    for name in names:
+        if name in namespace:
+            raise ValueError("The field %r conflicts with the class attribute of the same name" % (name,))
+    namespace['__slots__'] = tuple(names)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    if hasattr(cls, '__qualname__'):
+        namespace['__qualname__'] = cls.__qualname__
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def kwonly_init(fields, first_kwonly=FIRST_DEFAULT_ARG, slots=False, mode=None):
+    """ A class decorator that generates the ``__init__`` method of the class:
+
+        >>> @kwonly_init(['host', ('port', 80), ('timeout', KWONLY_REQUIRED), ('debug', False)], 'timeout',
+        >>>              slots=True)
+        >>> class Config(object):
+        >>>     pass
+        >>>
+        >>> # same as:
+        >>> class Config(object):
+        >>>     __slots__ = ('host', 'port', 'timeout', 'debug')
+        >>>
+        >>>     @first_kwonly_arg('timeout')
+        >>>     def __init__(self, host, port=80, timeout=KWONLY_REQUIRED, debug=False):
+        >>>         self.host = host
+        >>>         self.port = port
+        >>>         self.timeout = timeout
+        >>>         self.debug = debug
+
+    The generated ``__init__`` doesn't call the ``__init__`` of the base classes.
+
+    :param fields: A sequence of field names (required args) and ``(field_name, default_value)`` tuples. The
+    ``KWONLY_REQUIRED`` default value makes a keyword-only field required. The fields without a default value
+    must come first.
+    :param first_kwonly: The name of the first keyword-only field. By default all fields with a default value are
+    keyword-only. Pass ``None`` if you don't want keyword-only fields.
+    :param slots: ``True`` returns a copy of the class with ``__slots__`` that contains the fields. The instances
+    don't have a ``__dict__``. Methods that use the argument-less ``super()`` of python3 would refer to the original
+    class so use the explicit ``super(Class, self)`` form in these classes.
+    :param mode: The ``mode`` of ``first_kwonly_arg()``. By default it is ``'native'`` where native keyword-only
+    args are supported and ``'codegen'`` otherwise.
+    """
+    names, defaults = parse_fields(fields)
+    first_default_index = len(names) - len(defaults)
+    if first_kwonly is FIRST_DEFAULT_ARG:
+        first_kwonly_index = first_default_index
+    elif first_kwonly is None:
+        first_kwonly_index = len(names)
+    elif first_kwonly in names:
+        first_kwonly_index = names.index(first_kwonly)
+    else:
+        raise ValueError("There is no field with the specified first_kwonly=%r name" % (first_kwonly,))
+    for name, default in zip(names[first_default_index:first_kwonly_index], defaults):
+        if default is KWONLY_REQUIRED:
+            raise ValueError("KWONLY_REQUIRED is the default value of %r that isn't a keyword-only field" % (name,))
+
+    def decorate(cls):
+        init = build_init(cls, names, defaults)
+        if first_kwonly is not None and defaults:
+            from kwonly_args import first_kwonly_arg
+            init_mode = mode or ('native' if is_native_supported() else 'codegen')
+            init = first_kwonly_arg(first_kwonly, mode=init_mode, lazy=False)(init)
+        if slots:
+            cls = add_slots(cls, names)
+        cls.__init__ = init
+        return cls
+    return decorate
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+""" The ``__signature__`` of the decorated functions.
+
+Without a ``__signature__`` attribute ``inspect.signature()`` would follow the ``__wrapped__`` attribute of the
+wrapper and it would return the positional signature of the wrapped function. Building an ``inspect.Signature``
+object for every decorated function would make the decoration several times slower so the signature is built only
+when it is requested for the first time and it is cached:
+
+- python3.12+: ``inspect.signature()`` calls a callable ``__signature__`` so the wrappers get a
+  ``SignatureFactory``. ``inspect.signature()`` returns a real ``inspect.Signature`` and the decoration doesn't
+  import ``inspect``.
+- python3.5-3.11: ``inspect.signature()`` accepts only ``inspect.Signature`` instances so the wrappers get a
+  ``LazySignature``: a subclass of ``inspect.Signature`` that builds its parameters when they are first used. The
+  first decoration imports ``inspect``.
+- python2 and python3.4 and older: ``inspect.signature(follow_wrapped=False)`` isn't available so the wrappers don't
+  get a ``__signature__``.
+"""
+
+import sys
+
+from kwonly_args.spec import KWONLY_REQUIRED, get_spec
+
+
+# python3.12+ calls a callable __signature__ attribute to get the signature.
+CALLABLE_SIGNATURE_SUPPORTED = sys.version_info >= (3, 12)
+
+# Created by _lazy_signature_class() because it requires importing inspect: [LazySignature]
+_lazy_signature_class = []
+
+
+def build_signature(wrapped, name):
+    """ Returns the ``inspect.Signature`` of ``wrapped`` decorated with ``first_kwonly_arg(name)``: the selected args
+    are ``KEYWORD_ONLY`` and the ``KWONLY_REQUIRED`` ones don't have a default value. """
+    import inspect
+
+    spec = get_spec(wrapped, name)
+    signature = inspect.signature(wrapped, follow_wrapped=False)
+    new_kwonly_names = set(arg for arg, _ in spec.kwonly_args)
+    positional = []
+    var_positional = []
+    kwonly = []
+    var_keyword = []
+    for parameter in signature.parameters.values():
+        if parameter.name in new_kwonly_names:
+            if parameter.default is KWONLY_REQUIRED:
+                parameter = parameter.replace(kind=inspect.Parameter.KEYWORD_ONLY, default=inspect.Parameter.empty)
+            else:
+                parameter = parameter.replace(kind=inspect.Parameter.KEYWORD_ONLY)
+            kwonly.append(parameter)
+        elif parameter.kind == inspect.Parameter.VAR_POSITIONAL:
+            var_positional.append(parameter)
+        elif parameter.kind == inspect.Parameter.KEYWORD_ONLY:
+            kwonly.append(parameter)
+        elif parameter.kind == inspect.Parameter.VAR_KEYWORD:
+            var_keyword.append(parameter)
+        else:
+            positional.append(parameter)
+    return signature.replace(parameters=positional + var_positional + kwonly + var_keyword)
+
+
+class SignatureFactory(object):
+    """ The ``__signature__`` of the wrappers under python3.12+. ``inspect.signature()`` calls it: it builds the
+    ``inspect.Signature`` at the first call and returns the same object at the subsequent calls. """
+    __slots__ = ('wrapped', 'name', '_signature')
+
+    def __init__(self, wrapped, name):
+        self.wrapped = wrapped
+        self.name = name
+        self._signature = None
+
+    def __call__(self):
+        if self._signature is None:
+            self._signature = build_signature(self.wrapped, self.name)
+        return self._signature
+
+
+def _create_lazy_signature_class():
+    import inspect
+
+    class LazySignature(inspect.Signature):
+        """ The ``__signature__`` of the wrappers under python3.5-3.11: an ``inspect.Signature`` whose parameters and
+        return annotation are built when they are used for the first time. """
+        __slots__ = ('_wrapped', '_name')
+
+        def __init__(self, wrapped, name):
+            # The slots of inspect.Signature are filled by _build().
+            self._wrapped = wrapped
+            self._name = name
+
+        def _build(self):
+            if self._wrapped is not None:
+                signature = build_signature(self._wrapped, self._name)
+                self._parameters = signature.parameters
+                self._return_annotation = signature.return_annotation
+                self._wrapped = None
+
+        @property
+        def parameters(self):
+            self._build()
+            return self._parameters
+
+        @property
+        def return_annotation(self):
+            self._build()
+            return self._return_annotation
+
+        def _to_signature(self):
+            return inspect.Signature(list(self.parameters.values()), return_annotation=self.return_annotation,
+                                     __validate_parameters__=False)
+
+        def replace(self, *args, **kwargs):
+            # inspect.Signature.replace() would call the constructor of the subclass
+            return self._to_signature().replace(*args, **kwargs)
+
+        def __reduce__(self):
+            return self._to_signature().__reduce__()
+
+    return LazySignature
+
+
+def lazy_signature(wrapped, name):
+    """ Returns the ``__signature__`` of the wrappers of ``wrapped`` decorated with ``first_kwonly_arg(name)`` or
+    ``None`` if it isn't supported (see the docstring of the module). """
+    if CALLABLE_SIGNATURE_SUPPORTED:
+        return SignatureFactory(wrapped, name)
+    if sys.version_info < (3, 5):
+        return None
+    if not _lazy_signature_class:
+        _lazy_signature_class.append(_create_lazy_signature_class())
+    return _lazy_signature_class[0](wrapped, name)
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+""" The analysed signature of the decorated functions.
+
+The result of the analysis is an immutable ``KwonlySpec`` object that is shared by all decorated functions with
+the same argument names, the same default argument values (identity) and the same selected first keyword-only arg.
+This is typical when the same ``def`` statement is executed several times (e.g.: decorated functions created by
+a factory function).
+
+Only the specs of the functions defined inside other functions (``CO_NESTED``) are cached. The ``def`` statements of
+modules and module-level classes are executed only once so the cache lookup would only slow down their decoration
+(it would cost about half as much as the analysis of the signature). The other users of the spec of a decorated
+function get it from its ``Decoration``.
+"""
+
+import sys
+import types
+import weakref
+
+from kwonly_args.errors import missing_kwonly_args_error, too_many_args_error
+from kwonly_args.introspection import CO_NESTED, CO_VARARGS, get_argspec
+
+
+KWONLY_REQUIRED = ('KWONLY_REQUIRED',)
+FIRST_DEFAULT_ARG = ('FIRST_DEFAULT_ARG',)
+
+_PY2 = sys.version_info[0] == 2
+
+_no_required_kwonly_args = frozenset()
+
+# {(first_kwonly_arg_name, num_args, varargs_name, arg_name0, arg_name1, ..., id(default0), id(default1), ...):
+#  weakref.ref(spec)}
+# The ids are stable because the spec keeps a reference to the default values. The default values aren't used
+# directly as keys because they may be unhashable and their equality may be expensive or surprising (1 == True).
+# A plain dict with weak references is used instead of a WeakValueDictionary because its lookups and insertions
+# (implemented in python) would cost more than half of the analysis of a signature.
+_spec_cache = {}
+
+
+class KwonlySpec(object):
+    """ The layout of the signature of a decorated function. Don't modify its attributes. """
+    __slots__ = ('arg_names', 'varargs', 'defaults', 'first_kwonly_index', 'kwonly_args', 'required_kwonly_args',
+                 'required_kwonly_arg_names', '__weakref__')
+
+    def __init__(self, arg_names, varargs, defaults, first_kwonly_index):
+        self.arg_names = tuple(arg_names)
+        self.varargs = varargs
+        self.defaults = tuple(defaults)
+        self.first_kwonly_index = first_kwonly_index
+        kwonly_defaults = self.defaults[-(len(self.arg_names)-first_kwonly_index):]
+        self.kwonly_args = tuple(zip(self.arg_names[first_kwonly_index:], kwonly_defaults))
+        # The wrappers validate the required args by iterating over this tuple (in declaration order): unlike the
+        # set operations this doesn't allocate anything when the validation succeeds.
+        self.required_kwonly_arg_names = tuple(arg for arg, default in self.kwonly_args if default is KWONLY_REQUIRED)
+        self.required_kwonly_args = frozenset(self.required_kwonly_arg_names) or _no_required_kwonly_args
+
+    @property
+    def first_default_index(self):
+        return len(self.arg_names) - len(self.defaults)
+
+    def missing_kwonly_args_error(self, func_name, kwargs):
+        """ Called only when the validation of the required args has already failed so the cost of the message
+        formatting is paid only by the failing calls. """
+        return missing_kwonly_args_error(func_name, self.required_kwonly_args.difference(kwargs))
+
+    def too_many_args_error(self, func_name, num_args):
+        return too_many_args_error(func_name, self.first_kwonly_index, num_args)
+
+    def sizeof(self):
+        """ Returns the number of bytes used by this spec. Doesn't include the argument names and the default values
+        because those are owned by the decorated function. """
+        size = sys.getsizeof(self) + sys.getsizeof(self.arg_names) + sys.getsizeof(self.defaults)
+        size += sys.getsizeof(self.kwonly_args) + sum(sys.getsizeof(item) for item in self.kwonly_args)
+        size += sys.getsizeof(self.required_kwonly_arg_names)
+        if self.required_kwonly_args is not _no_required_kwonly_args:
+            size += sys.getsizeof(self.required_kwonly_args)
+        return size
+
+
+# The attribute of the functions returned by ``first_kwonly_arg()`` that stores their ``Decoration``.
+DECORATION_ATTR = '_kwonly_decoration'
+
+
+class Decoration(object):
+    """ Records how a function has been created by ``first_kwonly_arg()``. Every function returned by the decorator
+    has one in its ``_kwonly_decoration`` attribute: the wrappers, the functions created by ``mode='native'`` and
+    the functions returned unchanged (e.g.: by ``validation='trusted'``). Don't modify its attributes.
+
+    :param wrapped: The decorated function.
+    :param name: The ``name`` parameter of the decorator.
+    :param settings: The ``(mode, validation, instrumentation)`` of the decoration.
+    :param decorated: The function returned by the decorator. Referenced weakly because it references the
+    decoration.
+    """
+    __slots__ = ('wrapped', 'name', 'settings', '_decorated_ref', '_spec')
+
+    def __init__(self, wrapped, name, settings, decorated):
+        self.wrapped = wrapped
+        self.name = name
+        self.settings = settings
+        self._decorated_ref = weakref.ref(decorated)
+        self._spec = None
+
+    @property
+    def decorated(self):
+        return self._decorated_ref()
+
+    @property
+    def spec(self):
+        """ The ``KwonlySpec`` of ``wrapped``. Created when it is first used (e.g.: never in case of the lazily
+        decorated functions that haven't been called). """
+        if self._spec is None:
+            self._spec = get_spec(self.wrapped, self.name)
+        return self._spec
+
+
+def is_decorated(func):
+    """ Returns ``True`` if ``func`` has been returned by ``first_kwonly_arg()``. """
+    return DECORATION_ATTR in getattr(func, '__dict__', ())
+
+
+def get_decoration(func):
+    """ Returns the ``Decoration`` of ``func`` if it has been returned by ``first_kwonly_arg()``, otherwise ``None``.
+    The wrappers of other decorators may have a copy of the marker (and under python2 a copy of ``__wrapped__``)
+    because ``update_wrapper()`` copies the ``__dict__`` of the function they wrap. """
+    if type(func) is not types.FunctionType:
+        return None
+    decoration = func.__dict__.get(DECORATION_ATTR)
+    if decoration is None or decoration.decorated is not func:
+        return None
+    return decoration
+
+
+def get_wrapper_decoration(func):
+    """ Returns the ``Decoration`` of ``func`` if it is a wrapper created by ``first_kwonly_arg()`` around the
+    ``wrapped`` function of the decoration, otherwise ``None``. """
+    decoration = get_decoration(func)
+    if decoration is None or func is decoration.wrapped:
+        return None
+    # The functions created by mode='native' aren't wrappers.
+    if func.__dict__.get('__wrapped__') is not decoration.wrapped:
+        return None
+    return decoration
+
+
+def _create_spec(func, name):
+    arg_names, varargs, _, defaults = get_argspec(func)
+
+    if not defaults:
+        raise TypeError("You can't use @first_kwonly_arg on a function that doesn't have default arguments!")
+    first_default_index = len(arg_names) - len(defaults)
+
+    if name is FIRST_DEFAULT_ARG:
+        first_kwonly_index = first_default_index
+    else:
+        try:
+            first_kwonly_index = list(arg_names).index(name)
+        except ValueError:
+            raise ValueError("%s() doesn't have an argument with the specified first_kwonly_arg=%r name" % (
+                             getattr(func, '__name__', '?'), name))
+
+    if first_kwonly_index < first_default_index:
+        raise ValueError("The specified first_kwonly_arg=%r must have a default value!" % (name,))
+
+    return KwonlySpec(arg_names, varargs, defaults, first_kwonly_index)
+
+
+def _cache_key(func, name):
+    """ Returns the key of the spec of ``func`` in ``_spec_cache`` or ``None`` if its spec can't be cached. The key
+    is built directly from the code object: ``get_argspec()`` would be much slower than the rest of the lookup. """
+    code = func.__code__
+    num_args = code.co_argcount
+    arg_names = code.co_varnames[:num_args]
+    if _PY2 and [arg for arg in arg_names if arg.startswith('.')]:
+        # python2 tuple parameters
+        return None
+    varargs = None
+    if code.co_flags & CO_VARARGS:
+        varargs = code.co_varnames[num_args + getattr(code, 'co_kwonlyargcount', 0)]
+    return (name, num_args, varargs) + arg_names + tuple(map(id, func.__defaults__ or ()))
+
+
+def get_spec(func, name):
+    """ Returns the ``KwonlySpec`` of ``func`` (shared if ``func`` has been defined inside a function). Raises the
+    decoration errors of ``first_kwonly_arg`` if the function can't be decorated with the given ``name``. """
+    if type(func) is not types.FunctionType or getattr(func, '__signature__', None) is not None:
+        return _create_spec(func, name)
+    if not func.__code__.co_flags & CO_NESTED:
+        return _create_spec(func, name)
+
+    key = _cache_key(func, name)
+    if key is None:
+        return _create_spec(func, name)
+    spec_ref = _spec_cache.get(key)
+    spec = None if spec_ref is None else spec_ref()
+    if spec is None:
+        spec = _create_spec(func, name)
+        _spec_cache[key] = weakref.ref(spec, lambda spec_ref: _remove_spec(key, spec_ref))
+    return spec
+
+
+def _remove_spec(key, spec_ref):
+    # The key may have been taken by a newer spec. Other threads may replace the entry between the lookup and the
+    # deletion: in that case the newer spec is only removed from the cache, it isn't shared by the future decorations.
+    if _spec_cache.get(key) is spec_ref:
+        _spec_cache.pop(key, None)
+
+
+def memory_footprint():
+    """ Returns ``(num_specs, num_bytes)``: the number of live specs and the memory used by them. """
+    specs = [spec_ref() for spec_ref in list(_spec_cache.values())]
+    specs = [spec for spec in specs if spec is not None]
+    return len(specs), sum(spec.sizeof() for spec in specs)
@@ -0,0 +1,73 @@
+from unittest import TestCase, skipIf
+
+try:
+    import tracemalloc
+except ImportError:
+    # python2
+    tracemalloc = None
+
+from kwonly_args import first_kwonly_arg, KWONLY_REQUIRED
+from kwonly_args.native import is_supported as native_is_supported
+
+
+def func(a0, d0='d0', d1=KWONLY_REQUIRED, d2=KWONLY_REQUIRED, **kwargs):
+    return a0
+
+
+def func_with_varargs(a0, d0='d0', d1=KWONLY_REQUIRED, d2=KWONLY_REQUIRED, *args):
+    return a0
+
+
+# The same signature layouts without required args. The wrappers of these functions do the same work as the
+# wrappers of the above functions except for the validation of the required args.
+def func_without_required(a0, d0='d0', d1=None, d2=None, **kwargs):
+    return a0
+
+
+def func_with_varargs_without_required(a0, d0='d0', d1=None, d2=None, *args):
+    return a0
+
+
+def peak_memory_of_calls(callable_, num_calls=100):
+    """ Returns ``(peak, current)``: the peak of the traced memory during the calls and the traced memory left
+    behind by them. """
+    # Warming up: the interpreter may allocate some internal caches during the first calls.
+    for _ in range(num_calls):
+        callable_(0, d1=1, d2=2)
+    tracemalloc.start()
+    try:
+        tracemalloc.clear_traces()
+        for _ in range(num_calls):
+            callable_(0, d1=1, d2=2)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, current
+
+
+@skipIf(tracemalloc is None, 'tracemalloc is not available')
+class TestValidationDoesntAllocate(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The first tracing session has some one-time allocations.
+        peak_memory_of_calls(func)
+
+    def _test_mode(self, mode, wrapped, wrapped_without_required):
+        baseline = peak_memory_of_calls(first_kwonly_arg('d1', mode=mode)(wrapped_without_required))
+        self.assertEqual(peak_memory_of_calls(first_kwonly_arg('d1', mode=mode)(wrapped)), baseline)
+
+    def test_generic(self):
+        self._test_mode('generic', func, func_without_required)
+
+    def test_generic_with_varargs(self):
+        self._test_mode('generic', func_with_varargs, func_with_varargs_without_required)
+
+    def test_codegen(self):
+        self._test_mode('codegen', func, func_without_required)
+
+    def test_codegen_with_varargs(self):
+        self._test_mode('codegen', func_with_varargs, func_with_varargs_without_required)
+
+    @skipIf(not native_is_supported(), 'native mode is not supported')
+    def test_native(self):
+        self._test_mode('native', func, func_without_required)
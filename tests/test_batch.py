@@ -0,0 +1,107 @@
+import functools
+import sys
+from unittest import TestCase, skipIf
+
+import kwonly_args
+from kwonly_args import first_kwonly_arg, call_many, KWONLY_REQUIRED, MODES, VALIDATIONS
+from kwonly_args import batch, instrumentation
+
+
+def func(a0, d0='d0', d1='d1', d2=KWONLY_REQUIRED, *args, **kwargs):
+    return a0, d0, d1, d2, args, kwargs
+
+
+CALLS = [
+    ((0,), dict(d2=2)),
+    ((0, 1), dict(d2=2, x=3)),
+    ((0, 1, 2, 3), dict(d2=2)),
+    ((0, 1, 2), dict(d1=1, d2=2, x=3)),
+    ((0,), dict(d2=2)),
+    ((0, 1, 2, 3), dict(d2=4)),
+]
+
+
+def call_one_by_one(decorated, calls):
+    return [decorated(*args, **kwargs) for args, kwargs in calls]
+
+
+def collect_errors(iterable):
+    results = []
+    iterator = iter(iterable)
+    while True:
+        try:
+            results.append(next(iterator))
+        except StopIteration:
+            return results
+        except TypeError as e:
+            results.append(str(e))
+            return results
+
+
+class TestCallMany(TestCase):
+    def test_same_results_as_the_decorated_function(self):
+        for mode in MODES:
+            for validation in VALIDATIONS:
+                decorated = first_kwonly_arg('d1', mode=mode, validation=validation)(func)
+                self.assertEqual(list(call_many(decorated, CALLS)), call_one_by_one(decorated, CALLS),
+                                 (mode, validation))
+
+    def test_wrapper_is_bypassed(self):
+        direct_code = batch._call_directly(None).__code__
+        for mode in ('generic', 'codegen'):
+            decorated = first_kwonly_arg('d1', mode=mode)(func)
+            self.assertIsNot(batch.batch_caller(decorated).__code__, direct_code, mode)
+        # the wrapper of another decorator has a copy of the decoration marker of the function it wraps
+        outer = functools.wraps(decorated)(lambda *args, **kwargs: 'outer')
+        self.assertIs(batch.batch_caller(outer).__code__, direct_code)
+        self.assertEqual(list(call_many(outer, CALLS)), ['outer'] * len(CALLS))
+
+    def test_lazy_decoration(self):
+        decorated = first_kwonly_arg('d1', lazy=True)(func)
+        self.assertEqual(list(call_many(decorated, CALLS)), call_one_by_one(decorated, CALLS))
+
+    def test_arguments_are_not_modified(self):
+        decorated = first_kwonly_arg('d1')(func)
+        calls = [((0, 1, 2), dict(d1=1, d2=2))]
+        list(call_many(decorated, calls))
+        self.assertEqual(calls, [((0, 1, 2), dict(d1=1, d2=2))])
+
+    def test_errors(self):
+        def strict(a0, d0='d0', d1=KWONLY_REQUIRED):
+            return a0, d0, d1
+        for mode in ('generic', 'codegen'):
+            decorated = first_kwonly_arg('d0', mode=mode)(strict)
+            for calls in ([((0,), dict(d1=1)), ((0,), {})], [((0, 1), dict(d1=1))]):
+                expected = collect_errors(decorated(*args, **kwargs) for args, kwargs in calls)
+                self.assertEqual(collect_errors(call_many(decorated, calls)), expected, mode)
+                self.assertIsInstance(expected[-1], str)
+
+    def test_instrumented_functions_are_called_normally(self):
+        decorated = first_kwonly_arg('d1', instrumentation='counts')(func)
+        stats = instrumentation.get_function_stats(instrumentation.qualified_name(func))
+        num_calls = stats.calls
+        list(call_many(decorated, CALLS))
+        self.assertEqual(stats.calls, num_calls + len(CALLS))
+
+    def test_bound_methods(self):
+        class MyClass(object):
+            @first_kwonly_arg('d0')
+            def method(self, a0, d0='d0', *args):
+                return self, a0, d0, args
+        obj = MyClass()
+        self.assertEqual(list(call_many(obj.method, [((0, 1), dict(d0=2))])), [(obj, 0, 2, (1,))])
+
+    def test_builtin_map_isnt_shadowed(self):
+        self.assertFalse(hasattr(kwonly_args, 'map'))
+
+    @skipIf(sys.version_info < (3, 2), 'concurrent.futures requires python3.2+')
+    def test_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        decorated = first_kwonly_arg('d1')(func)
+        calls = CALLS * 10
+        executor = ThreadPoolExecutor(2)
+        try:
+            results = list(call_many(decorated, calls, executor=executor, chunksize=4, max_pending=2))
+        finally:
+            executor.shutdown()
+        self.assertEqual(results, call_one_by_one(decorated, calls))
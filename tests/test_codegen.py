@@ -0,0 +1,202 @@
+import re
+import sys
+from unittest import TestCase, skipIf
+
+from kwonly_args import first_kwonly_arg, KWONLY_REQUIRED, FIRST_DEFAULT_ARG, configure
+from kwonly_args import codegen
+from kwonly_args.codegen import build_wrapper, reserved_prefix
+from kwonly_args.spec import KwonlySpec
+
+
+def func_defaults_only(d0='d0', d1='d1', d2='d2'):
+    return dict(d0=d0, d1=d1, d2=d2)
+
+
+def func_args_and_defaults(a0, a1, d0='d0', d1='d1', d2='d2'):
+    return dict(a0=a0, a1=a1, d0=d0, d1=d1, d2=d2)
+
+
+def func_args_and_defaults_and_varargs(a0, a1, d0='d0', d1='d1', d2='d2', *args):
+    return dict(a0=a0, a1=a1, d0=d0, d1=d1, d2=d2, args=args)
+
+
+def func_required(a0, d0='d0', d1=KWONLY_REQUIRED, d2=KWONLY_REQUIRED, *args, **kwargs):
+    return dict(a0=a0, d0=d0, d1=d1, d2=d2, args=args, kwargs=kwargs)
+
+
+CALLS = [
+    ((), {}),
+    ((0,), {}),
+    ((0, 1), {}),
+    ((0, 1, 2), {}),
+    ((0, 1, 2, 3), {}),
+    ((0, 1, 2, 3, 4, 5), {}),
+    ((0,), {'a1': 1}),
+    ((0, 1), {'d1': 'my_d1'}),
+    ((0, 1, 2), {'d1': 'my_d1', 'd2': 'my_d2'}),
+    ((0, 1, 2, 3), {'d2': 'my_d2'}),
+    ((0, 1, 2, 3, 4), {'d1': 'my_d1', 'd2': 'my_d2', 'x': 'x'}),
+    ((0, 1), {'a0': 0}),
+    ((), {'a0': 0, 'a1': 1, 'd0': 2, 'd1': 3, 'd2': 4}),
+    ((0, 1), {'d2': 2, 'unexpected': 5}),
+]
+
+
+def call(func, args, kwargs):
+    try:
+        return 'result', func(*args, **kwargs)
+    except TypeError as e:
+        return 'error', str(e)
+
+
+class TestCodegenBehavesLikeGeneric(TestCase):
+    # The generated wrapper may report a different error than the generic one if a call contains more than one
+    # error so the calls used by these tests contain at most one error.
+    def check_same_behavior(self, func, first_kwonly, calls=CALLS):
+        generic = first_kwonly_arg(first_kwonly, mode='generic')(func)
+        generated = first_kwonly_arg(first_kwonly, mode='codegen')(func)
+        self.assertIsNot(generic.__code__, generated.__code__)
+        for args, kwargs in calls:
+            self.assertEqual(call(generic, args, dict(kwargs)), call(generated, args, dict(kwargs)),
+                             'args=%r kwargs=%r' % (args, kwargs))
+
+    def test_defaults_only(self):
+        self.check_same_behavior(func_defaults_only, 'd1')
+
+    def test_args_and_defaults(self):
+        self.check_same_behavior(func_args_and_defaults, 'd1')
+
+    def test_args_and_defaults_and_varargs(self):
+        self.check_same_behavior(func_args_and_defaults_and_varargs, 'd1')
+
+    def test_first_default_arg(self):
+        self.check_same_behavior(func_args_and_defaults_and_varargs, FIRST_DEFAULT_ARG)
+
+    def test_required(self):
+        self.check_same_behavior(func_required, 'd1', [
+            ((0,), {}),
+            ((0, 1, 2), {'d1': 'my_d1'}),
+            ((0, 1, 2), {'d1': 'my_d1', 'd2': 'my_d2', 'x': 'x'}),
+            ((0,), {'d1': 'my_d1', 'd2': 'my_d2'}),
+            ((), {'a0': 0, 'd2': 'my_d2', 'd1': 'my_d1'}),
+        ])
+
+    @skipIf(sys.version_info < (3, 8), 'positional-only args require python3.8+')
+    def test_positional_only_args(self):
+        namespace = {}
+        exec('def func(a0, a1, /, d0="d0", d1="d1", *args, **kwargs):\n'
+             '    return dict(a0=a0, a1=a1, d0=d0, d1=d1, args=args, kwargs=kwargs)', namespace)
+        calls = CALLS + [((0, 1), {'a1': 'kw'}), ((0,), {'a1': 'kw'})]
+        self.check_same_behavior(namespace['func'], 'd1', calls)
+        self.check_same_behavior(namespace['func'], 'd0', calls)
+
+    def test_kwargs_of_the_caller_arent_modified(self):
+        decorated = first_kwonly_arg('d1', mode='codegen')(func_args_and_defaults_and_varargs)
+        kwargs = dict(d1='my_d1')
+        self.assertEqual(decorated(0, 1, 2, 3, **kwargs)['d1'], 'my_d1')
+        self.assertEqual(kwargs, dict(d1='my_d1'))
+
+
+class TestCodegenErrors(TestCase):
+    def test_missing_required_kwargs(self):
+        @first_kwonly_arg('a', mode='codegen')
+        def func(a=KWONLY_REQUIRED, b=KWONLY_REQUIRED):
+            pass
+
+        self.assertRaisesRegexp(TypeError, re.escape("func() missing 2 keyword-only argument(s): a, b"), func)
+        self.assertRaisesRegexp(TypeError, re.escape("func() missing 1 keyword-only argument(s): b"), func, a=0)
+        self.assertRaisesRegexp(TypeError, re.escape("func() missing 1 keyword-only argument(s): a"), func, b=0)
+
+    def test_too_many_positional_args(self):
+        @first_kwonly_arg('d1', mode='codegen')
+        def func(d0='d0', d1='d1'):
+            pass
+
+        self.assertRaisesRegexp(TypeError, re.escape("func() takes exactly 1 arguments (3 given)"), func, 0, 1, 2)
+
+    def test_invalid_mode(self):
+        self.assertRaisesRegexp(ValueError, re.escape("Invalid mode='fast'"), first_kwonly_arg, 'd1', mode='fast')
+        self.assertRaisesRegexp(ValueError, re.escape("Invalid mode='fast'"), configure, mode='fast')
+
+
+class TestCodegenDetails(TestCase):
+    def test_arg_names_colliding_with_internal_names(self):
+        @first_kwonly_arg('_kwonly_kwargs', mode='codegen')
+        def func(_kwonly_wrapped, _kwonly_args=0, _kwonly_kwargs=1, *args):
+            return _kwonly_wrapped, _kwonly_args, _kwonly_kwargs, args
+
+        self.assertEqual(func(0, 1, 2, _kwonly_kwargs=3), (0, 1, 3, (2,)))
+
+    def test_functions_with_different_names_share_the_factory(self):
+        def create(name):
+            namespace = {}
+            exec('def %s(a0, wrapper=0, d1=1):\n    return a0, wrapper, d1' % name, namespace)
+            return first_kwonly_arg('d1', mode='codegen')(namespace[name])
+
+        create('first')
+        num_factories = len(codegen._factory_cache)
+        second = create('second')
+        self.assertEqual(len(codegen._factory_cache), num_factories)
+        self.assertEqual(second.__name__, 'second')
+        self.assertEqual(second(0, 1, d1=2), (0, 1, 2))
+        with self.assertRaises(TypeError) as context:
+            second()
+        self.assertTrue(str(context.exception).startswith('second() '), context.exception)
+
+    def test_reserved_prefix(self):
+        self.assertEqual(reserved_prefix(['a', 'b']), '_kwonly_')
+        self.assertEqual(reserved_prefix(['a', '_kwonly_a']), '__kwonly_')
+
+    def test_unsupported_arg_names_fall_back(self):
+        self.assertIsNone(build_wrapper(func_defaults_only, KwonlySpec([('d0', 'd1')], None, ('d0',), 0)))
+
+    def test_attributes_are_copied(self):
+        decorated = first_kwonly_arg('d1', mode='codegen')(func_args_and_defaults)
+        self.assertEqual(decorated.__name__, 'func_args_and_defaults')
+        self.assertIs(decorated.__wrapped__, func_args_and_defaults)
+
+    def test_configure_sets_the_default_mode(self):
+        configure(mode='codegen')
+        try:
+            decorated = first_kwonly_arg('d1')(func_args_and_defaults)
+        finally:
+            configure(mode='generic')
+        self.assertIn('_kwonly_wrapped', decorated.__code__.co_freevars)
+        self.assertEqual(decorated(0, 1, 2, d2=4), dict(a0=0, a1=1, d0=2, d1='d1', d2=4))
+
+
+class MyClass(object):
+    @first_kwonly_arg('d1', mode='codegen')
+    def my_instance_method(self, a0, a1, d0='d0', d1='d1', d2='d2', *args):
+        return self, a0, a1, d0, d1, d2, args
+
+    @classmethod
+    @first_kwonly_arg('d1', mode='codegen')
+    def my_class_method(cls, a0, a1, d0='d0', d1='d1', d2='d2', *args):
+        return cls, a0, a1, d0, d1, d2, args
+
+    @staticmethod
+    @first_kwonly_arg('d1', mode='codegen')
+    def my_static_method(a0, a1, d0='d0', d1='d1', d2='d2', *args):
+        return a0, a1, d0, d1, d2, args
+
+
+class TestCodegenMethods(TestCase):
+    def test_instance_method(self):
+        instance = MyClass()
+        self.assertEqual(instance.my_instance_method(0, 1, 2, 3, 4, d2='my_d2'),
+                         (instance, 0, 1, 2, 'd1', 'my_d2', (3, 4)))
+
+    def test_class_method(self):
+        self.assertEqual(MyClass().my_class_method(0, 1, 2, 3, 4, d2='my_d2'),
+                         (MyClass, 0, 1, 2, 'd1', 'my_d2', (3, 4)))
+
+    def test_static_method(self):
+        self.assertEqual(MyClass.my_static_method(0, 1, 2, 3, 4, d2='my_d2'), (0, 1, 2, 'd1', 'my_d2', (3, 4)))
+
+    def test_missing_required_arg(self):
+        self.assertRaisesRegexp(
+            TypeError,
+            r"missing 1 required positional argument|takes at least 3 arguments \(2 given\)",
+            MyClass().my_instance_method, 0,
+        )
@@ -0,0 +1,104 @@
+import inspect
+import sys
+from unittest import TestCase, skipIf
+
+from kwonly_args import first_kwonly_arg, MODES, KWONLY_REQUIRED
+from kwonly_args import instrumentation
+from kwonly_args.introspection import function_kind
+
+
+# The async syntax can't be parsed by python2.
+SOURCE = '''
+async def coroutine_func(a0, d0='d0', d1=KWONLY_REQUIRED, *args):
+    return a0, d0, d1, args
+
+def generator_func(a0, d0='d0', d1='d1'):
+    yield a0
+    yield d0
+    yield d1
+
+async def async_generator_func(a0, d0='d0', d1='d1'):
+    yield a0
+    yield d1
+
+async def collect(async_iterable):
+    return [item async for item in async_iterable]
+'''
+
+
+def run(coroutine):
+    import asyncio
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@skipIf(sys.version_info < (3, 6), 'async generators require python3.6+')
+class TestCoroutines(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.namespace = {'KWONLY_REQUIRED': KWONLY_REQUIRED}
+        exec(SOURCE, cls.namespace)
+
+    def _decorate(self, func_name, mode, **kwargs):
+        return first_kwonly_arg('d1', mode=mode, **kwargs)(self.namespace[func_name])
+
+    def test_function_kind(self):
+        self.assertEqual(function_kind(self.namespace['coroutine_func']), 'coroutine')
+        self.assertEqual(function_kind(self.namespace['generator_func']), 'generator')
+        self.assertEqual(function_kind(self.namespace['async_generator_func']), 'async_generator')
+        self.assertIsNone(function_kind(run))
+
+    def test_coroutine_function(self):
+        import asyncio
+        for mode in MODES:
+            decorated = self._decorate('coroutine_func', mode)
+            self.assertTrue(asyncio.iscoroutinefunction(decorated))
+            if mode == 'native' or hasattr(inspect, 'markcoroutinefunction'):
+                self.assertTrue(inspect.iscoroutinefunction(decorated))
+            self.assertEqual(run(decorated(0, 1, 2, d1=3)), (0, 1, 3, (2,)))
+            self.assertRaises(TypeError, decorated, 0)
+
+    def test_wrappers_return_the_coroutine_of_the_wrapped_function(self):
+        for mode in ('generic', 'codegen'):
+            coroutine = self._decorate('coroutine_func', mode)(0, d1=1)
+            try:
+                self.assertIs(coroutine.cr_code, self.namespace['coroutine_func'].__code__)
+            finally:
+                coroutine.close()
+
+    def test_all_wrapper_layers_are_marked(self):
+        import asyncio
+        decorated = self._decorate('coroutine_func', 'generic', lazy=True, validation='debug',
+                                   instrumentation='timing')
+        self.assertTrue(asyncio.iscoroutinefunction(decorated))
+        self.assertEqual(run(decorated(0, d1=1)), (0, 'd0', 1, ()))
+
+    def test_coroutine_calls_arent_timed(self):
+        instrumentation.reset_stats()
+        decorated = self._decorate('coroutine_func', 'generic', instrumentation='timing')
+        run(decorated(0, d1=1))
+        stats = instrumentation.get_function_stats(instrumentation.qualified_name(decorated))
+        self.assertEqual(stats.calls, 1)
+        self.assertEqual(sum(stats.histogram), 0)
+
+    def test_generator_function(self):
+        for mode in MODES:
+            decorated = self._decorate('generator_func', mode)
+            self.assertEqual(inspect.isgeneratorfunction(decorated), mode == 'native')
+            self.assertFalse(asyncio_iscoroutinefunction(decorated))
+            self.assertEqual(list(decorated(0, 1, d1=2)), [0, 1, 2])
+
+    def test_async_generator_function(self):
+        for mode in MODES:
+            decorated = self._decorate('async_generator_func', mode)
+            self.assertEqual(inspect.isasyncgenfunction(decorated), mode == 'native')
+            self.assertFalse(asyncio_iscoroutinefunction(decorated))
+            self.assertEqual(run(self.namespace['collect'](decorated(0, d1=2))), [0, 2])
+
+
+def asyncio_iscoroutinefunction(func):
+    import asyncio
+    return asyncio.iscoroutinefunction(func)
@@ -0,0 +1,119 @@
+import ast
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+from unittest import TestCase, skipIf
+
+import mock
+
+if sys.version_info >= (3, 8):
+    from kwonly_args import import_hook
+
+
+MODULE_SOURCE = '''
+from kwonly_args import first_kwonly_arg, kwonly_defaults, KWONLY_REQUIRED
+
+@first_kwonly_arg('d1')
+def func(a0, d0='d0', d1='d1', d2=KWONLY_REQUIRED, *args):
+    return a0, d0, d1, d2, args
+
+@kwonly_defaults
+def func_defaults(a0, d0='d0'):
+    return a0, d0
+
+NAME = 'd0'
+
+@first_kwonly_arg(NAME)
+def func_dynamic(d0='d0'):
+    return d0
+'''
+
+
+@skipIf(sys.version_info < (3, 8), 'the import hook requires python3.8+')
+class TestTransform(TestCase):
+    def test_transform(self):
+        tree = ast.parse(textwrap.dedent(MODULE_SOURCE))
+        self.assertEqual(import_hook.transform(tree), 2)
+        namespace = {}
+        exec(compile(tree, '<test>', 'exec'), namespace)
+
+        func = namespace['func']
+        self.assertFalse(hasattr(func, '__wrapped__'))
+        self.assertEqual(func.__code__.co_kwonlyargcount, 2)
+        self.assertEqual(func.__kwdefaults__, {'d1': 'd1'})
+        self.assertEqual(func(0, 1, 2, d2=3), (0, 1, 'd1', 3, (2,)))
+        self.assertRaises(TypeError, func, 0)
+
+        self.assertEqual(namespace['func_defaults'].__code__.co_kwonlyargcount, 1)
+        # not converted but still works
+        self.assertTrue(hasattr(namespace['func_dynamic'], '__wrapped__'))
+        self.assertRaises(TypeError, namespace['func_dynamic'], 0)
+
+    def test_line_numbers_are_kept(self):
+        tree = ast.parse(textwrap.dedent(MODULE_SOURCE))
+        import_hook.transform(tree)
+        namespace = {}
+        exec(compile(tree, '<test>', 'exec'), namespace)
+        self.assertEqual(namespace['func'].__code__.co_firstlineno, 5)
+
+
+@skipIf(sys.version_info < (3, 8), 'the import hook requires python3.8+')
+class TestImportHook(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        package_dir = os.path.join(self.directory, 'kwonly_hook_test_pkg')
+        os.mkdir(package_dir)
+        with open(os.path.join(package_dir, '__init__.py'), 'w') as f:
+            f.write('')
+        for module_name in ('module', 'other'):
+            with open(os.path.join(package_dir, module_name + '.py'), 'w') as f:
+                f.write(MODULE_SOURCE)
+        sys.path.insert(0, self.directory)
+        self.finder = import_hook.install(['kwonly_hook_test_pkg.module'])
+
+    def tearDown(self):
+        import_hook.uninstall(self.finder)
+        sys.path.remove(self.directory)
+        for name in list(sys.modules):
+            if name.startswith('kwonly_hook_test_pkg'):
+                del sys.modules[name]
+        shutil.rmtree(self.directory)
+
+    def _import(self, name):
+        sys.modules.pop(name, None)
+        __import__(name)
+        return sys.modules[name]
+
+    def test_only_the_selected_modules_are_transformed(self):
+        module = self._import('kwonly_hook_test_pkg.module')
+        self.assertFalse(hasattr(module.func, '__wrapped__'))
+        self.assertEqual(module.func(0, 1, 2, d2=3), (0, 1, 'd1', 3, (2,)))
+        other = self._import('kwonly_hook_test_pkg.other')
+        self.assertTrue(hasattr(other.func, '__wrapped__'))
+
+    def test_bytecode_is_cached_under_a_distinct_tag(self):
+        with mock.patch.object(sys, 'dont_write_bytecode', False):
+            module = self._import('kwonly_hook_test_pkg.module')
+        self.assertIn('.opt-kwonly', module.__cached__)
+        self.assertTrue(os.path.exists(module.__cached__))
+
+        with mock.patch.object(import_hook.KwonlySourceLoader, 'source_to_code') as source_to_code:
+            module = self._import('kwonly_hook_test_pkg.module')
+        self.assertFalse(source_to_code.called)
+        self.assertFalse(hasattr(module.func, '__wrapped__'))
+        self.assertEqual(module.func_defaults(0, d0=1), (0, 1))
+
+    def test_modified_source_is_transformed_again(self):
+        self._import('kwonly_hook_test_pkg.module')
+        path = os.path.join(self.directory, 'kwonly_hook_test_pkg', 'module.py')
+        with open(path, 'a') as f:
+            f.write('\nADDED = True\n')
+        module = self._import('kwonly_hook_test_pkg.module')
+        self.assertTrue(module.ADDED)
+
+    def test_dont_write_bytecode(self):
+        with mock.patch.object(sys, 'dont_write_bytecode', True):
+            module = self._import('kwonly_hook_test_pkg.module')
+        self.assertFalse(os.path.exists(module.__cached__))
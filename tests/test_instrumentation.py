@@ -0,0 +1,130 @@
+import mock
+from unittest import TestCase, skipIf
+
+from kwonly_args import first_kwonly_arg, configure, KWONLY_REQUIRED, MODES
+from kwonly_args import instrumentation, native
+from kwonly_args.instrumentation import FunctionStats, HISTOGRAM_BOUNDS
+
+
+def func_args_and_defaults_and_varargs(a0, a1, d0='d0', d1='d1', d2=KWONLY_REQUIRED, *args):
+    return dict(a0=a0, a1=a1, d0=d0, d1=d1, d2=d2, args=args)
+
+
+def func_args_and_defaults(a0, d0='d0', d1='d1'):
+    return dict(a0=a0, d0=d0, d1=d1)
+
+
+def stats_of(func):
+    return instrumentation.get_function_stats(instrumentation.qualified_name(func))
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self):
+        instrumentation.reset_stats()
+
+    @skipIf(not native.is_supported(), 'mode=native falls back to a wrapper')
+    def test_off_doesnt_add_a_wrapper_layer(self):
+        decorated = first_kwonly_arg('d1', mode='native')(func_args_and_defaults)
+        self.assertIsNone(getattr(decorated, '__wrapped__', None))
+
+    def test_counts(self):
+        for mode in MODES:
+            instrumentation.reset_stats()
+            decorated = first_kwonly_arg('d1', mode=mode, instrumentation='counts')(
+                func_args_and_defaults_and_varargs)
+            self.assertEqual(decorated.__name__, 'func_args_and_defaults_and_varargs')
+            decorated(0, 1, d2=2)
+            decorated(0, 1, 2, 3, d2=4)
+            self.assertRaises(TypeError, decorated, 0, 1)
+
+            stats = stats_of(func_args_and_defaults_and_varargs)
+            self.assertEqual(stats.calls, 3)
+            self.assertEqual(stats.spilled_calls, 1)
+            self.assertEqual(stats.validation_failures, 1)
+            self.assertEqual(stats.total_time, 0.0)
+            self.assertEqual(sum(stats.histogram), 0)
+
+    def test_too_many_positional_args_is_a_validation_failure(self):
+        decorated = first_kwonly_arg('d1', instrumentation='counts')(func_args_and_defaults)
+        self.assertRaises(TypeError, decorated, 0, 1, 2)
+        stats = stats_of(func_args_and_defaults)
+        self.assertEqual((stats.calls, stats.spilled_calls, stats.validation_failures), (1, 0, 1))
+
+    def test_call_with_several_errors_is_one_validation_failure(self):
+        def required(a0, d0='d0', d1=KWONLY_REQUIRED):
+            pass
+        decorated = first_kwonly_arg('d0', instrumentation='counts')(required)
+        self.assertRaises(TypeError, decorated, 0, 1, 2)
+        stats = stats_of(required)
+        self.assertEqual((stats.calls, stats.spilled_calls, stats.validation_failures), (1, 0, 1))
+
+    def test_timing(self):
+        decorated = first_kwonly_arg('d1', instrumentation='timing')(func_args_and_defaults)
+        decorated(0)
+        decorated(0, d1=1)
+        stats = stats_of(func_args_and_defaults)
+        self.assertEqual(stats.calls, 2)
+        self.assertEqual(sum(stats.histogram), 2)
+        self.assertEqual(len(stats.histogram), len(HISTOGRAM_BOUNDS) + 1)
+        self.assertGreater(stats.total_time, 0.0)
+
+    def test_functions_with_the_same_name_share_stats(self):
+        def create():
+            @first_kwonly_arg('d0', instrumentation='counts')
+            def handler(a0, d0=0):
+                return a0
+            return handler
+
+        create()(0)
+        create()(0)
+        self.assertEqual(stats_of(create()).calls, 2)
+
+    def test_hooks(self):
+        calls = []
+
+        def hook(stats, args, kwargs):
+            calls.append((stats.name, args, kwargs))
+
+        decorated = first_kwonly_arg('d1', instrumentation='counts')(func_args_and_defaults)
+        instrumentation.add_hook(hook)
+        try:
+            decorated(0, d1=1)
+        finally:
+            instrumentation.remove_hook(hook)
+        decorated(0)
+        self.assertEqual(calls, [(instrumentation.qualified_name(func_args_and_defaults), (0,), {'d1': 1})])
+
+    def test_configure(self):
+        configure(instrumentation='counts')
+        try:
+            decorated = first_kwonly_arg('d1')(func_args_and_defaults)
+        finally:
+            configure(instrumentation='off')
+        decorated(0)
+        self.assertEqual(stats_of(func_args_and_defaults).calls, 1)
+
+    def test_lazy(self):
+        decorated = first_kwonly_arg('d1', lazy=True, instrumentation='counts')(func_args_and_defaults)
+        decorated(0)
+        decorated(0)
+        self.assertEqual(stats_of(func_args_and_defaults).calls, 2)
+
+    def test_invalid_instrumentation(self):
+        self.assertRaises(ValueError, first_kwonly_arg, 'd1', instrumentation='all')
+        self.assertRaises(ValueError, configure, instrumentation='all')
+
+    def test_dump_stats(self):
+        decorated = first_kwonly_arg('d1', instrumentation='counts')(func_args_and_defaults)
+        decorated(0)
+        f = mock.Mock()
+        instrumentation.dump_stats(f, limit=1)
+        lines = f.write.call_args[0][0].splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[1].split(), ['1', '0', '0', '0.000000',
+                                            instrumentation.qualified_name(func_args_and_defaults)])
+
+    def test_as_dict(self):
+        stats = FunctionStats('module.func')
+        stats.calls = 3
+        self.assertEqual(stats.as_dict(), dict(name='module.func', calls=3, spilled_calls=0, validation_failures=0,
+                                               total_time=0.0, histogram=[0] * (len(HISTOGRAM_BOUNDS) + 1)))
@@ -0,0 +1,65 @@
+import inspect
+import sys
+from unittest import TestCase, skipIf
+
+from kwonly_args.introspection import get_argspec, inspect_argspec
+
+
+def func_args_and_defaults_and_varargs(a0, a1, d0='d0', d1='d1', d2='d2', *args):
+    local_var = 0
+    return local_var
+
+
+def func_varkw(a0, d0=None, **kwargs):
+    pass
+
+
+def func_no_args():
+    pass
+
+
+class MyClass(object):
+    def method(self, a0, d0='d0'):
+        pass
+
+    def __call__(self, a0, d0='d0', *args, **kwargs):
+        pass
+
+
+class TestGetArgspec(TestCase):
+    def check_same_as_inspect(self, func):
+        self.assertEqual(get_argspec(func), inspect_argspec(func))
+
+    def test_functions(self):
+        self.check_same_as_inspect(func_args_and_defaults_and_varargs)
+        self.check_same_as_inspect(func_varkw)
+        self.check_same_as_inspect(func_no_args)
+        self.check_same_as_inspect(lambda a, b=1, *c, **d: None)
+        self.check_same_as_inspect(MyClass.method)
+
+    def test_closures(self):
+        def func(a0, d0='d0', *args):
+            return lambda: (a0, d0, args)
+        self.check_same_as_inspect(func)
+
+    @skipIf(sys.version_info[0] == 2, 'python3 only')
+    def test_native_kwonly_args(self):
+        namespace = {}
+        exec("def func(a0, d0='d0', *args, k0, k1='k1', **kwargs):\n    pass\n", namespace)
+        self.check_same_as_inspect(namespace['func'])
+        self.assertEqual(get_argspec(namespace['func']), (['a0', 'd0'], 'args', 'kwargs', ('d0',)))
+
+    def test_other_callables_are_inspected(self):
+        self.check_same_as_inspect(MyClass().method)
+
+    @skipIf(sys.version_info[0] == 2, "python2's inspect.getargspec() doesn't accept callable objects")
+    def test_callable_objects_are_inspected(self):
+        self.check_same_as_inspect(MyClass())
+        self.assertEqual(get_argspec(MyClass()), (['self', 'a0', 'd0'], 'args', 'kwargs', ('d0',)))
+
+    @skipIf(sys.version_info[0] == 2, 'python3 only')
+    def test_signature_attribute_is_respected(self):
+        def func(*args, **kwargs):
+            pass
+        func.__signature__ = inspect.signature(lambda a0, d0='d0': None)
+        self.assertEqual(get_argspec(func), (['a0', 'd0'], None, None, ('d0',)))
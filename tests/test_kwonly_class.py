@@ -0,0 +1,157 @@
+import gc
+from unittest import TestCase
+
+from kwonly_args import kwonly_class, first_kwonly_arg, KWONLY_REQUIRED, MODES, configure, memory_footprint
+from kwonly_args import native
+from kwonly_args.spec import get_spec
+
+
+def create_class(mode=None, name='d0'):
+    @kwonly_class(name, mode=mode)
+    class MyClass(object):
+        def __init__(self, a0, d0='d0', d1=KWONLY_REQUIRED):
+            self.args = (a0, d0, d1)
+
+        def method(self, a0, d0='d0', *args):
+            return self, a0, d0, args
+
+        @classmethod
+        def class_method(cls, a0, d0='d0'):
+            return cls, a0, d0
+
+        @staticmethod
+        def static_method(a0, d0='d0'):
+            return a0, d0
+
+        def _get_value(self, d0='d0'):
+            return d0
+
+        def _set_value(self, value):
+            self.stored_value = value
+
+        value = property(_get_value, _set_value)
+
+        def no_defaults(self, a0, a1):
+            return a0, a1
+
+        def other_args(self, a0, x='x'):
+            return a0, x
+
+        def __eq__(self, other, d0='d0'):
+            return True
+
+        __hash__ = object.__hash__
+    return MyClass
+
+
+class TestKwonlyClass(TestCase):
+    def test_methods_of_all_kinds(self):
+        for mode in MODES:
+            cls = create_class(mode)
+            obj = cls(0, d1=1)
+            self.assertEqual(obj.args, (0, 'd0', 1), mode)
+            self.assertEqual(obj.method(0, 1, 2), (obj, 0, 'd0', (1, 2)), mode)
+            self.assertEqual(obj.method(0, 1, d0=2), (obj, 0, 2, (1,)), mode)
+            self.assertEqual(cls.class_method(0, d0=1), (cls, 0, 1), mode)
+            self.assertEqual(obj.class_method(0), (cls, 0, 'd0'), mode)
+            self.assertEqual(cls.static_method(0, d0=1), (0, 1), mode)
+            self.assertRaises(TypeError, cls.static_method, 0, 1)
+            self.assertRaises(TypeError, cls, 0)
+            self.assertRaises(TypeError, cls, 0, 1, d1=1)
+
+    def test_properties(self):
+        cls = create_class()
+        obj = cls(0, d1=1)
+        self.assertEqual(obj.value, 'd0')
+        self.assertEqual(cls.value.fget(obj, d0=1), 1)
+        self.assertRaises(TypeError, cls.value.fget, obj, 1)
+        obj.value = 5
+        self.assertEqual(obj.stored_value, 5)
+        self.assertIs(cls.value.fset, cls.__dict__['_set_value'])
+
+    def test_skipped_methods(self):
+        cls = create_class()
+        obj = cls(0, d1=1)
+        self.assertEqual(obj.no_defaults(0, 1), (0, 1))
+        self.assertEqual(obj.other_args(0, 1), (0, 1))
+        self.assertFalse(hasattr(cls.__dict__['other_args'], '__wrapped__'))
+        self.assertFalse(hasattr(cls.__dict__['__eq__'], '__wrapped__'))
+
+    def test_methods_without_a_default_value_for_name_are_skipped(self):
+        @kwonly_class('b')
+        class Class(object):
+            def method(self, b, c=1):
+                return b, c
+
+        self.assertEqual(Class().method(0, 1), (0, 1))
+        self.assertFalse(hasattr(Class.__dict__['method'], '__wrapped__'))
+
+    def test_first_default_arg(self):
+        @kwonly_class()
+        class MyClass(object):
+            def method(self, a0, d0='d0', d1='d1'):
+                return a0, d0, d1
+        self.assertEqual(MyClass().method(0, d1=1), (0, 'd0', 1))
+        self.assertRaises(TypeError, MyClass().method, 0, 1)
+
+    def test_already_decorated_methods_are_skipped(self):
+        for mode in MODES:
+            @kwonly_class('d1', mode=mode)
+            class MyClass(object):
+                @first_kwonly_arg('d0', mode=mode)
+                def method(self, a0, d0='d0', d1='d1'):
+                    return a0, d0, d1
+            self.assertRaises(TypeError, MyClass().method, 0, 1)
+            self.assertEqual(MyClass().method(0, d0=1), (0, 1, 'd1'))
+
+    def test_methods_without_wrapper_are_skipped(self):
+        # native functions and functions returned unchanged by validation='trusted' aren't wrappers
+        for options in (dict(mode='native'), dict(validation='trusted')):
+            @kwonly_class()
+            class MyClass(object):
+                @first_kwonly_arg('d1', **options)
+                def method(self, a, d0=0, d1=1, *args):
+                    return a, d0, d1, args
+
+                @first_kwonly_arg('d1', **options)
+                def no_varargs(self, a, d0=0, d1=1):
+                    return a, d0, d1
+            self.assertEqual(MyClass().method(1, 2, 3), (1, 2, 1, (3,)), options)
+            self.assertEqual(MyClass().no_varargs(1, 2), (1, 2, 1), options)
+
+    def test_inherited_methods_are_not_decorated_again(self):
+        base = create_class()
+
+        @kwonly_class('d0')
+        class Derived(base):
+            def method(self, a0, d0='d0', *args):
+                return 'derived', a0, d0, args
+
+        self.assertNotIn('class_method', Derived.__dict__)
+        self.assertEqual(Derived(0, d1=1).method(0, 1), ('derived', 0, 'd0', (1,)))
+
+    def test_overrides_with_the_same_signature_share_the_spec(self):
+        base = create_class()
+
+        class Derived(base):
+            def method(self, a0, d0='d0', *args):
+                pass
+
+        # the garbage left behind by the other tests would be collected during the assertions
+        gc.collect()
+        num_specs = memory_footprint()['specs']
+        # base.method has no __wrapped__ under python2
+        base_method = base.__dict__['method']._kwonly_decoration.wrapped
+        self.assertIs(get_spec(Derived.__dict__['method'], 'd0'), get_spec(base_method, 'd0'))
+        self.assertEqual(memory_footprint()['specs'], num_specs)
+
+    def test_default_mode(self):
+        cls = create_class()
+        self.assertIn('_kwonly_wrapped', cls.__dict__['method'].__code__.co_freevars)
+        configure(mode='native')
+        try:
+            cls = create_class()
+        finally:
+            configure(mode='generic')
+        if native.is_supported():
+            self.assertFalse(hasattr(cls.__dict__['method'], '__wrapped__'))
@@ -0,0 +1,87 @@
+import gc
+import mock
+import re
+import threading
+from unittest import TestCase
+
+import kwonly_args
+from kwonly_args import first_kwonly_arg, configure, validate_all
+
+
+def func_args_and_defaults_and_varargs(a0, a1, d0='d0', d1='d1', d2='d2', *args):
+    return dict(a0=a0, a1=a1, d0=d0, d1=d1, d2=d2, args=args)
+
+
+def func_without_defaults(a0, a1):
+    pass
+
+
+class TestLazy(TestCase):
+    def tearDown(self):
+        kwonly_args._lazy_pending.clear()
+
+    def test_decoration_is_deferred_until_the_first_call(self):
+        with mock.patch('kwonly_args._decorate', wraps=kwonly_args._decorate) as mock_decorate:
+            decorated = first_kwonly_arg('d1', lazy=True)(func_args_and_defaults_and_varargs)
+            self.assertFalse(mock_decorate.called)
+            self.assertEqual(decorated.__name__, 'func_args_and_defaults_and_varargs')
+
+            self.assertEqual(decorated(0, 1, 2, 3, d2=4), dict(a0=0, a1=1, d0=2, d1='d1', d2=4, args=(3,)))
+            self.assertEqual(decorated(0, 1, d1=5), dict(a0=0, a1=1, d0='d0', d1=5, d2='d2', args=()))
+            self.assertEqual(mock_decorate.call_count, 1)
+
+    def test_decoration_error_is_raised_by_the_first_call(self):
+        decorated = first_kwonly_arg('invalid', lazy=True)(func_args_and_defaults_and_varargs)
+        self.assertRaisesRegexp(ValueError, re.escape("doesn't have an argument with the specified first_kwonly_arg"),
+                                decorated, 0, 1)
+
+    def test_validate_all(self):
+        decorated = first_kwonly_arg('d1', lazy=True)(func_args_and_defaults_and_varargs)
+        invalid = first_kwonly_arg('d0', lazy=True)(func_without_defaults)
+        self.assertEqual(len(kwonly_args._lazy_pending), 2)
+
+        self.assertRaisesRegexp(TypeError, re.escape("You can't use @first_kwonly_arg on a function that doesn't"),
+                                validate_all)
+        self.assertEqual(list(kwonly_args._lazy_pending.keys()), [invalid])
+
+        del invalid
+        gc.collect()
+        validate_all()
+        self.assertEqual(len(kwonly_args._lazy_pending), 0)
+        self.assertEqual(decorated(0, 1, 2, 3), dict(a0=0, a1=1, d0=2, d1='d1', d2='d2', args=(3,)))
+
+    def test_garbage_collected_functions_are_removed_from_the_pending_list(self):
+        decorated = first_kwonly_arg('d1', lazy=True)(func_args_and_defaults_and_varargs)
+        self.assertEqual(len(kwonly_args._lazy_pending), 1)
+        del decorated
+        gc.collect()
+        self.assertEqual(len(kwonly_args._lazy_pending), 0)
+
+    def test_configure(self):
+        configure(lazy=True)
+        try:
+            decorated = first_kwonly_arg('invalid')(func_args_and_defaults_and_varargs)
+        finally:
+            configure(lazy=False)
+        self.assertRaises(ValueError, decorated, 0, 1)
+        self.assertRaises(ValueError, first_kwonly_arg('invalid'), func_args_and_defaults_and_varargs)
+
+    def test_concurrent_first_calls_decorate_only_once(self):
+        with mock.patch('kwonly_args._decorate', wraps=kwonly_args._decorate) as mock_decorate:
+            decorated = first_kwonly_arg('d1', mode='codegen', lazy=True)(func_args_and_defaults_and_varargs)
+            start = threading.Event()
+            results = []
+
+            def call():
+                start.wait()
+                results.append(decorated(0, 1, 2, 3, d1=4))
+
+            threads = [threading.Thread(target=call) for _ in range(16)]
+            for thread in threads:
+                thread.start()
+            start.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(mock_decorate.call_count, 1)
+        self.assertEqual(results, [dict(a0=0, a1=1, d0=2, d1=4, d2='d2', args=(3,))] * 16)
@@ -0,0 +1,254 @@
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+from unittest import TestCase, skipIf
+
+import mock
+
+if sys.version_info >= (3, 8):
+    from kwonly_args.migrate import migrate_source, main
+
+
+def dedent(source):
+    # removes the newline that follows the opening quotes
+    return textwrap.dedent(source)[1:] if source.startswith('\n') else source
+
+
+@skipIf(sys.version_info < (3, 8), 'the migration tool requires python3.8+')
+class TestMigrateSource(TestCase):
+    def _test(self, source, expected_source, expected_problems=()):
+        new_source, problems = migrate_source(dedent(source))
+        self.assertEqual(new_source, dedent(expected_source))
+        self.assertEqual([(problem.lineno, problem.message) for problem in problems], list(expected_problems))
+
+    def test_first_kwonly_arg(self):
+        self._test('''
+            from kwonly_args import first_kwonly_arg
+
+            @first_kwonly_arg('d1')
+            def func(a0, d0='d0', d1='d1', d2='d2'):
+                pass
+        ''', '''
+
+            def func(a0, d0='d0', *, d1='d1', d2='d2'):
+                pass
+        ''')
+
+    def test_decorator_with_trailing_comment(self):
+        self._test('''
+            from kwonly_args import first_kwonly_arg
+
+            @first_kwonly_arg('d1')  # note: keyword-only
+            def func(a0, d0='d0', d1='d1'):
+                pass
+        ''', '''
+
+            def func(a0, d0='d0', *, d1='d1'):
+                pass
+        ''')
+
+    def test_required_args_varargs_and_kwargs(self):
+        self._test('''
+            from kwonly_args import first_kwonly_arg, KWONLY_REQUIRED
+
+            @first_kwonly_arg('d1')
+            def func(a0, d0='d0', d1=KWONLY_REQUIRED, d2: int = KWONLY_REQUIRED, *args, **kwargs):
+                pass
+        ''', '''
+
+            def func(a0, d0='d0', *args, d1, d2: int, **kwargs):
+                pass
+        ''')
+
+    def test_comments_inside_the_signature_are_kept(self):
+        self._test('''
+            from kwonly_args import first_kwonly_arg, KWONLY_REQUIRED
+
+            @first_kwonly_arg('d1')
+            def func(a0, d0='d0',
+                     d1=KWONLY_REQUIRED,  # note: required
+                     # the rest of the positional args
+                     *args):
+                pass
+
+            @first_kwonly_arg('d1')
+            def func2(a0, d1='d1',  # note: optional
+                      *args, **kwargs):
+                pass
+
+            @first_kwonly_arg('d1')
+            def func3(a0, d1='d1',  # note: optional
+                      *args,
+                      **kwargs):
+                pass
+        ''', '''
+
+            def func(a0, d0='d0',
+                     *args, d1,  # note: required
+                     # the rest of the positional args
+                     ):
+                pass
+
+            def func2(a0, *args, d1='d1',  # note: optional
+                      **kwargs):
+                pass
+
+            def func3(a0, *args, d1='d1',  # note: optional
+                      **kwargs):
+                pass
+        ''')
+
+    def test_first_default_arg_and_existing_kwonly_args(self):
+        self._test('''
+            import kwonly_args
+            from kwonly_args import kwonly_defaults, FIRST_DEFAULT_ARG
+
+            class Class(object):
+                @classmethod
+                @kwonly_defaults
+                def method(cls, a0, d0=0, *, k=1):
+                    pass
+
+                @kwonly_args.first_kwonly_arg(FIRST_DEFAULT_ARG)
+                def method2(self, a0,
+                            d0=0,  # comment
+                            d1=1):
+                    pass
+        ''', '''
+
+            class Class(object):
+                @classmethod
+                def method(cls, a0, *, d0=0, k=1):
+                    pass
+
+                def method2(self, a0,
+                            *, d0=0,  # comment
+                            d1=1):
+                    pass
+        ''')
+
+    def test_aliases(self):
+        self._test('''
+            import os
+            from kwonly_args import first_kwonly_arg as fka, KWONLY_REQUIRED as REQUIRED
+
+            @fka('d0')
+            def func(d0=REQUIRED):
+                pass
+        ''', '''
+            import os
+
+            def func(*, d0):
+                pass
+        ''')
+
+    def test_problems(self):
+        self._test('''
+            from kwonly_args import first_kwonly_arg
+
+            @first_kwonly_arg(NAME)
+            def func0(d0=0):
+                pass
+
+            @first_kwonly_arg('a0')
+            def func1(a0, d0=0):
+                pass
+
+            @first_kwonly_arg('d0')
+            @staticmethod
+            def func2(d0=0):
+                pass
+
+            @first_kwonly_arg('d0')
+            def func3(d0=0, /):
+                pass
+
+            func4 = first_kwonly_arg('d0')(func0)
+        ''', '''
+            from kwonly_args import first_kwonly_arg
+
+            @first_kwonly_arg(NAME)
+            def func0(d0=0):
+                pass
+
+            @first_kwonly_arg('a0')
+            def func1(a0, d0=0):
+                pass
+
+            @first_kwonly_arg('d0')
+            @staticmethod
+            def func2(d0=0):
+                pass
+
+            @first_kwonly_arg('d0')
+            def func3(d0=0, /):
+                pass
+
+            func4 = first_kwonly_arg('d0')(func0)
+        ''', [
+            (3, 'func0(): the name of the first keyword-only arg is not a string literal'),
+            (7, "func1(): the selected first keyword-only arg 'a0' has no default value"),
+            (11, 'func2(): the decorator is not the innermost one'),
+            (16, "func3(): positional-only args can't be turned into keyword-only args"),
+            (20, 'first_kwonly_arg() is not used as a function decorator'),
+        ])
+
+    def test_used_imports_are_kept(self):
+        self._test('''
+            from kwonly_args import first_kwonly_arg, KWONLY_REQUIRED
+
+            @first_kwonly_arg('d0')
+            def func(d0=KWONLY_REQUIRED):
+                pass
+
+            DEFAULT = KWONLY_REQUIRED
+        ''', '''
+            from kwonly_args import KWONLY_REQUIRED
+
+            def func(*, d0):
+                pass
+
+            DEFAULT = KWONLY_REQUIRED
+        ''')
+
+    def test_source_without_the_library_is_unchanged(self):
+        self._test('def func(a=0):\n    pass\n', 'def func(a=0):\n    pass\n')
+
+
+@skipIf(sys.version_info < (3, 8), 'the migration tool requires python3.8+')
+class TestMain(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'module.py')
+        with open(self.path, 'w') as f:
+            f.write("from kwonly_args import kwonly_defaults\n\n@kwonly_defaults\ndef func(d0=0):\n    pass\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _read(self):
+        with open(self.path) as f:
+            return f.read()
+
+    def test_dry_run_prints_a_diff(self):
+        with mock.patch('sys.stdout') as stdout, mock.patch('sys.stderr'):
+            self.assertEqual(main([self.directory]), 0)
+        output = ''.join(stdout.writelines.call_args[0][0])
+        self.assertIn('-@kwonly_defaults\n', output)
+        self.assertIn('+def func(*, d0=0):\n', output)
+        self.assertIn('@kwonly_defaults', self._read())
+
+    def test_write(self):
+        with mock.patch('sys.stdout'), mock.patch('sys.stderr'):
+            self.assertEqual(main(['--write', self.path]), 0)
+        self.assertEqual(self._read(), "\ndef func(*, d0=0):\n    pass\n")
+
+    def test_problems_set_the_exit_code(self):
+        with open(self.path, 'w') as f:
+            f.write("from kwonly_args import first_kwonly_arg\nf = first_kwonly_arg('a')(len)\n")
+        with mock.patch('sys.stdout'), mock.patch('sys.stderr') as stderr:
+            self.assertEqual(main([self.path]), 1)
+        self.assertIn('module.py:2: first_kwonly_arg() is not used as a function decorator\n',
+                      [call[0][0] for call in stderr.write.call_args_list][0])
@@ -0,0 +1,112 @@
+import inspect
+import re
+import sys
+from unittest import TestCase, skipIf
+
+from kwonly_args import first_kwonly_arg, KWONLY_REQUIRED, FIRST_DEFAULT_ARG
+from kwonly_args.native import is_supported
+
+
+def func_args_and_defaults_and_varargs(a0, a1, d0='d0', d1='d1', d2='d2', *args):
+    return dict(a0=a0, a1=a1, d0=d0, d1=d1, d2=d2, args=args)
+
+
+def func_required(a0, d0='d0', d1=KWONLY_REQUIRED, **kwargs):
+    return dict(a0=a0, d0=d0, d1=d1, kwargs=kwargs)
+
+
+@skipIf(not is_supported(), 'native keyword-only args are supported only by CPython3')
+class TestNative(TestCase):
+    def test_function_isnt_wrapped(self):
+        decorated = first_kwonly_arg('d1', mode='native')(func_args_and_defaults_and_varargs)
+        self.assertEqual(decorated.__code__.co_code, func_args_and_defaults_and_varargs.__code__.co_code)
+        self.assertFalse(hasattr(decorated, '__wrapped__'))
+        self.assertEqual(decorated.__name__, 'func_args_and_defaults_and_varargs')
+        self.assertEqual(decorated.__qualname__, 'func_args_and_defaults_and_varargs')
+        self.assertEqual(decorated.__module__, __name__)
+
+    def test_signature(self):
+        decorated = first_kwonly_arg('d1', mode='native')(func_required)
+        self.assertEqual(str(inspect.signature(decorated)), "(a0, d0='d0', *, d1, **kwargs)")
+
+    def test_calls(self):
+        decorated = first_kwonly_arg('d1', mode='native')(func_args_and_defaults_and_varargs)
+        self.assertEqual(decorated(0, 1), dict(a0=0, a1=1, d0='d0', d1='d1', d2='d2', args=()))
+        self.assertEqual(decorated(0, 1, 2, 3, 4, d2='my_d2'),
+                         dict(a0=0, a1=1, d0=2, d1='d1', d2='my_d2', args=(3, 4)))
+        self.assertEqual(decorated(a0=0, a1=1, d0=2, d1=3), dict(a0=0, a1=1, d0=2, d1=3, d2='d2', args=()))
+
+    def test_first_default_arg(self):
+        decorated = first_kwonly_arg(FIRST_DEFAULT_ARG, mode='native')(func_args_and_defaults_and_varargs)
+        self.assertEqual(decorated(0, 1, 2, 3), dict(a0=0, a1=1, d0='d0', d1='d1', d2='d2', args=(2, 3)))
+
+    def test_required(self):
+        decorated = first_kwonly_arg('d1', mode='native')(func_required)
+        self.assertRaisesRegexp(TypeError, re.escape("missing 1 required keyword-only argument: 'd1'"),
+                                decorated, 0)
+        self.assertEqual(decorated(0, d1=1, x=2), dict(a0=0, d0='d0', d1=1, kwargs=dict(x=2)))
+
+    def test_too_many_positional_args(self):
+        decorated = first_kwonly_arg('d0', mode='native')(func_required)
+        self.assertRaises(TypeError, decorated, 0, 1, d1=1)
+
+    def test_closure_over_kwonly_arg(self):
+        @first_kwonly_arg('d0', mode='native')
+        def func(a0, d0='d0'):
+            return lambda: (a0, d0)
+
+        self.assertEqual(func(0, d0=1)(), (0, 1))
+
+    def test_generator(self):
+        @first_kwonly_arg('d0', mode='native')
+        def func(a0, d0='d0'):
+            yield a0
+            yield d0
+
+        self.assertTrue(inspect.isgeneratorfunction(func))
+        self.assertEqual(list(func(0, d0=1)), [0, 1])
+
+    def test_existing_native_kwonly_args(self):
+        namespace = {}
+        exec("def func(a0, d0='d0', *args, k0, k1='k1'):\n    return a0, d0, args, k0, k1\n", namespace)
+        decorated = first_kwonly_arg('d0', mode='native')(namespace['func'])
+        self.assertEqual(str(inspect.signature(decorated)), "(a0, *args, d0='d0', k0, k1='k1')")
+        self.assertEqual(decorated(0, 1, k0=2), (0, 'd0', (1,), 2, 'k1'))
+
+    def test_methods(self):
+        class MyClass(object):
+            @first_kwonly_arg('d1', mode='native')
+            def my_instance_method(self, a0, d0='d0', d1='d1'):
+                return self, a0, d0, d1
+
+            @classmethod
+            @first_kwonly_arg('d1', mode='native')
+            def my_class_method(cls, a0, d0='d0', d1='d1'):
+                return cls, a0, d0, d1
+
+            @staticmethod
+            @first_kwonly_arg('d1', mode='native')
+            def my_static_method(a0, d0='d0', d1='d1'):
+                return a0, d0, d1
+
+        instance = MyClass()
+        self.assertEqual(instance.my_instance_method(0, 1, d1=2), (instance, 0, 1, 2))
+        self.assertEqual(instance.my_class_method(0, 1, d1=2), (MyClass, 0, 1, 2))
+        self.assertEqual(instance.my_static_method(0, 1, d1=2), (0, 1, 2))
+        self.assertRaises(TypeError, instance.my_instance_method, 0, 1, 2)
+
+    @skipIf(sys.version_info < (3, 8), 'positional-only args require python3.8+')
+    def test_positional_only_args_fall_back_to_wrapper(self):
+        namespace = {}
+        exec("def func(a0, d0='d0', /):\n    return a0, d0\n", namespace)
+        decorated = first_kwonly_arg('d0', mode='native')(namespace['func'])
+        self.assertIs(decorated.__wrapped__, namespace['func'])
+
+    def test_signature_not_matching_the_code_object_falls_back_to_wrapper(self):
+        def func(*args, **kwargs):
+            return args, kwargs
+        func.__signature__ = inspect.signature(lambda a0, d0='d0': None)
+
+        decorated = first_kwonly_arg('d0', mode='native')(func)
+        self.assertIs(decorated.__wrapped__, func)
+        self.assertEqual(decorated(0, d0=1), ((0,), dict(d0=1)))
@@ -0,0 +1,148 @@
+import functools
+import sys
+from unittest import TestCase, skipIf
+
+from kwonly_args import first_kwonly_arg, kwonly_partial, KWONLY_REQUIRED
+from kwonly_args import partial
+
+
+def func(a0, a1, d0='d0', d1='d1', d2=KWONLY_REQUIRED, *args, **kwargs):
+    return a0, a1, d0, d1, d2, args, kwargs
+
+
+def func_without_varargs(a0, d0='d0', d1='d1', d2=KWONLY_REQUIRED):
+    return a0, d0, d1, d2
+
+
+# (bound_args, bound_kwargs)
+BINDINGS = [
+    ((), {}),
+    ((0,), {}),
+    ((0, 1), dict(d2='b2')),
+    ((0,), dict(d1='b1', d2='b2')),
+    ((0, 1, 2), dict(d2='b2')),
+    # can't be resolved by the generated partial
+    ((0, 1, 2, 3), dict(d2='b2')),
+    ((), dict(a1='b1', d2='b2')),
+    ((0,), dict(x='bx')),
+]
+
+# (args, kwargs) valid at least for some of the bindings
+CALLS = [
+    ((), {}),
+    ((), dict(d2=2)),
+    ((1,), {}),
+    ((1,), dict(d1=1, d2=2)),
+    ((1, 2, 3), {}),
+    ((1, 2, 3), dict(d2=2, x=3)),
+    ((0, 1, 2, 3, 4), dict(d1=1, d2=2)),
+    ((), dict(a1=1, d2=2)),
+]
+
+
+def call(f, args, kwargs):
+    try:
+        return f(*args, **kwargs)
+    except TypeError:
+        return TypeError
+
+
+def library_error(f, args, kwargs):
+    """ Returns the message of the TypeError raised by the library or ``None``. The errors raised by the interpreter
+    (e.g.: unexpected keyword arg) may contain a different function name. """
+    try:
+        f(*args, **kwargs)
+    except TypeError as e:
+        message = str(e)
+        if 'keyword-only' in message or 'takes exactly' in message:
+            return message
+    return None
+
+
+class TestKwonlyPartial(TestCase):
+    def check_same_as_functools_partial(self, wrapped, validation='normal', valid_calls_only=False):
+        for mode in ('generic', 'codegen'):
+            decorated = first_kwonly_arg('d1', mode=mode, validation=validation)(wrapped)
+            for bound_args, bound_kwargs in BINDINGS:
+                expected = functools.partial(decorated, *bound_args, **bound_kwargs)
+                bound = kwonly_partial(decorated, *bound_args, **bound_kwargs)
+                self.assertIsNot(type(bound), functools.partial)
+                for args, kwargs in CALLS:
+                    context = (mode, bound_args, bound_kwargs, args, kwargs)
+                    result = call(expected, args, dict(kwargs))
+                    if valid_calls_only and result is TypeError:
+                        continue
+                    self.assertEqual(call(bound, args, dict(kwargs)), result, context)
+                    if result is TypeError:
+                        # Calls with more than one error may report a different one of them.
+                        errors = [library_error(bound, args, dict(kwargs)), library_error(expected, args, dict(kwargs))]
+                        if None not in errors:
+                            self.assertEqual(errors[0], errors[1], context)
+
+    def test_same_as_functools_partial(self):
+        self.check_same_as_functools_partial(func)
+
+    def test_same_as_functools_partial_without_varargs(self):
+        self.check_same_as_functools_partial(func_without_varargs)
+
+    def test_same_as_functools_partial_trusted(self):
+        self.check_same_as_functools_partial(func, 'trusted', valid_calls_only=True)
+
+    @skipIf(sys.version_info < (3, 8), 'positional-only args require python3.8+')
+    def test_positional_only_args(self):
+        namespace = dict(KWONLY_REQUIRED=KWONLY_REQUIRED)
+        exec('def func(a0, a1, /, d0="d0", d1="d1", d2=KWONLY_REQUIRED, *args, **kwargs):\n'
+             '    return a0, a1, d0, d1, d2, args, kwargs', namespace)
+        self.check_same_as_functools_partial(namespace['func'])
+        bound = kwonly_partial(first_kwonly_arg('d1')(namespace['func']), 0, d2='b2')
+        self.assertEqual(bound(1, a1='kw'), (0, 1, 'd0', 'd1', 'b2', (), {'a1': 'kw'}))
+
+    def test_bound_required_kwonly_arg(self):
+        bound = kwonly_partial(first_kwonly_arg('d1')(func), 0, d2='b2')
+        self.assertIn('_kwonly_wrapped', bound.__code__.co_freevars)
+        self.assertEqual(bound(1), (0, 1, 'd0', 'd1', 'b2', (), {}))
+        self.assertEqual(bound(1, d2=2), (0, 1, 'd0', 'd1', 2, (), {}))
+
+    def test_missing_error_doesnt_report_bound_args(self):
+        def required(a0, d0=KWONLY_REQUIRED, d1=KWONLY_REQUIRED, d2=KWONLY_REQUIRED):
+            pass
+        bound = kwonly_partial(first_kwonly_arg('d0')(required), d1=1)
+        self.assertRaisesRegexp(TypeError, r'^required\(\) missing 1 keyword-only argument\(s\): d2$', bound, 0, d0=0)
+
+    def test_partial_attributes(self):
+        decorated = first_kwonly_arg('d1')(func)
+        bound = kwonly_partial(decorated, 0, d2='b2')
+        self.assertEqual((bound.func, bound.args, bound.keywords), (decorated, (0,), dict(d2='b2')))
+
+    def test_generated_partials_share_their_factory(self):
+        decorated = first_kwonly_arg('d1')(func)
+        kwonly_partial(decorated, 0, d2='b2')
+        num_factories = len(partial._factory_cache)
+        bound = kwonly_partial(decorated, 1, d2='other')
+        self.assertEqual(len(partial._factory_cache), num_factories)
+        self.assertEqual(bound(1), (1, 1, 'd0', 'd1', 'other', (), {}))
+
+    def test_functions_with_different_names_share_the_factory(self):
+        def other_func(a0, a1, d0='d0', d1='d1', d2=KWONLY_REQUIRED, *args, **kwargs):
+            return a0, a1, d0, d1, d2, args, kwargs
+
+        kwonly_partial(first_kwonly_arg('d1')(func), 0, d2='b2')
+        num_factories = len(partial._factory_cache)
+        bound = kwonly_partial(first_kwonly_arg('d1')(other_func), 0, d2='b2')
+        self.assertEqual(len(partial._factory_cache), num_factories)
+        self.assertEqual(bound.__name__, 'other_func')
+        self.assertEqual(bound(1), (0, 1, 'd0', 'd1', 'b2', (), {}))
+
+    def test_falls_back_to_functools_partial(self):
+        undecorated = kwonly_partial(func, 0, d2='b2')
+        self.assertIs(type(undecorated), functools.partial)
+        for options in (dict(validation='debug'), dict(instrumentation='counts')):
+            bound = kwonly_partial(first_kwonly_arg('d1', **options)(func), 0, d2='b2')
+            self.assertIs(type(bound), functools.partial)
+            self.assertEqual(bound(1), (0, 1, 'd0', 'd1', 'b2', (), {}))
+
+    @skipIf(sys.version_info < (3,), 'python3 only')
+    def test_native_mode(self):
+        bound = kwonly_partial(first_kwonly_arg('d1', mode='native')(func), 0, d2='b2')
+        self.assertIs(type(bound), functools.partial)
+        self.assertEqual(bound(1, 2, 3), (0, 1, 2, 'd1', 'b2', (3,), {}))
@@ -0,0 +1,104 @@
+import functools
+import pickle
+import sys
+from unittest import TestCase, skipIf
+
+from kwonly_args import first_kwonly_arg, kwonly_class
+
+
+def func(a0, d0='d0', d1='d1', *args):
+    return a0, d0, d1, args
+
+
+# An alias that plain pickle can't find: the name 'func' refers to the undecorated function.
+fast_func = first_kwonly_arg('d1', mode='codegen')(func)
+
+
+@first_kwonly_arg('d1')
+def decorated_func(a0, d0='d0', d1='d1', *args):
+    return a0, d0, d1, args
+
+
+# Decorated differently than the module-level decorated_func.
+other_decorated_func = first_kwonly_arg('d0', mode='codegen')(decorated_func.__wrapped__)
+
+
+class Outer(object):
+    @kwonly_class('d0')
+    class Inner(object):
+        def method(self, a0, d0='d0'):
+            return a0, d0
+
+        @classmethod
+        def class_method(cls, a0, d0='d0'):
+            return cls, a0, d0
+
+        @staticmethod
+        def static_method(a0, d0='d0'):
+            return a0, d0
+
+
+@skipIf(sys.version_info < (3, 8), 'reducer_override requires python3.8+')
+class TestPickling(TestCase):
+    def setUp(self):
+        from kwonly_args import pickling
+        self.pickling = pickling
+
+    def round_trip(self, obj):
+        return pickle.loads(self.pickling.dumps(obj))
+
+    def test_alias_that_plain_pickle_cant_find(self):
+        self.assertRaises(pickle.PicklingError, pickle.dumps, fast_func)
+        loaded = self.round_trip(fast_func)
+        self.assertEqual(loaded(0, 1, 2, d1=3), (0, 1, 3, (2,)))
+        self.assertIn('_kwonly_wrapped', loaded.__code__.co_freevars)
+        # the unpickling process decorates the function only once
+        self.assertIs(self.round_trip(fast_func), loaded)
+
+    def test_function_found_by_name_is_used_as_is(self):
+        self.assertIs(self.round_trip(decorated_func), decorated_func)
+
+    def test_different_decoration_of_the_same_function(self):
+        loaded = self.round_trip(other_decorated_func)
+        self.assertIsNot(loaded, decorated_func)
+        self.assertEqual(loaded(0, 1, d0=2), (0, 2, 'd1', (1,)))
+
+    def test_partial(self):
+        loaded = self.round_trip(functools.partial(fast_func, d1='partial'))
+        self.assertEqual(loaded(0, 1, 2), (0, 1, 'partial', (2,)))
+
+    def test_methods(self):
+        obj = Outer.Inner()
+        self.assertIs(self.round_trip(Outer.Inner.method), Outer.Inner.method)
+        self.assertIs(self.round_trip(Outer.Inner.static_method), Outer.Inner.static_method)
+        self.assertEqual(self.round_trip(obj.method)(0, d0=1), (0, 1))
+        self.assertEqual(self.round_trip(Outer.Inner.class_method)(0, d0=1), (Outer.Inner, 0, 1))
+
+    def test_nested_functions_cant_be_pickled(self):
+        @first_kwonly_arg('d0')
+        def nested(a0, d0='d0'):
+            pass
+        self.assertIs(self.pickling.reduce_function(nested), NotImplemented)
+        self.assertRaises((pickle.PicklingError, AttributeError), self.pickling.dumps, nested)
+
+    def test_install(self):
+        from multiprocessing.reduction import ForkingPickler
+        self.pickling.install()
+        try:
+            self.assertEqual(pickle.loads(ForkingPickler.dumps(fast_func))(0, d1=1), (0, 'd0', 1, ()))
+        finally:
+            self.pickling.uninstall()
+        self.assertRaises(pickle.PicklingError, ForkingPickler.dumps, fast_func)
+
+    def test_process_pool(self):
+        from concurrent.futures import ProcessPoolExecutor
+        self.pickling.install()
+        try:
+            executor = ProcessPoolExecutor(1)
+            try:
+                future = executor.submit(functools.partial(fast_func, d1='partial'), 0, 1, 2)
+                self.assertEqual(future.result(), (0, 1, 'partial', (2,)))
+            finally:
+                executor.shutdown()
+        finally:
+            self.pickling.uninstall()
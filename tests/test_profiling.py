@@ -0,0 +1,134 @@
+import cProfile
+import dis
+import pstats
+import sys
+import traceback
+from unittest import TestCase, skipIf
+
+from kwonly_args import configure, first_kwonly_arg, KWONLY_REQUIRED, MODES
+from kwonly_args.profiling import is_supported, wrapper_name, wrapped_name, fold_wrapper_frames
+
+
+def func(a0, d0='d0', d1='d1', *args):
+    return a0, d0, d1, args
+
+
+def func_with_body(a0, d0='d0', d1=KWONLY_REQUIRED):
+    x = 1
+    y = 2
+    return a0, d0, d1, x, y
+
+
+def create_handler():
+    def handler(request, verbose=False):
+        return request
+    return handler
+
+
+def call_decorated(decorated, num_calls):
+    for _ in range(num_calls):
+        decorated(0, d1=1)
+
+
+class ProfilingTestCase(TestCase):
+    def setUp(self):
+        configure(profiling=True)
+
+    def tearDown(self):
+        configure(profiling=False)
+
+
+class TestWrapperNames(ProfilingTestCase):
+    def test_wrapper_name(self):
+        self.assertEqual(wrapper_name('func'), 'func [kwonly_args]')
+        self.assertEqual(wrapper_name('func', 'debug'), 'func [kwonly_args debug]')
+
+    def test_wrapped_name(self):
+        self.assertEqual(wrapped_name('func [kwonly_args]'), 'func')
+        self.assertEqual(wrapped_name('Class.func [kwonly_args lazy]'), 'Class.func')
+        self.assertIsNone(wrapped_name('func'))
+        self.assertIsNone(wrapped_name('func [other]'))
+        self.assertIsNone(wrapped_name('func [kwonly_argsx]'))
+
+    @skipIf(not is_supported(), 'CPython 3.10+ only')
+    def test_wrappers_have_the_location_and_tagged_name_of_the_wrapped_function(self):
+        for mode in ('generic', 'codegen'):
+            code = first_kwonly_arg('d1', mode=mode)(func).__code__
+            self.assertEqual(code.co_name, 'func [kwonly_args]')
+            self.assertEqual(code.co_filename, func.__code__.co_filename)
+            self.assertEqual(code.co_firstlineno, func.__code__.co_firstlineno)
+            if hasattr(code, 'co_qualname'):
+                self.assertEqual(code.co_qualname, 'func [kwonly_args]')
+
+    @skipIf(not is_supported(), 'CPython 3.10+ only')
+    def test_wrapper_kinds(self):
+        decorated = first_kwonly_arg('d1', lazy=True, validation='debug', instrumentation='counts')(func)
+        self.assertEqual(decorated.__code__.co_name, 'func [kwonly_args lazy]')
+        decorated(0)
+        resolved = decorated.__closure__[[cell for cell in decorated.__code__.co_freevars].index('decorated')]
+        self.assertEqual(resolved.cell_contents[0].__code__.co_name, 'func [kwonly_args instrumentation]')
+
+    @skipIf(not is_supported(), 'CPython 3.10+ only')
+    def test_wrappers_of_the_same_def_statement_share_code(self):
+        decorated0 = first_kwonly_arg('verbose')(create_handler())
+        decorated1 = first_kwonly_arg('verbose')(create_handler())
+        self.assertIs(decorated0.__code__, decorated1.__code__)
+
+    @skipIf(not is_supported(), 'CPython 3.10+ only')
+    def test_all_lines_of_the_wrappers_are_the_def_line(self):
+        firstlineno = func_with_body.__code__.co_firstlineno
+        for mode in ('generic', 'codegen'):
+            decorated = first_kwonly_arg('d1', mode=mode)(func_with_body)
+            self.assertEqual(set(line for _, line in dis.findlinestarts(decorated.__code__)), set([firstlineno]))
+            try:
+                decorated(0)
+            except TypeError:
+                frame = traceback.extract_tb(sys.exc_info()[2])[-1]
+            self.assertEqual((frame[1], frame[2]), (firstlineno, 'func_with_body [kwonly_args]'))
+
+    @skipIf(is_supported(), 'CPython 3.10+ renames the wrappers')
+    def test_wrappers_arent_renamed_where_unsupported(self):
+        for mode in ('generic', 'codegen'):
+            decorated = first_kwonly_arg('d1', mode=mode)(func)
+            self.assertNotEqual(decorated.__code__.co_name, 'func [kwonly_args]')
+
+    def test_wrappers_arent_renamed_by_default(self):
+        configure(profiling=False)
+        for mode in ('generic', 'codegen'):
+            decorated = first_kwonly_arg('d1', mode=mode, lazy=True)(func)
+            self.assertNotEqual(decorated.__code__.co_name, 'func [kwonly_args lazy]')
+            decorated(0)
+            self.assertNotEqual(decorated.__code__.co_name, 'func [kwonly_args]')
+
+
+@skipIf(not is_supported(), 'CPython 3.10+ only')
+class TestFoldWrapperFrames(ProfilingTestCase):
+    def _profile(self, decorated, num_calls=5):
+        profile = cProfile.Profile()
+        profile.runcall(call_decorated, decorated, num_calls)
+        return pstats.Stats(profile)
+
+    def _find(self, stats, name):
+        labels = [label for label in stats.stats if label[2] == name]
+        self.assertEqual(len(labels), 1, labels)
+        return labels[0]
+
+    def _test_fold(self, decorated):
+        stats = self._profile(decorated)
+        total_tt = sum(tt for cc, nc, tt, ct, callers in stats.stats.values())
+        fold_wrapper_frames(stats)
+
+        self.assertFalse([label for label in stats.stats if wrapped_name(label[2]) is not None])
+        self.assertAlmostEqual(sum(tt for cc, nc, tt, ct, callers in stats.stats.values()), total_tt)
+        cc, nc, tt, ct, callers = stats.stats[self._find(stats, 'func')]
+        self.assertEqual(nc, 5)
+        self.assertEqual(list(callers), [self._find(stats, 'call_decorated')])
+        # sort_stats() works with the modified data
+        stats.sort_stats('cumulative')
+
+    def test_fold(self):
+        for mode in MODES:
+            self._test_fold(first_kwonly_arg('d1', mode=mode)(func))
+
+    def test_fold_nested_wrappers(self):
+        self._test_fold(first_kwonly_arg('d1', lazy=True, validation='debug', instrumentation='timing')(func))
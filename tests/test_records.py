@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+from kwonly_args import kwonly_init, records, KWONLY_REQUIRED, FIRST_DEFAULT_ARG, MODES
+
+
+FIELDS = ['host', ('port', 80), ('timeout', KWONLY_REQUIRED), ('debug', False)]
+
+
+class TestKwonlyInit(TestCase):
+    def test_fields_are_assigned(self):
+        for mode in MODES:
+            @kwonly_init(FIELDS, 'timeout', mode=mode)
+            class Config(object):
+                pass
+            config = Config('localhost', 8080, timeout=3)
+            self.assertEqual(config.__dict__, dict(host='localhost', port=8080, timeout=3, debug=False), mode)
+            self.assertRaises(TypeError, Config, 'localhost', timeout=3, unknown=0)
+
+    def test_keyword_only_fields(self):
+        for mode in MODES:
+            @kwonly_init(FIELDS, 'timeout', mode=mode)
+            class Config(object):
+                pass
+            self.assertRaises(TypeError, Config, 'localhost')
+            self.assertRaises(TypeError, Config, 'localhost', 80, 3)
+
+    def test_all_defaults_are_keyword_only_by_default(self):
+        @kwonly_init(['a', ('b', 1)])
+        class Record(object):
+            pass
+        self.assertEqual(Record(0, b=2).b, 2)
+        self.assertRaises(TypeError, Record, 0, 2)
+
+    def test_no_keyword_only_fields(self):
+        @kwonly_init(['a', ('b', 1)], None)
+        class Record(object):
+            pass
+        self.assertEqual(Record(0, 2).b, 2)
+        self.assertRaises(ValueError, kwonly_init, ['a', ('b', KWONLY_REQUIRED)], None)
+
+    def test_slots(self):
+        @kwonly_init(FIELDS, 'timeout', slots=True)
+        class Config(object):
+            def describe(self):
+                return '%s:%s' % (self.host, self.port)
+        config = Config('localhost', timeout=3)
+        self.assertEqual(Config.__slots__, ('host', 'port', 'timeout', 'debug'))
+        self.assertFalse(hasattr(config, '__dict__'))
+        self.assertEqual(config.describe(), 'localhost:80')
+        self.assertEqual(Config.__name__, 'Config')
+
+    def test_slots_conflict_with_class_attributes(self):
+        class Config(object):
+            port = 80
+        self.assertRaises(ValueError, kwonly_init(FIELDS, 'timeout', slots=True), Config)
+
+    def test_field_named_self(self):
+        @kwonly_init(['self', ('other', 0)])
+        class Record(object):
+            pass
+        self.assertEqual(Record(1, other=2).self, 1)
+
+    def test_invalid_fields(self):
+        self.assertRaises(ValueError, kwonly_init, [('a', 0), 'b'])
+        self.assertRaises(ValueError, kwonly_init, ['a', 'a'])
+        self.assertRaises(ValueError, kwonly_init, ['not valid'])
+        self.assertRaises(ValueError, kwonly_init, ['a', ('b', 0)], 'c')
+        self.assertRaises(ValueError, kwonly_init, ['a', ('b', KWONLY_REQUIRED), ('c', 0)], 'c')
+        self.assertRaises(ValueError, kwonly_init(['a', ('b', 0)], 'a'), type('Record', (object,), {}))
+
+    def test_factories_are_shared(self):
+        kwonly_init(FIELDS, FIRST_DEFAULT_ARG)(type('Record', (object,), {}))
+        num_factories = len(records._factory_cache)
+        kwonly_init(FIELDS, FIRST_DEFAULT_ARG)(type('OtherRecord', (object,), {}))
+        self.assertEqual(len(records._factory_cache), num_factories)
@@ -0,0 +1,109 @@
+import sys
+from unittest import TestCase, skipIf
+
+from kwonly_args import first_kwonly_arg, kwonly_defaults, KWONLY_REQUIRED, MODES
+from kwonly_args.signature import CALLABLE_SIGNATURE_SUPPORTED
+
+
+@skipIf(sys.version_info < (3, 5), 'inspect.signature(follow_wrapped=...) requires python3.5+')
+class TestSignature(TestCase):
+    def test_selected_args_are_keyword_only(self):
+        import inspect
+        for mode in MODES:
+            @first_kwonly_arg('d1', mode=mode)
+            def func(a0, d0=0, d1=1, d2=KWONLY_REQUIRED, *args, **kwargs):
+                pass
+            self.assertEqual(str(inspect.signature(func)), '(a0, d0=0, *args, d1=1, d2, **kwargs)', mode)
+
+    def test_required_kwonly_args_have_no_default(self):
+        import inspect
+
+        @first_kwonly_arg('d0')
+        def func(a0, d0=KWONLY_REQUIRED):
+            pass
+        parameter = inspect.signature(func).parameters['d0']
+        self.assertEqual(parameter.kind, inspect.Parameter.KEYWORD_ONLY)
+        self.assertIs(parameter.default, inspect.Parameter.empty)
+
+    def test_bind_follows_the_decorated_signature(self):
+        import inspect
+
+        @first_kwonly_arg('d0')
+        def func(a0, d0=KWONLY_REQUIRED, *args):
+            pass
+        bound = inspect.signature(func).bind(0, 1, 2, d0=3)
+        self.assertEqual(bound.arguments, dict(a0=0, args=(1, 2), d0=3))
+        self.assertRaises(TypeError, inspect.signature(func).bind, 0)
+
+    def test_signature_is_built_lazily_and_only_once(self):
+        import inspect
+
+        @kwonly_defaults
+        def func(a0, d0=0):
+            pass
+        lazy_signature = func.__dict__['__signature__']
+        if CALLABLE_SIGNATURE_SUPPORTED:
+            self.assertIsNone(lazy_signature._signature)
+        else:
+            self.assertIs(lazy_signature._wrapped, func.__wrapped__)
+        signature = inspect.signature(func)
+        self.assertIs(inspect.signature(func), signature)
+        self.assertIsInstance(signature, inspect.Signature)
+        self.assertEqual(str(signature), '(a0, *, d0=0)')
+
+    @skipIf(not CALLABLE_SIGNATURE_SUPPORTED, 'callable __signature__ requires python3.12+')
+    def test_signature_is_a_real_signature(self):
+        import inspect
+
+        @kwonly_defaults
+        def func(a0, d0=0):
+            pass
+        self.assertIs(type(inspect.signature(func)), inspect.Signature)
+
+    @skipIf(CALLABLE_SIGNATURE_SUPPORTED, 'python3.12+ uses a callable __signature__')
+    def test_lazy_signature_behaves_like_a_signature(self):
+        import inspect
+        import pickle
+
+        @kwonly_defaults
+        def func(a0, d0=0):
+            pass
+        expected = inspect.Signature([inspect.Parameter('a0', inspect.Parameter.POSITIONAL_OR_KEYWORD),
+                                      inspect.Parameter('d0', inspect.Parameter.KEYWORD_ONLY, default=0)])
+        signature = inspect.signature(func)
+        self.assertEqual(signature, expected)
+        self.assertEqual(hash(signature), hash(expected))
+        self.assertEqual(signature.replace(return_annotation=int), expected.replace(return_annotation=int))
+        self.assertEqual(pickle.loads(pickle.dumps(signature)), expected)
+        self.assertIs(type(pickle.loads(pickle.dumps(signature))), inspect.Signature)
+
+    def test_methods(self):
+        import inspect
+
+        class MyClass(object):
+            @kwonly_defaults
+            def method(self, a0, d0=0):
+                pass
+        self.assertEqual(str(inspect.signature(MyClass().method)), '(a0, *, d0=0)')
+        self.assertEqual(str(inspect.signature(MyClass.method)), '(self, a0, *, d0=0)')
+
+    def test_lazy_and_instrumented_decoration(self):
+        import inspect
+        for settings in (dict(lazy=True), dict(instrumentation='counts'), dict(validation='debug')):
+            @first_kwonly_arg('d0', **settings)
+            def func(a0, d0=KWONLY_REQUIRED):
+                pass
+            self.assertEqual(str(inspect.signature(func)), '(a0, *, d0)', settings)
+
+    def test_trusted_function_without_wrapper_has_no_signature(self):
+        def func(a0, d0=0):
+            pass
+        self.assertIs(first_kwonly_arg('d0', validation='trusted')(func), func)
+        self.assertNotIn('__signature__', func.__dict__)
+
+    def test_native_mode_has_real_keyword_only_args(self):
+        @first_kwonly_arg('d0', mode='native')
+        def func(a0, d0=0):
+            pass
+        self.assertNotIn('__signature__', func.__dict__)
+        self.assertEqual(func.__code__.co_kwonlyargcount, 1)
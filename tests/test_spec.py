@@ -0,0 +1,104 @@
+import gc
+from unittest import TestCase
+
+import kwonly_args
+from kwonly_args import first_kwonly_arg, kwonly_partial, memory_footprint, KWONLY_REQUIRED
+from kwonly_args.spec import get_spec, KwonlySpec
+
+
+def func(a0, d0='d0', d1=KWONLY_REQUIRED, *args):
+    return a0, d0, d1, args
+
+
+def create_handler(tenant):
+    def handler(request, verbose=False, timeout=10):
+        return tenant, request, verbose, timeout
+    return handler
+
+
+class TestSpec(TestCase):
+    def test_attributes(self):
+        spec = get_spec(func, 'd0')
+        self.assertIsInstance(spec, KwonlySpec)
+        self.assertEqual(spec.arg_names, ('a0', 'd0', 'd1'))
+        self.assertEqual(spec.varargs, 'args')
+        self.assertEqual(spec.defaults, ('d0', KWONLY_REQUIRED))
+        self.assertEqual(spec.first_kwonly_index, 1)
+        self.assertEqual(spec.first_default_index, 1)
+        self.assertEqual(spec.kwonly_args, (('d0', 'd0'), ('d1', KWONLY_REQUIRED)))
+        self.assertEqual(spec.required_kwonly_args, frozenset(['d1']))
+
+    def test_spec_has_no_instance_dict(self):
+        self.assertFalse(hasattr(get_spec(func, 'd0'), '__dict__'))
+
+    def test_same_function_shares_spec(self):
+        handler = create_handler(0)
+        self.assertIs(get_spec(handler, 'verbose'), get_spec(handler, 'verbose'))
+
+    def test_specs_of_module_level_functions_arent_cached(self):
+        num_specs = memory_footprint()['specs']
+        self.assertIsNot(get_spec(func, 'd0'), get_spec(func, 'd0'))
+        self.assertEqual(memory_footprint()['specs'], num_specs)
+
+    def test_decoration_reuses_the_spec(self):
+        decorated = first_kwonly_arg('d0')(func)
+        decoration = decorated._kwonly_decoration
+        self.assertIs(decoration.spec, decoration.spec)
+        self.assertEqual(decoration.spec.arg_names, ('a0', 'd0', 'd1'))
+
+    def test_different_first_kwonly_arg_has_different_spec(self):
+        self.assertIsNot(get_spec(func, 'd0'), get_spec(func, 'd1'))
+
+    def test_functions_of_the_same_def_statement_share_spec(self):
+        spec0 = get_spec(create_handler(0), kwonly_args.FIRST_DEFAULT_ARG)
+        spec1 = get_spec(create_handler(1), kwonly_args.FIRST_DEFAULT_ARG)
+        self.assertIs(spec0, spec1)
+
+    def test_different_defaults_have_different_specs(self):
+        handler0 = create_handler(0)
+        handler1 = create_handler(1)
+        handler1.__defaults__ = (True, 10)
+        spec0 = get_spec(handler0, 'verbose')
+        spec1 = get_spec(handler1, 'verbose')
+        self.assertIsNot(spec0, spec1)
+        self.assertEqual(spec1.defaults, (True, 10))
+
+    def test_spec_is_released_with_the_decorated_functions(self):
+        decorated = [first_kwonly_arg('verbose')(create_handler(i)) for i in range(3)]
+        # the garbage of the previous tests may hold specs too
+        gc.collect()
+        num_specs = memory_footprint()['specs']
+        del decorated
+        gc.collect()
+        self.assertEqual(memory_footprint()['specs'], num_specs - 1)
+
+    def test_decoration_errors_are_not_cached(self):
+        self.assertRaises(ValueError, get_spec, func, 'missing')
+        self.assertRaises(ValueError, get_spec, func, 'missing')
+        self.assertRaises(TypeError, get_spec, lambda a: None, 'a')
+
+
+class TestMemoryFootprint(TestCase):
+    def test_keys(self):
+        footprint = memory_footprint()
+        self.assertEqual(sorted(footprint), ['codegen_bytes', 'codegen_factories', 'init_bytes', 'init_factories',
+                                             'instrumentation_bytes', 'instrumented_functions', 'partial_bytes',
+                                             'partial_factories', 'pickling_bytes', 'renamed_code_bytes',
+                                             'renamed_codes', 'spec_bytes', 'specs', 'total_bytes',
+                                             'unpickled_functions'])
+        self.assertEqual(footprint['total_bytes'], sum(value for key, value in footprint.items()
+                                                       if key.endswith('_bytes') and key != 'total_bytes'))
+
+    def test_codegen_factories_are_counted(self):
+        first_kwonly_arg('verbose', mode='codegen')(create_handler(0))
+        footprint = memory_footprint()
+        self.assertGreater(footprint['codegen_factories'], 0)
+        self.assertGreater(footprint['codegen_bytes'], 0)
+
+    def test_other_caches_are_counted(self):
+        handler = first_kwonly_arg('verbose', instrumentation='counts')(create_handler(1))
+        handler(0)
+        kwonly_partial(first_kwonly_arg('verbose')(create_handler(2)), 0)
+        footprint = memory_footprint()
+        for key in ('partial_factories', 'partial_bytes', 'instrumented_functions', 'instrumentation_bytes'):
+            self.assertGreater(footprint[key], 0, key)
@@ -0,0 +1,121 @@
+import gc
+import threading
+import weakref
+from unittest import TestCase
+
+import mock
+
+import kwonly_args
+from kwonly_args import first_kwonly_arg, KWONLY_REQUIRED, MODES
+from kwonly_args import instrumentation
+
+
+NUM_THREADS = 8
+NUM_CALLS = 2000
+
+
+def run_threads(target, num_threads=NUM_THREADS):
+    """ Starts the threads at the same time and returns the list of the results of ``target(thread_index)``. """
+    start = threading.Event()
+    results = [None] * num_threads
+    errors = []
+
+    def run(index):
+        start.wait()
+        try:
+            results[index] = target(index)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    start.set()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+def func(a0, d0='d0', d1='d1', d2=KWONLY_REQUIRED, *args, **kwargs):
+    return a0, d0, d1, d2, args, kwargs
+
+
+class TestContention(TestCase):
+    def test_calls_from_many_threads(self):
+        for mode in MODES:
+            decorated = first_kwonly_arg('d1', mode=mode)(func)
+
+            def call(index):
+                for i in range(NUM_CALLS):
+                    if decorated(index, i, d2=i) != (index, i, 'd1', i, (), {}):
+                        return False
+                    if decorated(index, 0, 1, 2, d1=i, d2=3, x=index) != (index, 0, i, 3, (1, 2), {'x': index}):
+                        return False
+                    try:
+                        decorated(index)
+                    except TypeError:
+                        pass
+                    else:
+                        return False
+                return True
+            self.assertEqual(run_threads(call), [True] * NUM_THREADS, mode)
+
+    def test_lazy_decoration_is_resolved_once(self):
+        decorated = first_kwonly_arg('d1', lazy=True)(func)
+        with mock.patch('kwonly_args._decorate', wraps=kwonly_args._decorate) as mock_decorate:
+            results = run_threads(lambda index: decorated(index, d2=index))
+        self.assertEqual(mock_decorate.call_count, 1)
+        self.assertEqual(results, [(index, 'd0', 'd1', index, (), {}) for index in range(NUM_THREADS)])
+
+    def test_decoration_from_many_threads(self):
+        def decorate(index):
+            return [first_kwonly_arg('d1', mode=mode)(func)(index, d2=0) for mode in MODES for _ in range(50)]
+        results = run_threads(decorate)
+        self.assertEqual(results, [[(index, 'd0', 'd1', 0, (), {})] * 50 * len(MODES) for index in range(NUM_THREADS)])
+
+    def test_instrumentation_counts_are_exact(self):
+        def counted(a0, d0='d0', *args):
+            pass
+        decorated = first_kwonly_arg('d0', instrumentation='counts')(counted)
+        stats = instrumentation.get_function_stats(instrumentation.qualified_name(counted))
+        stats.reset()
+
+        def call(index):
+            for _ in range(NUM_CALLS):
+                decorated(0)
+                decorated(0, 1, 2)
+        run_threads(call)
+        self.assertEqual((stats.calls, stats.spilled_calls), (2 * NUM_CALLS * NUM_THREADS, NUM_CALLS * NUM_THREADS))
+
+    def test_counters_of_finished_threads_are_merged(self):
+        def counted(a0, d0='d0'):
+            pass
+        decorated = first_kwonly_arg('d0', instrumentation='counts')(counted)
+        stats = instrumentation.get_function_stats(instrumentation.qualified_name(counted))
+        stats.reset()
+        for _ in range(3):
+            run_threads(lambda index: decorated(0))
+        # the shards of the last batch of threads are merged only when a new thread calls the function
+        run_threads(lambda index: decorated(0), num_threads=1)
+        self.assertEqual(stats.calls, 3 * NUM_THREADS + 1)
+        self.assertEqual(len(stats._shards), 1)
+
+    def test_shards_dont_keep_the_finished_threads_alive(self):
+        def counted(a0, d0='d0'):
+            pass
+        decorated = first_kwonly_arg('d0', instrumentation='counts')(counted)
+        stats = instrumentation.get_function_stats(instrumentation.qualified_name(counted))
+        stats.reset()
+        thread = threading.Thread(target=decorated, args=(0,))
+        thread.start()
+        thread.join()
+        thread_ref = weakref.ref(thread)
+        del thread
+        gc.collect()
+        self.assertIsNone(thread_ref())
+        self.assertEqual(stats.calls, 1)
+        run_threads(lambda index: decorated(0), num_threads=1)
+        self.assertEqual(stats.calls, 2)
+        self.assertEqual(len(stats._shards), 1)
@@ -0,0 +1,104 @@
+import os
+import re
+import subprocess
+import sys
+from unittest import TestCase
+
+from kwonly_args import first_kwonly_arg, configure, KWONLY_REQUIRED, MODES, VALIDATION_ENV_VAR
+
+
+def func_args_and_defaults_and_varargs(a0, a1, d0='d0', d1='d1', d2=KWONLY_REQUIRED, *args):
+    return dict(a0=a0, a1=a1, d0=d0, d1=d1, d2=d2, args=args)
+
+
+def func_args_and_defaults(a0, a1, d0='d0', d1='d1', d2=KWONLY_REQUIRED):
+    return dict(a0=a0, a1=a1, d0=d0, d1=d1, d2=d2)
+
+
+def func_required_positional_default(a0, d0=KWONLY_REQUIRED, d1='d1'):
+    return dict(a0=a0, d0=d0, d1=d1)
+
+
+class TestTrusted(TestCase):
+    def test_kwonly_args_are_still_reordered(self):
+        for mode in MODES:
+            decorated = first_kwonly_arg('d1', mode=mode, validation='trusted')(func_args_and_defaults_and_varargs)
+            self.assertEqual(decorated(0, 1, 2, 3, 4, d2=5), dict(a0=0, a1=1, d0=2, d1='d1', d2=5, args=(3, 4)))
+            self.assertEqual(decorated(0, 1, 2, 3, d1=4, d2=5), dict(a0=0, a1=1, d0=2, d1=4, d2=5, args=(3,)))
+            self.assertEqual(decorated(0, 1, d2=5), dict(a0=0, a1=1, d0='d0', d1='d1', d2=5, args=()))
+
+    def test_required_args_arent_checked(self):
+        for mode in ('generic', 'codegen'):
+            decorated = first_kwonly_arg('d1', mode=mode, validation='trusted')(func_args_and_defaults_and_varargs)
+            self.assertIs(decorated(0, 1)['d2'], KWONLY_REQUIRED)
+
+    def test_function_without_varargs_isnt_wrapped(self):
+        for mode in ('generic', 'codegen'):
+            decorated = first_kwonly_arg('d1', mode=mode, validation='trusted')(func_args_and_defaults)
+            self.assertIs(decorated, func_args_and_defaults)
+
+    def test_configure(self):
+        configure(validation='trusted')
+        try:
+            decorated = first_kwonly_arg('d1')(func_args_and_defaults)
+        finally:
+            configure(validation='normal')
+        self.assertIs(decorated, func_args_and_defaults)
+
+    def test_lazy(self):
+        decorated = first_kwonly_arg('d1', lazy=True, validation='trusted')(func_args_and_defaults_and_varargs)
+        self.assertIs(decorated(0, 1)['d2'], KWONLY_REQUIRED)
+
+
+class TestDebug(TestCase):
+    def test_valid_calls(self):
+        for mode in MODES:
+            decorated = first_kwonly_arg('d1', mode=mode, validation='debug')(func_args_and_defaults_and_varargs)
+            self.assertEqual(decorated(0, 1, 2, 3, d2=5), dict(a0=0, a1=1, d0=2, d1='d1', d2=5, args=(3,)))
+            self.assertEqual(decorated.__name__, 'func_args_and_defaults_and_varargs')
+
+    def test_normal_checks(self):
+        decorated = first_kwonly_arg('d1', validation='debug')(func_args_and_defaults)
+        self.assertRaisesRegexp(TypeError, re.escape("func_args_and_defaults() missing 1 keyword-only argument(s): "
+                                                     "d2"), decorated, 0, 1)
+        self.assertRaisesRegexp(TypeError, re.escape("func_args_and_defaults() takes exactly 3 arguments (4 given)"),
+                                decorated, 0, 1, 2, 3, d2=4)
+
+    def test_kwonly_required_as_argument_value(self):
+        for mode in MODES:
+            decorated = first_kwonly_arg('d1', mode=mode, validation='debug')(func_args_and_defaults_and_varargs)
+            self.assertRaisesRegexp(TypeError, re.escape("received KWONLY_REQUIRED as the value of argument 'd2'"),
+                                    decorated, 0, 1, d2=KWONLY_REQUIRED)
+            self.assertRaisesRegexp(TypeError, re.escape("received KWONLY_REQUIRED as a positional argument value"),
+                                    decorated, 0, 1, KWONLY_REQUIRED, d2=5)
+
+    def test_kwonly_required_default_of_positional_arg(self):
+        self.assertRaisesRegexp(ValueError, re.escape("func_required_positional_default(): KWONLY_REQUIRED is the "
+                                                      "default value of 'd0' that isn't a keyword-only arg"),
+                                first_kwonly_arg('d1', validation='debug'), func_required_positional_default)
+        # accepted by the other validation levels
+        first_kwonly_arg('d1')(func_required_positional_default)
+
+    def test_replaced_defaults(self):
+        def func(a0, d0='d0', d1='d1'):
+            return a0, d0, d1
+
+        decorated = first_kwonly_arg('d1', validation='debug')(func)
+        self.assertEqual(decorated(0), (0, 'd0', 'd1'))
+        func.__defaults__ = ('x', 'y')
+        self.assertRaisesRegexp(RuntimeError, re.escape("The __defaults__ of func() have been replaced after "
+                                                        "decoration"), decorated, 0)
+
+
+class TestConfiguration(TestCase):
+    def test_invalid_validation(self):
+        self.assertRaisesRegexp(ValueError, re.escape("Invalid validation='fast'"), first_kwonly_arg, 'd1',
+                                validation='fast')
+        self.assertRaisesRegexp(ValueError, re.escape("Invalid validation='fast'"), configure, validation='fast')
+
+    def test_environment_variable(self):
+        env = dict(os.environ)
+        env[VALIDATION_ENV_VAR] = 'trusted'
+        output = subprocess.check_output([sys.executable, '-c', 'import kwonly_args; '
+                                          'print(kwonly_args._config["validation"])'], env=env)
+        self.assertEqual(output.decode('ascii').strip(), 'trusted')